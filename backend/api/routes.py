@@ -2,15 +2,26 @@
 AppSense API Routes
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, model_validator
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import json
 import logging
+import time
 
 from services.search_service import SearchService
 from services.llm_service import LLMService
+from services.analysis_jobs import AnalysisJobManager
+from services.search_cursors import SearchCursorCache
 from utils.language_detector import LanguageDetector
 from core.config import settings
+from core.request_context import RequestContext
+from core.container import (
+    ServiceContainer, get_services, get_search_service, get_llm_service,
+    get_language_detector, get_analysis_jobs, get_search_cursors
+)
 
 # Router oluştur
 search_router = APIRouter()
@@ -21,10 +32,19 @@ logger = logging.getLogger(__name__)
 
 # Pydantic modelleri
 class SearchRequest(BaseModel):
-    query: str
+    query: str = ""  # cursor ile sonraki sayfa istenirken gerekmez
     language: Optional[str] = None
     category: Optional[str] = None
     max_results: Optional[int] = 10
+    skip_analysis: bool = False
+    async_analysis: bool = False
+    cursor: Optional[str] = None
+
+    @model_validator(mode="after")
+    def require_query_or_cursor(self):
+        if "query" not in self.model_fields_set and not self.cursor:
+            raise ValueError("query veya cursor gerekli")
+        return self
 
 class AppInfo(BaseModel):
     id: str
@@ -37,6 +57,7 @@ class AppInfo(BaseModel):
     price: Optional[str]
     developer: str
     similarity_score: float
+    lexical_score: Optional[float] = None
 
 class SearchResponse(BaseModel):
     query: str
@@ -45,93 +66,562 @@ class SearchResponse(BaseModel):
     processing_time: float
     language_detected: str
     llm_analysis: Optional[str] = None
+    analysis_id: Optional[str] = None
+    next_cursor: Optional[str] = None
 
-@search_router.post("/search", response_model=SearchResponse)
-async def search_apps(request: SearchRequest):
+class BatchSearchRequest(BaseModel):
+    requests: List[SearchRequest]
+
+class BatchSearchItem(BaseModel):
+    index: int
+    query: str
+    status: str  # "ok", "invalid" veya "error"
+    results: List[AppInfo] = []
+    total_found: int = 0
+    language_detected: Optional[str] = None
+    llm_analysis: Optional[str] = None
+    analysis_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchSearchResponse(BaseModel):
+    results: List[BatchSearchItem]
+    total: int
+    processing_time: float
+
+class BatchGetAppsRequest(BaseModel):
+    ids: List[str]
+
+class BatchGetAppsResponse(BaseModel):
+    apps: List[AppInfo]
+    missing: List[str]
+    processing_time: float
+    cache: Optional[Dict[str, int]] = None  # yalnızca DEBUG modunda
+
+class Suggestion(BaseModel):
+    text: str
+    type: str  # "app", "category" veya "query"
+    score: float
+    app_id: Optional[str] = None
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[Suggestion]
+    processing_time: float
+
+class AnalysisResponse(BaseModel):
+    analysis_id: str
+    status: str
+    llm_analysis: Optional[str] = None
+    error: Optional[str] = None
+
+async def _execute_search(
+    request: SearchRequest,
+    search_service: SearchService,
+    llm_service: LLMService,
+    language_detector: LanguageDetector,
+    analysis_jobs: AnalysisJobManager,
+    search_cursors: SearchCursorCache,
+    context: RequestContext,
+    response: Response
+) -> SearchResponse:
     """
-    Uygulama arama endpoint'i (POST)
+    Arama yap ve istenen moda göre LLM analizini ekle
+
+    skip_analysis: analiz yapılmaz
+    async_analysis: analiz arka planda çalışır, yanıtta analysis_id döner
+    aksi halde: analiz tamamlanınca yanıt döner
+
+    İlk sayfada sayfa boyutunun SEARCH_CURSOR_PAGES katı kadar (en fazla
+    SEARCH_CURSOR_MAX_RESULTS) aday sıralanır; daha fazla sonuç
+    varsa yanıtta next_cursor döner. Aşama süreleri Server-Timing başlığına
+    ve metriklere yazılır.
     """
-    try:
-        # Search service'i başlat
-        search_service = SearchService()
-        llm_service = LLMService()
-        language_detector = LanguageDetector()
-        
-        # Dil algılama
+    if request.cursor:
+        return await _execute_search_page(request, search_service, search_cursors, context, response)
+    
+    # Dil algılama (istek başına bir kez, servisler bağlamdan okur)
+    with context.stage("language_detection"):
         detected_language = language_detector.detect_language(request.query)
-        
-        # Arama yap
-        results = await search_service.search_apps(
-            query=request.query,
-            language=request.language,
-            category=request.category,
-            max_results=request.max_results
-        )
-        
-        # LLM ile analiz yap
-        llm_analysis = await llm_service.analyze_search_results(
+    context.language = detected_language
+    
+    # Arama yap
+    results = await search_service.search_apps(
+        query=request.query,
+        language=request.language,
+        category=request.category,
+        max_results=request.max_results,
+        context=context,
+        window=search_cursors.window(request.max_results or 10)
+    )
+    next_cursor = search_cursors.create(request.query, detected_language, context.ranking or [], len(results))
+    
+    llm_analysis = None
+    analysis_id = None
+    if request.skip_analysis:
+        pass
+    elif request.async_analysis:
+        # Sonuçları hemen döndür, analizi kuyruğa ekle
+        analysis_id = analysis_jobs.submit(
             query=request.query,
             search_results=results,
-            detected_language=detected_language
+            detected_language=detected_language,
+            context=context
         )
-        
-        return SearchResponse(
-            query=request.query,
-            results=results,
-            total_found=len(results),
-            processing_time=0.0,  # TODO: Gerçek süre hesapla
-            language_detected=detected_language,
-            llm_analysis=llm_analysis
+    else:
+        # LLM ile analiz yap
+        with context.stage("llm"):
+            llm_analysis = await llm_service.analyze_search_results(
+                query=request.query,
+                search_results=results,
+                detected_language=detected_language,
+                context=context
+            )
+    
+    response.headers["Server-Timing"] = context.server_timing()
+    return SearchResponse(
+        query=request.query,
+        results=results,
+        total_found=len(results),
+        processing_time=context.finish("search"),
+        language_detected=detected_language,
+        llm_analysis=llm_analysis,
+        analysis_id=analysis_id,
+        next_cursor=next_cursor
+    )
+
+async def _execute_search_page(
+    request: SearchRequest,
+    search_service: SearchService,
+    search_cursors: SearchCursorCache,
+    context: RequestContext,
+    response: Response
+) -> SearchResponse:
+    """
+    Cursor'ın gösterdiği sayfa: ilk sayfanın sıralamasından, embedding ve
+    vektör araması yapmadan (uygulamalar ID ile okunur, LLM analizi yapılmaz)
+    """
+    try:
+        with context.stage("cursor"):
+            cursor, page, next_cursor = search_cursors.page(request.cursor, request.max_results or 10)
+    except ValueError:
+        context.finish("search_page", status="invalid")
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+    except KeyError:
+        context.finish("search_page", status="expired")
+        raise HTTPException(status_code=410, detail="Cursor'ın süresi dolmuş, aramayı yeniden başlatın")
+
+    with context.stage("lookup"):
+        apps, _ = await search_service.get_apps_by_ids([app_id for app_id, _, _ in page])
+    # Sayfa oluşturulduktan sonra silinen uygulamalar atlanır
+    scores = {app_id: (score, lexical) for app_id, score, lexical in page}
+    results = [
+        {**app, 'similarity_score': scores[app['id']][0], 'lexical_score': scores[app['id']][1]}
+        for app in apps
+    ]
+
+    response.headers["Server-Timing"] = context.server_timing()
+    return SearchResponse(
+        query=cursor.query,
+        results=results,
+        total_found=len(results),
+        processing_time=context.finish("search_page"),
+        language_detected=cursor.language,
+        next_cursor=next_cursor
+    )
+
+@search_router.post("/search", response_model=SearchResponse)
+async def search_apps(
+    request: SearchRequest,
+    response: Response,
+    search_service: SearchService = Depends(get_search_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    language_detector: LanguageDetector = Depends(get_language_detector),
+    analysis_jobs: AnalysisJobManager = Depends(get_analysis_jobs),
+    search_cursors: SearchCursorCache = Depends(get_search_cursors)
+):
+    """
+    Uygulama arama endpoint'i (POST)
+    """
+    context = RequestContext(request.query)
+    try:
+        return await _execute_search(
+            request, search_service, llm_service, language_detector, analysis_jobs, search_cursors, context, response
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
+        context.finish("search", status="error")
         logger.error(f"Arama hatası: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Arama sırasında hata oluştu: {str(e)}")
 
 @search_router.get("/search", response_model=SearchResponse)
 async def search_apps_get(
-    query: str = Query(..., description="Arama sorgusu"),
+    response: Response,
+    query: Optional[str] = Query(None, description="Arama sorgusu (cursor verilmişse gerekmez)"),
     category: Optional[str] = Query(None, description="Kategori filtresi"),
-    max_results: Optional[int] = Query(10, description="Maksimum sonuç sayısı")
+    max_results: Optional[int] = Query(10, description="Maksimum sonuç sayısı (sayfa boyutu)"),
+    skip_analysis: bool = Query(False, description="LLM analizini atla"),
+    async_analysis: bool = Query(False, description="LLM analizini arka planda çalıştır"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor değeri"),
+    search_service: SearchService = Depends(get_search_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    language_detector: LanguageDetector = Depends(get_language_detector),
+    analysis_jobs: AnalysisJobManager = Depends(get_analysis_jobs),
+    search_cursors: SearchCursorCache = Depends(get_search_cursors)
 ):
     """
     Uygulama arama endpoint'i (GET)
     """
+    if query is None and not cursor:
+        raise HTTPException(status_code=422, detail="query veya cursor gerekli")
+
+    context = RequestContext(query or "")
     try:
-        # Search service'i başlat
-        search_service = SearchService()
-        llm_service = LLMService()
-        language_detector = LanguageDetector()
-        
-        # Dil algılama
-        detected_language = language_detector.detect_language(query)
+        request = SearchRequest(
+            query=query or "",
+            category=category,
+            max_results=max_results,
+            skip_analysis=skip_analysis,
+            async_analysis=async_analysis,
+            cursor=cursor
+        )
+        return await _execute_search(
+            request, search_service, llm_service, language_detector, analysis_jobs, search_cursors, context, response
+        )
         
-        # Arama yap
+    except HTTPException:
+        raise
+    except Exception as e:
+        context.finish("search", status="error")
+        logger.error(f"Arama hatası: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Arama sırasında hata oluştu: {str(e)}")
+
+@search_router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_apps_batch(
+    request: BatchSearchRequest,
+    response: Response,
+    search_service: SearchService = Depends(get_search_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    language_detector: LanguageDetector = Depends(get_language_detector),
+    analysis_jobs: AnalysisJobManager = Depends(get_analysis_jobs)
+):
+    """
+    Toplu uygulama arama endpoint'i
+
+    Tüm sorgular tek embedding çağrısında encode edilir ve birlikte aranır.
+    LLM analizi her öğe için skip_analysis/async_analysis ile ayrı ayrı seçilir.
+    Sonuçlar girdi sırasıyla, her öğe için bir durumla döner.
+    """
+    if len(request.requests) > settings.SEARCH_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Tek istekte en fazla {settings.SEARCH_BATCH_MAX_ITEMS} sorgu gönderilebilir"
+        )
+
+    context = RequestContext(f"batch:{len(request.requests)}")
+    items = [
+        BatchSearchItem(index=index, query=item.query, status="ok")
+        for index, item in enumerate(request.requests)
+    ]
+    valid = []
+    for index, item in enumerate(request.requests):
+        if item.query.strip():
+            valid.append(index)
+        else:
+            items[index].status = "invalid"
+            items[index].error = "Boş sorgu"
+
+    item_contexts = {index: RequestContext(request.requests[index].query) for index in valid}
+    try:
+        with context.stage("language_detection"):
+            for index in valid:
+                items[index].language_detected = language_detector.detect_language(request.requests[index].query)
+                item_contexts[index].language = items[index].language_detected
+
+        batch_results = await search_service.search_apps_batch(
+            queries=[request.requests[index].query for index in valid],
+            categories=[request.requests[index].category for index in valid],
+            max_results=[request.requests[index].max_results or 10 for index in valid],
+            context=context,
+            item_contexts=[item_contexts[index] for index in valid]
+        )
+    except Exception as e:
+        context.finish("search_batch", status="error")
+        logger.error(f"Toplu arama hatası: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Toplu arama sırasında hata oluştu: {str(e)}")
+
+    results_by_index = dict(zip(valid, batch_results))
+    for index, results in results_by_index.items():
+        items[index].results = [AppInfo(**result) for result in results]
+        items[index].total_found = len(results)
+
+    # Analizler sınırlı eşzamanlılıkla çalışır; bir öğenin hatası diğerlerini etkilemez
+    semaphore = asyncio.Semaphore(settings.ANALYSIS_MAX_CONCURRENCY)
+
+    async def analyze(index: int):
+        async with semaphore:
+            try:
+                items[index].llm_analysis = await llm_service.analyze_search_results(
+                    query=request.requests[index].query,
+                    search_results=results_by_index[index],
+                    detected_language=items[index].language_detected,
+                    context=item_contexts[index]
+                )
+            except Exception as e:
+                logger.error(f"Toplu analiz hatası: {str(e)}")
+                items[index].status = "error"
+                items[index].error = "LLM analizi sırasında hata oluştu."
+
+    pending = []
+    for index in valid:
+        item = request.requests[index]
+        if item.skip_analysis:
+            continue
+        if item.async_analysis:
+            items[index].analysis_id = analysis_jobs.submit(
+                query=item.query,
+                search_results=results_by_index[index],
+                detected_language=items[index].language_detected,
+                context=item_contexts[index]
+            )
+        else:
+            pending.append(analyze(index))
+
+    if pending:
+        with context.stage("llm"):
+            await asyncio.gather(*pending)
+
+    response.headers["Server-Timing"] = context.server_timing()
+    return BatchSearchResponse(
+        results=items,
+        total=len(items),
+        processing_time=context.finish("search_batch")
+    )
+
+@search_router.get("/analysis/{analysis_id}", response_model=AnalysisResponse)
+async def get_analysis(
+    analysis_id: str,
+    wait: float = Query(0.0, ge=0, description="Analiz bitmediyse beklenecek süre (saniye, long-poll)"),
+    analysis_jobs: AnalysisJobManager = Depends(get_analysis_jobs)
+):
+    """
+    Arka plan LLM analizinin durumunu/sonucunu getir
+    """
+    job = await analysis_jobs.get(analysis_id, wait=min(wait, settings.ANALYSIS_MAX_WAIT))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı veya süresi doldu")
+    return AnalysisResponse(**job)
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events formatında tek olay oluştur"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def _stream_search(
+    query: str,
+    language: Optional[str],
+    category: Optional[str],
+    max_results: int,
+    search_service: SearchService,
+    llm_service: LLMService,
+    language_detector: LanguageDetector
+) -> StreamingResponse:
+    """
+    Arama sonuçlarını ilk olay olarak, ardından LLM analizini token token gönder
+
+    Olaylar: "results" (arama sonuçları), "token" (analiz parçası),
+    "done" (süreler) ve hata durumunda "error".
+    """
+    context = RequestContext(query)
+    try:
+        with context.stage("language_detection"):
+            detected_language = language_detector.detect_language(query)
+        context.language = detected_language
         results = await search_service.search_apps(
             query=query,
+            language=language,
             category=category,
-            max_results=max_results
+            max_results=max_results,
+            context=context
         )
-        
-        # LLM ile analiz yap
-        llm_analysis = await llm_service.analyze_search_results(
+    except Exception as e:
+        context.finish("search_stream", status="error")
+        logger.error(f"Arama hatası: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Arama sırasında hata oluştu: {str(e)}")
+    search_time = context.elapsed()
+    # Başlıklar gövdeden önce gittiği için yalnızca arama aşamalarını içerir
+    server_timing = context.server_timing()
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("results", {
+            "query": query,
+            "results": [AppInfo(**result).model_dump() for result in results],
+            "total_found": len(results),
+            "language_detected": detected_language
+        })
+
+        llm_started = time.perf_counter()
+        first_token_time = None
+        status = "cancelled"
+        analysis = llm_service.stream_analysis(
             query=query,
             search_results=results,
-            detected_language=detected_language
+            detected_language=detected_language,
+            context=context
         )
-        
-        return SearchResponse(
-            query=query,
-            results=results,
-            total_found=len(results),
-            processing_time=0.0,
-            language_detected=detected_language,
-            llm_analysis=llm_analysis
+        try:
+            with context.stage("llm"):
+                async for token in analysis:
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter() - llm_started
+                    yield _sse_event("token", {"text": token})
+            status = "ok"
+        except Exception as e:
+            status = "error"
+            logger.error(f"Analiz akışı hatası: {str(e)}")
+            yield _sse_event("error", {"detail": "LLM analizi sırasında hata oluştu."})
+        finally:
+            # İstemci koptuğunda Starlette bu generator'ı iptal eder; upstream akışı da kapat
+            await analysis.aclose()
+            total = context.finish("search_stream", status=status)
+
+        yield _sse_event("done", {
+            "timings": {
+                **context.timings,
+                "search": search_time,
+                "llm_first_token": first_token_time,
+                "total": total
+            }
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Server-Timing": server_timing}
+    )
+
+@search_router.post("/search/stream")
+async def search_apps_stream(
+    request: SearchRequest,
+    search_service: SearchService = Depends(get_search_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    language_detector: LanguageDetector = Depends(get_language_detector)
+):
+    """
+    Akışlı uygulama arama endpoint'i (POST, Server-Sent Events)
+    """
+    return await _stream_search(
+        query=request.query,
+        language=request.language,
+        category=request.category,
+        max_results=request.max_results,
+        search_service=search_service,
+        llm_service=llm_service,
+        language_detector=language_detector
+    )
+
+@search_router.get("/search/stream")
+async def search_apps_stream_get(
+    query: str = Query(..., description="Arama sorgusu"),
+    category: Optional[str] = Query(None, description="Kategori filtresi"),
+    max_results: Optional[int] = Query(10, description="Maksimum sonuç sayısı"),
+    search_service: SearchService = Depends(get_search_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    language_detector: LanguageDetector = Depends(get_language_detector)
+):
+    """
+    Akışlı uygulama arama endpoint'i (GET, tarayıcı EventSource ile kullanılabilir)
+    """
+    return await _stream_search(
+        query=query,
+        language=None,
+        category=category,
+        max_results=max_results,
+        search_service=search_service,
+        llm_service=llm_service,
+        language_detector=language_detector
+    )
+
+@search_router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., description="Kullanıcının yazdığı metin"),
+    limit: int = Query(settings.SUGGEST_MAX_RESULTS, ge=1, le=20, description="Öneri sayısı"),
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    Yazarken arama önerileri (typeahead)
+
+    Uygulama adları, kategoriler ve popüler sorgular bellek içi prefix
+    index'inden puan ve indirme sayısına göre sıralanır; LLM çağrılmaz.
+    """
+    context = RequestContext(q)
+    with context.stage("suggest"):
+        suggestions = search_service.suggest(q, limit)
+    return SuggestResponse(
+        query=q,
+        suggestions=[Suggestion(**suggestion) for suggestion in suggestions],
+        processing_time=context.finish("suggest")
+    )
+
+@search_router.get("/apps/{app_id}", response_model=AppInfo)
+async def get_app(
+    app_id: str,
+    response: Response,
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    ID ile uygulama detayı
+    """
+    context = RequestContext(app_id)
+    try:
+        with context.stage("lookup"):
+            apps, cache_stats = await search_service.get_apps_by_ids([app_id])
+    except Exception as e:
+        context.finish("apps_get", status="error")
+        logger.error(f"Uygulama getirme hatası: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Uygulama getirilirken hata oluştu: {str(e)}")
+
+    if settings.DEBUG:
+        response.headers["X-Cache"] = "hit" if cache_stats["cache_hits"] else "miss"
+    if not apps:
+        context.finish("apps_get", status="not_found")
+        raise HTTPException(status_code=404, detail="Uygulama bulunamadı")
+    context.finish("apps_get")
+    return AppInfo(**apps[0])
+
+@search_router.post("/apps:batchGet", response_model=BatchGetAppsResponse)
+async def batch_get_apps(
+    request: BatchGetAppsRequest,
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    Birden fazla uygulamayı tek istekte getir (karşılaştırma ve liste görünümleri için)
+
+    Tekrarlanan ID'ler bir kez okunur; uygulamalar istek sırasıyla döner,
+    bulunamayan ID'ler 'missing' alanındadır.
+    """
+    if len(request.ids) > settings.APP_BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Tek istekte en fazla {settings.APP_BATCH_GET_MAX_IDS} ID gönderilebilir"
         )
-        
+
+    context = RequestContext(f"apps:{len(request.ids)}")
+    try:
+        with context.stage("lookup"):
+            apps, cache_stats = await search_service.get_apps_by_ids(request.ids)
     except Exception as e:
-        logger.error(f"Arama hatası: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Arama sırasında hata oluştu: {str(e)}")
+        context.finish("apps_batch_get", status="error")
+        logger.error(f"Toplu uygulama getirme hatası: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Uygulamalar getirilirken hata oluştu: {str(e)}")
+
+    found = {app['id'] for app in apps}
+    return BatchGetAppsResponse(
+        apps=[AppInfo(**app) for app in apps],
+        missing=[app_id for app_id in dict.fromkeys(request.ids) if app_id not in found],
+        processing_time=context.finish("apps_batch_get"),
+        cache=cache_stats if settings.DEBUG else None
+    )
 
 @search_router.get("/categories")
 async def get_categories():
@@ -144,6 +634,22 @@ async def get_categories():
     ]
     return {"categories": categories}
 
+@search_router.get("/stats")
+async def get_stats(services: ServiceContainer = Depends(get_services)):
+    """
+    Embedding, doküman ve uygulama önbelleği ile mikro-batch metrikleri
+    """
+    embedding_model = services.search_service.embedding_model
+    document_store = services.search_service.document_store
+    return {
+        "embedding_cache": embedding_model.cache.stats() if embedding_model.cache else None,
+        "embedding_batcher": services.embedding_batcher.stats() if services.embedding_batcher else None,
+        "analysis_jobs": services.analysis_jobs.stats(),
+        "analysis_cache": services.llm_service.analysis_cache.stats() if services.llm_service.analysis_cache else None,
+        "document_cache": document_store.cache.stats() if document_store is not None and document_store.cache is not None else None,
+        "app_cache": services.search_service.app_cache.stats() if services.search_service.app_cache is not None else None
+    }
+
 @search_router.get("/health")
 async def health_check():
     """
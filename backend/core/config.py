@@ -3,18 +3,41 @@ AppSense Konfigürasyon Ayarları
 """
 
 from pydantic_settings import BaseSettings
+from pathlib import Path
 from typing import Optional
 import os
 
+# Depo kökü; göreli veritabanı yolları çalışma dizininden bağımsız olarak buna göre çözülür
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
 class Settings(BaseSettings):
     # API Ayarları
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "AppSense"
+    DEBUG: bool = False  # yanıtlara tanılama bilgisi (ör. önbellek istatistikleri) eklenir
+    
+    # Vektör Veritabanı Ayarları
+    VECTOR_STORE_BACKEND: str = "pinecone"  # "pinecone" veya "local"
+    LOCAL_VECTOR_STORE_PATH: str = "./data/vectorstore"
+    LOCAL_INDEX_TYPE: str = "flat"  # "flat" (tam arama) veya "ivf" (yaklaşık arama)
+    IVF_NLIST: int = 0  # 0 ise 4 * sqrt(N)
+    IVF_NPROBE: int = 16
+    IVF_TRAIN_ITERATIONS: int = 20
+    # "float32", "float16", "int8" veya "pq"; sıkıştırılmış modlarda kodlar bellekte,
+    # tam hassasiyetli vektörler memory-mapped dosyada tutulur
+    LOCAL_VECTOR_STORAGE: str = "float32"
+    LOCAL_RESCORE_FACTOR: int = 4  # kodlarla bulunan top_k * faktör aday tam hassasiyetle yeniden skorlanır
+    LOCAL_PQ_SUBVECTORS: int = 48  # PQ'da vektör başına bayt (boyutu tam bölmeli)
     
     # Pinecone Ayarları
     PINECONE_API_KEY: str = ""
     PINECONE_ENVIRONMENT: str = "gcp-starter"
     PINECONE_INDEX_NAME: str = "appsense"
+    PINECONE_UPSERT_MAX_BYTES: int = 1_900_000  # istek limiti 2MB, zarf için pay bırakılır
+    PINECONE_UPSERT_MAX_VECTORS: int = 1000
+    PINECONE_UPSERT_CONCURRENCY: int = 4
+    PINECONE_UPSERT_RETRIES: int = 3
+    PINECONE_UPSERT_BACKOFF: float = 0.5  # saniye, her denemede iki katına çıkar
     
     # LLM Ayarları
     GROQ_API_KEY: str = ""
@@ -22,16 +45,84 @@ class Settings(BaseSettings):
     
     # Embedding Model
     EMBEDDING_MODEL: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BACKEND: str = "torch"  # torch veya onnx (scripts/export_onnx_model.py ile export edilir)
+    EMBEDDING_ONNX_PATH: str = "./data/models/onnx"
+    EMBEDDING_ONNX_QUANTIZED: bool = True  # dinamik int8 quantize edilmiş grafik
+    EMBEDDING_ONNX_THREADS: int = 0  # 0 ise ONNX Runtime seçer
+    
+    # Sorgu Embedding Önbelleği
+    EMBEDDING_CACHE_SIZE: int = 10000  # 0 ise önbellek kapalı
+    EMBEDDING_CACHE_TTL: int = 0  # saniye, 0 ise süresiz
+    EMBEDDING_CACHE_PATH: str = ""  # boş değilse önbellek bu dosyada kalıcı tutulur
+    
+    # Doküman Embedding Artifact Önbelleği (prepare_embeddings.py)
+    EMBEDDING_ARTIFACT_CACHE_PATH: str = "./data/cache/embedding_artifacts"  # boş ise kapalı
+    EMBEDDING_ARTIFACT_DTYPE: str = "float32"  # float32 veya float16
+    
+    # Eşzamanlı Sorgu Embedding Mikro-Batch'leme
+    EMBEDDING_BATCHING_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 3.0
+    EMBEDDING_BATCH_QUEUE_SIZE: int = 1024
+    
+    # Eşzamanlılık (bloklayıcı işler için havuz boyutları)
+    ENCODE_POOL_SIZE: int = 2
+    VECTOR_STORE_POOL_SIZE: int = 8
+    LEXICAL_POOL_SIZE: int = 2  # ad/öneri index'i kurulumu ve BM25 (bellek içi CPU işi)
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_TIMEOUT: float = 60.0
+    
+    # Arka Plan LLM Analizi
+    ANALYSIS_MAX_CONCURRENCY: int = 4
+    ANALYSIS_QUEUE_SIZE: int = 1000
+    ANALYSIS_RESULT_TTL: int = 600  # saniye
+    ANALYSIS_MAX_STORED: int = 10000
+    ANALYSIS_MAX_WAIT: float = 30.0  # long-poll üst sınırı (saniye)
+    
+    # Semantik LLM Analiz Önbelleği
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_SIZE: int = 2000
+    ANALYSIS_CACHE_TTL: int = 3600  # saniye, 0 ise süresiz
+    ANALYSIS_CACHE_MAX_DISTANCE: float = 0.08  # kosinüs mesafesi
+    
+    # Dil Algılama
+    LANGUAGE_DETECTION_CACHE_SIZE: int = 10000  # 0 ise önbellek kapalı
+    LANGUAGE_DETECTION_WORKERS: int = 0  # toplu algılama process sayısı, 0 ise CPU sayısı
+    LANGUAGE_DETECTION_CHUNK_SIZE: int = 2000  # worker'a tek seferde gönderilen metin
     
     # Veritabanı
     DATABASE_URL: str = "sqlite:///./appsense.db"
     
+    # Doküman Deposu (kapalıysa tam metadata vektörlerle birlikte saklanır)
+    DOCUMENT_STORE_ENABLED: bool = True
+    DOCUMENT_STORE_POOL_SIZE: int = 4  # SQLite bağlantı sayısı
+    DOCUMENT_CACHE_SIZE: int = 10000  # önbellekteki satır, 0 ise önbellek kapalı
+    
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://127.0.0.1:3000"]
     
     # Arama Ayarları
     MAX_SEARCH_RESULTS: int = 10
     SIMILARITY_THRESHOLD: float = 0.7
+    SEARCH_BATCH_MAX_ITEMS: int = 1000  # /search/batch isteği başına sorgu
+    NAME_INDEX_ENABLED: bool = True  # uygulama adı sorgularında lexical hızlı yol
+    HYBRID_CANDIDATES: int = 30  # RRF'ye giren lexical ve vektör aday sayısı
+    RRF_K: int = 60
+    APP_BATCH_GET_MAX_IDS: int = 1000  # /apps:batchGet isteği başına ID
+    APP_CACHE_SIZE: int = 10000  # doküman deposu kapalıyken uygulama önbelleği, 0 ise kapalı
+    APP_CACHE_TTL: int = 300  # saniye; ingestion ayrı process'te yazdığında en fazla bu kadar eski kalır
+    SEARCH_CURSOR_MAX_RESULTS: int = 100  # cursor başına en fazla ID (sıralama penceresinin üst sınırı), 0 ise sayfalama kapalı
+    SEARCH_CURSOR_PAGES: int = 3  # ilk sayfada sıralanan aday: sayfa boyutu x bu değer (en fazla SEARCH_CURSOR_MAX_RESULTS)
+    SEARCH_CURSOR_CACHE_SIZE: int = 5000  # önbellekteki en fazla cursor
+    SEARCH_CURSOR_TTL: int = 600  # saniye
+    
+    # Öneri (Typeahead) Ayarları
+    SUGGEST_ENABLED: bool = True
+    SUGGEST_MAX_RESULTS: int = 10
+    SUGGEST_QUERY_MIN_COUNT: int = 3  # sorgunun öneri olması için gereken arama sayısı
+    SUGGEST_QUERY_TRACK_SIZE: int = 50000  # sayacı tutulan en fazla farklı sorgu
+    LEXICAL_INDEX_REFRESH_INTERVAL: int = 300  # saniye; doküman deposu değiştiyse ad ve öneri index'leri yeniden kurulur, 0 ise yalnızca açılışta
     
     class Config:
         env_file = ".env"
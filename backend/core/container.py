@@ -0,0 +1,219 @@
+"""
+AppSense Servis Konteyneri
+Worker başına bir kez oluşturulan ve istekler arasında paylaşılan servisler
+"""
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.executors import shutdown_executors
+from core.metrics import REGISTRY, CollectedMetric
+from models.embeddings.micro_batcher import EmbeddingMicroBatcher
+from services.analysis_jobs import AnalysisJobManager
+from services.search_cursors import SearchCursorCache
+from services.search_service import SearchService
+from services.llm_service import LLMService
+from utils.language_detector import LanguageDetector
+
+logger = logging.getLogger(__name__)
+
+class ServiceContainer:
+    """Uygulama ömrü boyunca yaşayan servisleri yönetir"""
+
+    def __init__(self):
+        self.language_detector: Optional[LanguageDetector] = None
+        self.search_service: Optional[SearchService] = None
+        self.llm_service: Optional[LLMService] = None
+        self.embedding_batcher: Optional[EmbeddingMicroBatcher] = None
+        self.analysis_jobs: Optional[AnalysisJobManager] = None
+        self.search_cursors: Optional[SearchCursorCache] = None
+        self._index_refresher: Optional[asyncio.Task] = None
+        self.ready = False
+
+    async def startup(self):
+        """
+        Servisleri oluştur, ısındır ve arka plan işleyicilerini başlat
+
+        Başlatma hata verirse o ana kadar oluşturulanlar kapatılıp hata yükseltilir.
+        """
+        logger.info("Servisler başlatılıyor...")
+
+        try:
+            # Model yükleme ve ağ bağlantıları bloklayıcı olduğu için thread pool'da çalıştır
+            await run_in_threadpool(self._create_services)
+            if settings.NAME_INDEX_ENABLED or settings.SUGGEST_ENABLED:
+                await self.search_service.load_lexical_indexes(
+                    name_index=settings.NAME_INDEX_ENABLED,
+                    suggest_index=settings.SUGGEST_ENABLED
+                )
+                if settings.LEXICAL_INDEX_REFRESH_INTERVAL > 0 and self.search_service.document_store is not None:
+                    self._index_refresher = asyncio.create_task(self._refresh_lexical_indexes())
+
+            if settings.EMBEDDING_BATCHING_ENABLED:
+                self.embedding_batcher = EmbeddingMicroBatcher(self.search_service.embedding_model)
+                await self.embedding_batcher.start()
+                self.search_service.embedding_batcher = self.embedding_batcher
+
+            self.analysis_jobs = AnalysisJobManager(self.llm_service)
+            await self.analysis_jobs.start()
+            self.search_cursors = SearchCursorCache()
+        except Exception:
+            # Yarıda kalan başlatmada oluşturulan havuzlar, bağlantılar ve görevler kapatılır
+            logger.error("Servisler başlatılamadı, oluşturulan kaynaklar kapatılıyor")
+            await self.shutdown()
+            raise
+
+        REGISTRY.register_collector(self.collect_metrics)
+        self.ready = True
+        logger.info("Servisler hazır")
+
+    async def _refresh_lexical_indexes(self):
+        """Doküman deposu değiştikçe (ör. ingestion sonrası) ad ve öneri index'lerini yeniden kur"""
+        while True:
+            await asyncio.sleep(settings.LEXICAL_INDEX_REFRESH_INTERVAL)
+            try:
+                await self.search_service.refresh_lexical_indexes(
+                    name_index=settings.NAME_INDEX_ENABLED,
+                    suggest_index=settings.SUGGEST_ENABLED
+                )
+            except Exception as e:
+                logger.error(f"Index yenileme hatası: {str(e)}")
+
+    def _create_services(self):
+        """Servis nesnelerini oluştur ve ısındır"""
+        self.language_detector = LanguageDetector()
+        self.search_service = SearchService(language_detector=self.language_detector)
+        self.llm_service = LLMService(language_detector=self.language_detector)
+        self.warm_up()
+
+    def warm_up(self):
+        """İlk isteğin gecikmesini önlemek için modelleri ısındır"""
+        try:
+            # langdetect profilleri ilk çağrıda yüklenir
+            self.language_detector.detect_language("warm up")
+            self.search_service.warm_up()
+        except Exception as e:
+            logger.error(f"Isındırma hatası: {str(e)}")
+            raise
+
+    async def shutdown(self):
+        """Servisleri kapat ve kaynakları serbest bırak"""
+        self.ready = False
+        REGISTRY.unregister_collector(self.collect_metrics)
+        logger.info("Servisler kapatılıyor...")
+
+        if self._index_refresher:
+            self._index_refresher.cancel()
+            await asyncio.gather(self._index_refresher, return_exceptions=True)
+        if self.embedding_batcher:
+            await self.embedding_batcher.stop()
+        if self.analysis_jobs:
+            await self.analysis_jobs.stop()
+        if self.llm_service:
+            await self.llm_service.close()
+        if self.search_service:
+            await self.search_service.close()
+
+        self._index_refresher = None
+        self.embedding_batcher = None
+        self.analysis_jobs = None
+        self.search_cursors = None
+        self.llm_service = None
+        self.search_service = None
+        self.language_detector = None
+        shutdown_executors()
+        logger.info("Servisler kapatıldı")
+
+    def collect_metrics(self) -> Iterable[CollectedMetric]:
+        """Servis istatistiklerini /metrics için topla (yalnızca scrape anında çalışır)"""
+        if self.search_service and self.search_service.embedding_model.cache:
+            cache = self.search_service.embedding_model.cache.stats()
+            yield ("appsense_embedding_cache_hits_total", "counter", "Embedding önbelleği isabetleri", cache["hits"])
+            yield ("appsense_embedding_cache_misses_total", "counter", "Embedding önbelleği ıskaları", cache["misses"])
+            yield ("appsense_embedding_cache_size", "gauge", "Embedding önbelleğindeki kayıt sayısı", cache["size"])
+
+        if self.language_detector:
+            detector = self.language_detector.stats()
+            yield ("appsense_language_detection_fast_path_total", "counter", "langdetect'e gitmeden algılanan diller", detector["fast_path_hits"])
+            if self.language_detector.cache is not None:
+                yield ("appsense_language_cache_hits_total", "counter", "Dil algılama önbelleği isabetleri", detector["hits"])
+                yield ("appsense_language_cache_misses_total", "counter", "Dil algılama önbelleği ıskaları", detector["misses"])
+
+        if self.search_service and self.search_service.name_index is not None:
+            name_index = self.search_service.name_index.stats()
+            yield ("appsense_name_index_apps", "gauge", "Uygulama adı index'indeki uygulama sayısı", name_index["apps"])
+            yield ("appsense_name_index_lookups_total", "counter", "Uygulama adı index'inde tam eşleşme aramaları", name_index["lookups"])
+            yield ("appsense_name_index_exact_hits_total", "counter", "Embedding'e gitmeden yanıtlanan ad eşleşmeleri", name_index["exact_hits"])
+
+        if self.search_service and self.search_service.suggest_index is not None:
+            suggest_index = self.search_service.suggest_index.stats()
+            yield ("appsense_suggest_index_entries", "gauge", "Öneri index'indeki kayıt sayısı", suggest_index["entries"])
+            yield ("appsense_suggest_tracked_queries", "gauge", "Sayacı tutulan farklı arama sorgusu", suggest_index["tracked_queries"])
+
+        if self.search_service and self.search_service.document_store is not None and self.search_service.document_store.cache is not None:
+            document_cache = self.search_service.document_store.cache.stats()
+            yield ("appsense_document_cache_hits_total", "counter", "Doküman önbelleği isabetleri", document_cache["hits"])
+            yield ("appsense_document_cache_misses_total", "counter", "Doküman deposundan okunan satırlar", document_cache["misses"])
+            yield ("appsense_document_cache_size", "gauge", "Doküman önbelleğindeki satır sayısı", document_cache["size"])
+
+        if self.search_service and self.search_service.app_cache is not None:
+            app_cache = self.search_service.app_cache.stats()
+            yield ("appsense_app_cache_hits_total", "counter", "Uygulama önbelleği isabetleri", app_cache["hits"])
+            yield ("appsense_app_cache_misses_total", "counter", "Uygulama önbelleği ıskaları", app_cache["misses"])
+
+        if self.search_cursors:
+            cursors = self.search_cursors.stats()
+            yield ("appsense_search_cursor_hits_total", "counter", "Önbellekten sunulan sonuç sayfaları", cursors["hits"])
+            yield ("appsense_search_cursor_misses_total", "counter", "Süresi dolmuş veya düşmüş cursor istekleri", cursors["misses"])
+            yield ("appsense_search_cursors", "gauge", "Önbellekteki cursor sayısı", cursors["size"])
+
+        if self.embedding_batcher:
+            batcher = self.embedding_batcher.stats()
+            yield ("appsense_embedding_batches_total", "counter", "Çalıştırılan embedding batch sayısı", batcher["batches"])
+            yield ("appsense_embedding_batch_items_total", "counter", "Batch'lenen sorgu sayısı", batcher["items"])
+            yield ("appsense_embedding_batch_queue_depth", "gauge", "Mikro-batch kuyruk derinliği", batcher["queue_depth"])
+
+        if self.llm_service and self.llm_service.analysis_cache:
+            analysis_cache = self.llm_service.analysis_cache.stats()
+            yield ("appsense_analysis_cache_hits_total", "counter", "Analiz önbelleği isabetleri", analysis_cache["hits"])
+            yield ("appsense_analysis_cache_misses_total", "counter", "Analiz önbelleği ıskaları", analysis_cache["misses"])
+            yield ("appsense_analysis_cache_saved_tokens_total", "counter", "Önbellek sayesinde harcanmayan token", analysis_cache["saved_tokens"])
+            yield ("appsense_analysis_cache_saved_seconds_total", "counter", "Önbellekten dönen analizlerin üretim süresi toplamı", analysis_cache["saved_latency_seconds"])
+
+        if self.analysis_jobs:
+            jobs = self.analysis_jobs.stats()
+            yield ("appsense_analysis_jobs_completed_total", "counter", "Tamamlanan arka plan analizleri", jobs["completed"])
+            yield ("appsense_analysis_jobs_failed_total", "counter", "Başarısız arka plan analizleri", jobs["failed"])
+            yield ("appsense_analysis_jobs_rejected_total", "counter", "Kuyruk dolu olduğu için reddedilen analizler", jobs["rejected"])
+            yield ("appsense_analysis_jobs_queue_depth", "gauge", "Bekleyen arka plan analizleri", jobs["queue_depth"])
+
+def get_services(request: Request) -> ServiceContainer:
+    """Hazır servis konteynerini getir (FastAPI dependency)"""
+    services = getattr(request.app.state, "services", None)
+    if services is None or not services.ready:
+        raise HTTPException(status_code=503, detail="Servisler henüz hazır değil")
+    return services
+
+def get_search_service(request: Request) -> SearchService:
+    """Paylaşılan arama servisini getir"""
+    return get_services(request).search_service
+
+def get_llm_service(request: Request) -> LLMService:
+    """Paylaşılan LLM servisini getir"""
+    return get_services(request).llm_service
+
+def get_language_detector(request: Request) -> LanguageDetector:
+    """Paylaşılan dil algılayıcıyı getir"""
+    return get_services(request).language_detector
+
+def get_analysis_jobs(request: Request) -> AnalysisJobManager:
+    """Paylaşılan arka plan analiz kuyruğunu getir"""
+    return get_services(request).analysis_jobs
+
+def get_search_cursors(request: Request) -> SearchCursorCache:
+    """Paylaşılan arama cursor önbelleğini getir"""
+    return get_services(request).search_cursors
@@ -0,0 +1,65 @@
+"""
+AppSense Thread Pool Yönetimi
+Bloklayıcı (CPU veya ağ) işlerini event loop dışında çalıştırmak için paylaşılan havuzlar
+
+Kural: model çağrıları, index taramaları (BM25, vektör araması), disk ve ağ
+G/Ç'si havuzlarda çalışır. Yalnızca event loop'tan kullanılan, sabit süreli
+bellek içi önbellek okumaları (cursor önbelleği, analiz önbelleği, öneri
+index'i) event loop'ta kalır; kilitleri thread'lerle çekişmediği için beklemez.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Havuz adı -> boyutunu veren ayar
+POOL_SIZES: Dict[str, Callable[[], int]] = {
+    "encode": lambda: settings.ENCODE_POOL_SIZE,
+    "vectorstore": lambda: settings.VECTOR_STORE_POOL_SIZE,
+    "documentstore": lambda: settings.DOCUMENT_STORE_POOL_SIZE,
+    # Bellek içi index işleri vektör araması ve Pinecone çağrılarının önünü tıkamasın
+    "lexical": lambda: settings.LEXICAL_POOL_SIZE,
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+def get_executor(name: str) -> ThreadPoolExecutor:
+    """İsimli thread pool'u getir (ilk kullanımda oluşturulur)"""
+    executor = _executors.get(name)
+    if executor:
+        return executor
+
+    with _lock:
+        if name not in _executors:
+            if name not in POOL_SIZES:
+                raise ValueError(f"Bilinmeyen thread pool: {name}")
+            size = POOL_SIZES[name]()
+            _executors[name] = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"appsense-{name}")
+            logger.info(f"Thread pool oluşturuldu: {name} ({size} worker)")
+        return _executors[name]
+
+async def run_blocking(pool: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Bloklayıcı fonksiyonu isimli havuzda çalıştır ve sonucunu bekle
+
+    Args:
+        pool: Havuz adı ("encode", "vectorstore", "documentstore", "lexical")
+        func: Çalıştırılacak fonksiyon
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(pool), partial(func, *args, **kwargs))
+
+def shutdown_executors():
+    """Tüm havuzları kapat"""
+    with _lock:
+        for name, executor in _executors.items():
+            executor.shutdown(wait=True, cancel_futures=True)
+            logger.info(f"Thread pool kapatıldı: {name}")
+        _executors.clear()
@@ -0,0 +1,168 @@
+"""
+AppSense Metrikleri
+Prometheus metin formatında sayaç ve histogramlar
+
+İstek yolunda yalnızca birkaç sayı artırılır; metin çıktısı ve servis
+istatistiklerinin toplanması sadece /metrics çağrıldığında yapılır.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Saniye cinsinden varsayılan gecikme kovaları
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (metrik adı, tip, açıklama, değer)
+CollectedMetric = Tuple[str, str, str, float]
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class Counter:
+    """Yalnızca artan sayaç"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Sabit kovalı histogram"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # etiketler -> [kova sayaçları..., +Inf sayacı, toplam]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in series_items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+class MetricsRegistry:
+    """Metrikleri ve scrape anında çalışan toplayıcıları tutar"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets or DEFAULT_BUCKETS)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedMetric]]):
+        """Scrape anında (ad, tip, açıklama, değer) döndüren fonksiyon ekle"""
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[CollectedMetric]]):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Prometheus metin formatında çıktı üret"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            for name, metric_type, help, value in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS_TOTAL = REGISTRY.counter(
+    "appsense_search_requests_total",
+    "Arama istekleri (endpoint ve duruma göre)",
+    ("endpoint", "status")
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "appsense_search_request_duration_seconds",
+    "Arama isteklerinin toplam süresi",
+    ("endpoint",)
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "appsense_search_stage_duration_seconds",
+    "Arama aşamalarının süresi",
+    ("stage",)
+)
+SEARCH_PATH_LATENCY = REGISTRY.histogram(
+    "appsense_search_path_duration_seconds",
+    "Arama yoluna göre (lexical, hybrid, vector) SearchService.search_apps süresi",
+    ("path",)
+)
+EMBEDDING_BATCH_SIZE = REGISTRY.histogram(
+    "appsense_embedding_batch_size",
+    "Mikro-batch başına modele giden sorgu sayısı",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
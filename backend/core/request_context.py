@@ -0,0 +1,57 @@
+"""
+AppSense İstek Bağlamı
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from core.metrics import REQUESTS_TOTAL, REQUEST_LATENCY, STAGE_LATENCY
+
+class RequestContext:
+    """Tek bir arama isteği boyunca servisler arasında taşınan durum"""
+
+    def __init__(self, query: str):
+        self.query = query
+        # SearchService tarafından doldurulur, LLM önbelleği tarafından kullanılır
+        self.query_embedding: Optional[List[float]] = None
+        # İstek başında bir kez algılanır, servisler tekrar algılamaz
+        self.language: Optional[str] = None
+        # SearchService tarafından doldurulur: sayfanın ötesindeki adaylarla
+        # (ID, vektör skoru, lexical skor) sıralaması
+        self.ranking: Optional[List[Tuple[str, float, Optional[float]]]] = None
+        # Aşama adı -> süre (saniye)
+        self.timings: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Bir aşamanın süresini ölç (aynı aşama tekrarlanırsa süreler toplanır)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def elapsed(self) -> float:
+        """İstek başından beri geçen süre (saniye)"""
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing başlığı değeri (milisaniye)"""
+        parts = [f"{name};dur={duration * 1000:.2f}" for name, duration in self.timings.items()]
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(parts)
+
+    def finish(self, endpoint: str, status: str = "ok") -> float:
+        """
+        Aşama sürelerini metriklere yaz
+
+        Returns:
+            Toplam işlem süresi (saniye)
+        """
+        total = self.elapsed()
+        for name, duration in self.timings.items():
+            STAGE_LATENCY.observe(duration, stage=name)
+        REQUEST_LATENCY.observe(total, endpoint=endpoint)
+        REQUESTS_TOTAL.inc(endpoint=endpoint, status=status)
+        return total
@@ -2,19 +2,36 @@
 AppSense Backend - LLM + RAG Tabanlı Uygulama Mağazası Arama Motoru
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 
 from api.routes import search_router
 from core.config import settings
+from core.container import ServiceContainer
+from core.metrics import REGISTRY
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Servisleri worker başına bir kez oluştur, kapanışta serbest bırak"""
+    services = ServiceContainer()
+    app.state.services = services
+
+    await services.startup()
+    try:
+        yield
+    finally:
+        await services.shutdown()
 
 app = FastAPI(
     title="AppSense API",
     description="LLM + RAG Tabanlı Uygulama Mağazası Arama Motoru",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS ayarları
@@ -43,6 +60,19 @@ async def health_check():
     """Sağlık kontrolü"""
     return {"status": "healthy", "service": "AppSense API"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Hazırlık kontrolü - servisler ısındırılana kadar 503 döner"""
+    services = getattr(app.state, "services", None)
+    if services is None or not services.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", "service": "AppSense API"})
+    return {"status": "ready", "service": "AppSense API"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrikleri"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
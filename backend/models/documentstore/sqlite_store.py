@@ -0,0 +1,274 @@
+"""
+AppSense Doküman Deposu (SQLite)
+Uygulamaların tam metadata'sı; vektör veritabanında yalnızca ID ve filtre alanları tutulur
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.config import PROJECT_ROOT, settings
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class SQLiteDocumentStore:
+    """
+    Uygulama dokümanlarının SQLite deposu
+
+    Veritabanı WAL modunda açılır; okuyucular yazıcıyı beklemez. Okuma
+    bağlantıları havuzdan alınır (her bağlantı aynı anda tek thread'de
+    kullanılır), yazmalar tek bir yazıcı bağlantısından yapılır. Arama
+    sonuçları tek bir `WHERE id IN (...)` sorgusuyla doldurulur, sık okunan
+    satırlar LRU önbellekte tutulur; yazma ve silme ilgili satırları önbellekten düşürür.
+    Başka bir process (ör. ingestion scripti) yazdığında yazıcı bağlantısının
+    `PRAGMA data_version` değeri değişir ve önbellek boşaltılır.
+    """
+
+    COLUMNS = (
+        'name', 'description', 'category', 'rating', 'review_count',
+        'download_count', 'price', 'developer', 'language'
+    )
+    # Sorgu başına bağlanan değişken sayısı (eski SQLite sürümlerinde üst sınır 999)
+    MAX_VARIABLES = 900
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Args:
+            url: "sqlite:///<yol>" biçiminde adres (varsayılan: settings.DATABASE_URL)
+            pool_size: Bağlantı havuzu boyutu (varsayılan: settings.DOCUMENT_STORE_POOL_SIZE)
+            cache_size: Önbellekte tutulan satır sayısı, 0 ise önbellek kapalı
+        """
+        self.path = self.parse_url(url or settings.DATABASE_URL)
+        pool_size = pool_size or settings.DOCUMENT_STORE_POOL_SIZE
+        cache_size = settings.DOCUMENT_CACHE_SIZE if cache_size is None else cache_size
+        self.cache = LRUCache(max_size=cache_size) if cache_size > 0 else None
+        # Önbellek boşaltıldıkça (veya satır düşürüldükçe) artan nesil
+        self._generation = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._connections = [self._connect() for _ in range(max(1, pool_size))]
+        for connection in self._connections:
+            self._pool.put(connection)
+        # Kendi yazmalarımız data_version'ı yalnızca diğer bağlantılarda değiştirir;
+        # yazma ve sürüm kontrolü aynı bağlantıda yapılınca yalnızca dış yazmalar görünür
+        self._writer = self._connect()
+        self._writer_lock = threading.Lock()
+        self._data_version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+        self._create_schema()
+        logger.info(f"Doküman deposu açıldı: {self.path} ({len(self._connections)} bağlantı)")
+
+    @staticmethod
+    def parse_url(url: str) -> str:
+        """
+        "sqlite:///<yol>" adresinden dosya yolu ("sqlite:////tmp/a.db" -> "/tmp/a.db")
+
+        Göreli yollar depo köküne göre çözülür; API (backend/) ve ingestion
+        scripti (scripts/) farklı dizinlerden çalışsa da aynı dosyayı açar.
+        """
+        prefix = "sqlite:///"
+        if not url.startswith(prefix) or url == f"{prefix}:memory:":
+            raise ValueError(f"Desteklenmeyen doküman deposu adresi: {url}")
+        path = Path(url[len(prefix):])
+        return str(path if path.is_absolute() else (PROJECT_ROOT / path).resolve())
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL ile NORMAL: commit'ler checkpoint'e kadar fsync beklemez, veritabanı tutarlı kalır
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _writing(self):
+        """Yazıcı bağlantısında transaction"""
+        with self._writer_lock, self._writer:
+            yield self._writer
+
+    def _sync_cache(self):
+        """Başka bir process commit ettiyse önbelleği boşalt (kendi yazmalarımız satır bazında düşürülür)"""
+        with self._writer_lock:
+            version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+            self._generation += 1
+            self.cache.clear()
+
+    @contextmanager
+    def _connection(self):
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def _create_schema(self):
+        columns = ",\n".join(
+            f"    {column} {'REAL' if column == 'rating' else 'INTEGER' if column == 'review_count' else 'TEXT'}"
+            for column in self.COLUMNS
+        )
+        with self._writing() as connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS apps (\n    id TEXT PRIMARY KEY,\n{columns},\n    updated_at REAL NOT NULL\n)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_apps_category ON apps (category)")
+
+    def _to_document(self, row: tuple) -> Dict[str, Any]:
+        """Satırı vektör metadata'sıyla aynı biçimde dokümana çevir"""
+        document = dict(zip(self.COLUMNS, row[1:]))
+        document['app_id'] = row[0]
+        # Dil yalnızca algılandıysa yazılır (build_document ile aynı)
+        if document['language'] is None:
+            del document['language']
+        return document
+
+    def upsert_documents(self, apps: Iterable[Dict[str, Any]]) -> int:
+        """
+        Uygulamaları ekle/güncelle (tek transaction)
+
+        Args:
+            apps: 'id' ve metadata alanlarını içeren uygulamalar
+
+        Returns:
+            Yazılan uygulama sayısı
+        """
+        now = time.time()
+        rows = [
+            (app['id'], *(app.get(column) for column in self.COLUMNS), now)
+            for app in apps if app.get('id')
+        ]
+        if not rows:
+            return 0
+
+        placeholders = ", ".join("?" * (len(self.COLUMNS) + 2))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in (*self.COLUMNS, 'updated_at'))
+        with self._writing() as connection:
+            connection.executemany(
+                f"INSERT INTO apps (id, {', '.join(self.COLUMNS)}, updated_at) VALUES ({placeholders}) "
+                f"ON CONFLICT (id) DO UPDATE SET {updates}",
+                rows
+            )
+        self._invalidate(row[0] for row in rows)
+        return len(rows)
+
+    def get_documents(self, app_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        ID'lere göre dokümanlar (önbellekte olmayanlar tek IN sorgusuyla okunur)
+
+        Returns:
+            ID -> doküman (bulunamayan ID'ler sözlükte yer almaz)
+        """
+        return self.lookup_documents(app_ids)[0]
+
+    def lookup_documents(self, app_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """
+        get_documents ile aynı, ayrıca önbellekten karşılanan ID sayısı
+
+        Returns:
+            (ID -> doküman, önbellek isabeti)
+        """
+        documents: Dict[str, Dict[str, Any]] = {}
+        if self.cache is not None:
+            self._sync_cache()
+        generation = self._generation
+        missing = []
+        for app_id in dict.fromkeys(app_ids):
+            document = self.cache.get(app_id) if self.cache is not None else None
+            if document is None:
+                missing.append(app_id)
+            else:
+                documents[app_id] = document
+        cache_hits = len(documents)
+        if not missing:
+            return documents, cache_hits
+
+        select = f"SELECT id, {', '.join(self.COLUMNS)} FROM apps WHERE id IN "
+        with self._connection() as connection:
+            for start in range(0, len(missing), self.MAX_VARIABLES):
+                chunk = missing[start:start + self.MAX_VARIABLES]
+                for row in connection.execute(f"{select}({', '.join('?' * len(chunk))})", chunk):
+                    document = self._to_document(row)
+                    documents[row[0]] = document
+                    # Okuma sırasında önbellek boşaltıldıysa eski satır geri yazılmaz
+                    if self.cache is not None and generation == self._generation:
+                        self.cache.set(row[0], document)
+        return documents, cache_hits
+
+    def get_document(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """ID ile doküman"""
+        return self.get_documents([app_id]).get(app_id)
+
+    def delete_documents(self, app_ids: Iterable[str]) -> int:
+        """
+        Dokümanları sil
+
+        Returns:
+            Silinen doküman sayısı
+        """
+        app_ids = list(dict.fromkeys(app_ids))
+        deleted = 0
+        with self._writing() as connection:
+            for start in range(0, len(app_ids), self.MAX_VARIABLES):
+                chunk = app_ids[start:start + self.MAX_VARIABLES]
+                cursor = connection.execute(f"DELETE FROM apps WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+                deleted += cursor.rowcount
+        self._invalidate(app_ids)
+        return deleted
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """Tüm uygulamalar, 'id' ve metadata alanlarıyla (lexical index kurulumu için)"""
+        with self._connection() as connection:
+            rows = connection.execute(f"SELECT id, {', '.join(self.COLUMNS)} FROM apps").fetchall()
+        return [{'id': row[0], **self._to_document(row)} for row in rows]
+
+    def version(self) -> Tuple[int, float]:
+        """Doküman sayısı ve son yazma zamanı (katalog değişti mi kontrolü için)"""
+        with self._connection() as connection:
+            count, updated_at = connection.execute("SELECT COUNT(*), MAX(updated_at) FROM apps").fetchone()
+        return count, updated_at or 0.0
+
+    def count(self) -> int:
+        with self._connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+
+    def _invalidate(self, app_ids: Iterable[str]):
+        if self.cache is not None:
+            self._generation += 1
+            for app_id in app_ids:
+                self.cache.pop(app_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Doküman sayısı ve önbellek istatistikleri"""
+        stats = {
+            "documents": self.count(),
+            "path": self.path,
+            "connections": len(self._connections)
+        }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    def close(self):
+        """Tüm bağlantıları kapat"""
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._writer.close()
+        logger.info("Doküman deposu kapatıldı")
+
+def create_document_store() -> Optional[SQLiteDocumentStore]:
+    """Ayarlara göre doküman deposunu aç (kapalıysa None)"""
+    if not settings.DOCUMENT_STORE_ENABLED:
+        return None
+    return SQLiteDocumentStore()
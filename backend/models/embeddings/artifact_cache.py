@@ -0,0 +1,271 @@
+"""
+AppSense Embedding Artifact Önbelleği
+Ingestion sırasında üretilen doküman embedding'lerinin diskteki kalıcı deposu
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingArtifactCache:
+    """
+    (model adı, metin hash'i) anahtarlı, disk üzerinde kalıcı embedding deposu
+
+    Her model kendi klasöründe tutulur:
+      vectors.npy  - memory-mapped (kapasite, boyut) float32/float16 matris
+      keys.bin     - satır sırasıyla 16 baytlık metin hash'leri (yalnızca sona eklenir)
+      meta.json    - model, boyut, dtype ve geçerli satır sayısı
+
+    Yeni embedding'ler ve anahtarları sona eklenir; ekleme başına yalnızca yeni
+    anahtarlar ve meta.json yazılır. meta.json en son yazıldığı için yarıda
+    kesilen bir ekleme, sayılmayan satırlar olarak kalır, yok sayılır ve bir
+    sonraki eklemede üzerine yazılır.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    KEYS_FILE = "keys.bin"
+    # Eski biçim: her eklemede baştan yazılan (N, 16) uint8 .npy; açılışta keys.bin'e çevrilir
+    LEGACY_KEYS_FILE = "keys.npy"
+    KEY_SIZE = 16
+    META_FILE = "meta.json"
+    INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        model_name: Optional[str] = None,
+        dimension: Optional[int] = None,
+        dtype: Optional[str] = None
+    ):
+        """
+        Args:
+            path: Önbellek kök klasörü (varsayılan: settings.EMBEDDING_ARTIFACT_CACHE_PATH)
+            model_name: Embedding modeli (varsayılan: settings.EMBEDDING_MODEL)
+            dimension: Embedding boyutu (varsayılan: settings.EMBEDDING_DIMENSION)
+            dtype: Diskteki saklama tipi, "float32" veya "float16"
+        """
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.dimension = dimension or settings.EMBEDDING_DIMENSION
+        self.dtype = np.dtype(dtype or settings.EMBEDDING_ARTIFACT_DTYPE)
+        if self.dtype not in (np.float32, np.float16):
+            raise ValueError(f"Desteklenmeyen dtype: {self.dtype}")
+
+        root = Path(path or settings.EMBEDDING_ARTIFACT_CACHE_PATH)
+        model_slug = "".join(c if c.isalnum() else "-" for c in self.model_name).strip("-")
+        model_hash = hashlib.sha1(self.model_name.encode("utf-8")).hexdigest()[:8]
+        self.path = root / f"{model_slug}-{model_hash}"
+
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.memmap] = None
+        self._keys: List[bytes] = []
+        self._key_to_row: Dict[bytes, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def text_key(text: str) -> bytes:
+        """Metnin 16 baytlık hash'i"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    @property
+    def count(self) -> int:
+        return len(self._keys)
+
+    def _load(self):
+        """Mevcut depoyu aç (boyut/dtype uyuşmazsa yok say)"""
+        meta_path = self.path / self.META_FILE
+        if not meta_path.exists():
+            return
+
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if (
+                meta.get("model") != self.model_name
+                or meta.get("dimension") != self.dimension
+                or meta.get("dtype") != self.dtype.name
+            ):
+                logger.warning("Embedding artifact önbelleği farklı ayarlarla oluşturulmuş, yok sayılıyor")
+                return
+
+            count = int(meta["count"])
+            self._keys = self._read_keys(count)
+            self._vectors = np.load(self.path / self.VECTORS_FILE, mmap_mode="r+")
+            self._key_to_row = {key: row for row, key in enumerate(self._keys)}
+            logger.info(f"Embedding artifact önbelleği açıldı: {count} vektör ({self.path})")
+
+        except Exception as e:
+            logger.error(f"Embedding artifact önbelleği açma hatası: {str(e)}")
+            self._vectors = None
+            self._keys = []
+            self._key_to_row = {}
+
+    def _ensure_capacity(self, required: int):
+        """Memmap dosyasının kapasitesini gerekirse iki katına çıkar"""
+        capacity = self._vectors.shape[0] if self._vectors is not None else 0
+        if required <= capacity:
+            return
+
+        new_capacity = max(self.INITIAL_CAPACITY, capacity * 2, required)
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path / f"tmp.{self.VECTORS_FILE}"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=self.dtype, shape=(new_capacity, self.dimension))
+        if self.count:
+            grown[:self.count] = self._vectors[:self.count]
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(tmp_path, self.path / self.VECTORS_FILE)
+        self._vectors = np.load(self.path / self.VECTORS_FILE, mmap_mode="r+")
+
+    def _read_keys(self, count: int) -> List[bytes]:
+        """keys.bin'in ilk count anahtarı (sayılmayan sondaki anahtarlar yok sayılır)"""
+        keys_path = self.path / self.KEYS_FILE
+        legacy_path = self.path / self.LEGACY_KEYS_FILE
+        if not keys_path.exists() and legacy_path.exists():
+            raw = np.load(legacy_path)[:count].tobytes()
+            self._rewrite_keys(raw)
+            legacy_path.unlink()
+            logger.info("Embedding artifact önbelleğinin anahtar dosyası keys.bin biçimine çevrildi")
+        else:
+            with open(keys_path, "rb") as f:
+                raw = f.read(count * self.KEY_SIZE)
+        if len(raw) != count * self.KEY_SIZE:
+            raise ValueError(f"Anahtar dosyası eksik: {len(raw) // self.KEY_SIZE} anahtar, beklenen {count}")
+        return [raw[i:i + self.KEY_SIZE] for i in range(0, len(raw), self.KEY_SIZE)]
+
+    def _append_keys(self, start: int, keys: Iterable[bytes]):
+        """Anahtarları start satırından itibaren yaz (önceki yarım eklemenin artıkları kesilir)"""
+        keys_path = self.path / self.KEYS_FILE
+        with open(keys_path, "r+b" if keys_path.exists() else "wb") as f:
+            f.seek(start * self.KEY_SIZE)
+            f.write(b"".join(keys))
+            f.truncate()
+
+    def _rewrite_keys(self, raw: bytes):
+        """keys.bin'i atomik olarak baştan yaz (prune ve eski biçimden dönüşüm)"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_keys = self.path / f"tmp.{self.KEYS_FILE}"
+        tmp_keys.write_bytes(raw)
+        os.replace(tmp_keys, self.path / self.KEYS_FILE)
+
+    def _write_meta(self):
+        """meta.json'ı atomik olarak yaz (eklemeyi kalıcı yapar)"""
+        tmp_meta = self.path / f"tmp.{self.META_FILE}"
+        tmp_meta.write_text(json.dumps({
+            "model": self.model_name,
+            "dimension": self.dimension,
+            "dtype": self.dtype.name,
+            "count": self.count
+        }), encoding="utf-8")
+        os.replace(tmp_meta, self.path / self.META_FILE)
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], Iterable]) -> np.ndarray:
+        """
+        Metinlerin embedding'lerini getir, yalnızca önbellekte olmayanları encode et
+
+        Args:
+            texts: Metinler
+            encode_fn: Eksik metinler için çağrılan fonksiyon (metin listesi -> embedding'ler)
+
+        Returns:
+            (len(texts), dimension) float32 matris, girdi sırasıyla
+        """
+        keys = [self.text_key(text) for text in texts]
+        with self._lock:
+            rows = [self._key_to_row.get(key) for key in keys]
+            missing: Dict[bytes, int] = {}
+            for i, row in enumerate(rows):
+                if row is None and keys[i] not in missing:
+                    missing[keys[i]] = i
+            self.hits += len(texts) - sum(1 for row in rows if row is None)
+            self.misses += len(missing)
+
+        if missing:
+            miss_texts = [texts[i] for i in missing.values()]
+            encoded = np.asarray(encode_fn(miss_texts), dtype=np.float32)
+            if encoded.shape != (len(miss_texts), self.dimension):
+                raise ValueError(f"Embedding boyutu {encoded.shape}, beklenen {(len(miss_texts), self.dimension)}")
+            with self._lock:
+                start = self.count
+                self._ensure_capacity(start + len(missing))
+                self._vectors[start:start + len(missing)] = encoded
+                self._vectors.flush()
+                self._append_keys(start, missing)
+                for offset, key in enumerate(missing):
+                    self._key_to_row[key] = start + offset
+                    self._keys.append(key)
+                self._write_meta()
+
+        with self._lock:
+            row_index = np.fromiter((self._key_to_row[key] for key in keys), dtype=np.int64, count=len(keys))
+            return np.asarray(self._vectors[row_index], dtype=np.float32)
+
+    def prune(self, referenced_texts: Iterable[str]) -> int:
+        """
+        Verilen metinlerde geçmeyen kayıtları sil ve depoyu sıkıştır
+
+        Returns:
+            Silinen kayıt sayısı
+        """
+        referenced = {self.text_key(text) for text in referenced_texts}
+        with self._lock:
+            keep_rows = [row for row, key in enumerate(self._keys) if key in referenced]
+            removed = self.count - len(keep_rows)
+            if removed == 0:
+                return 0
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path / f"tmp.{self.VECTORS_FILE}"
+            capacity = max(self.INITIAL_CAPACITY, len(keep_rows))
+            compacted = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=self.dtype, shape=(capacity, self.dimension))
+            if keep_rows:
+                compacted[:len(keep_rows)] = self._vectors[np.asarray(keep_rows)]
+            compacted.flush()
+            del compacted
+
+            self._keys = [self._keys[row] for row in keep_rows]
+            self._key_to_row = {key: row for row, key in enumerate(self._keys)}
+            self._vectors = None
+            os.replace(tmp_path, self.path / self.VECTORS_FILE)
+            self._vectors = np.load(self.path / self.VECTORS_FILE, mmap_mode="r+")
+            self._rewrite_keys(b"".join(self._keys))
+            self._write_meta()
+
+        logger.info(f"Embedding artifact önbelleğinden {removed} kayıt silindi, {self.count} kayıt kaldı")
+        return removed
+
+    def stats(self) -> Dict:
+        """Önbellek istatistikleri"""
+        total = self.hits + self.misses
+        size_bytes = sum(
+            (self.path / name).stat().st_size
+            for name in (self.VECTORS_FILE, self.KEYS_FILE, self.META_FILE)
+            if (self.path / name).exists()
+        )
+        return {
+            "model_name": self.model_name,
+            "path": str(self.path),
+            "dtype": self.dtype.name,
+            "entries": self.count,
+            "capacity": self._vectors.shape[0] if self._vectors is not None else 0,
+            "size_bytes": size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def close(self):
+        """Memmap'i serbest bırak"""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._vectors = None
@@ -0,0 +1,118 @@
+"""
+AppSense Sorgu Embedding Önbelleği
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from core.config import settings
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    Sorgu embedding'leri için LRU önbellek
+
+    Anahtar, normalize edilmiş sorgu metni ve model adıdır. settings.EMBEDDING_MODEL
+    değiştiğinde önbellek otomatik olarak temizlenir.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None
+    ):
+        """
+        Args:
+            max_size: Maksimum kayıt sayısı (varsayılan: settings.EMBEDDING_CACHE_SIZE)
+            ttl: Kayıt ömrü saniye (varsayılan: settings.EMBEDDING_CACHE_TTL, 0 = süresiz)
+            path: Kalıcı önbellek dosyası (varsayılan: settings.EMBEDDING_CACHE_PATH, boş = kapalı)
+        """
+        self._cache = LRUCache(
+            max_size=max_size or settings.EMBEDDING_CACHE_SIZE,
+            ttl=ttl if ttl is not None else settings.EMBEDDING_CACHE_TTL
+        )
+        self.model_name = settings.EMBEDDING_MODEL
+        path = path if path is not None else settings.EMBEDDING_CACHE_PATH
+        self.path = Path(path) if path else None
+        self.load()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Büyük/küçük harf ve boşluk farklarını yok say"""
+        return " ".join(text.casefold().split())
+
+    def _check_model(self):
+        """Model değiştiyse eski embedding'leri geçersiz kıl"""
+        if settings.EMBEDDING_MODEL != self.model_name:
+            logger.info(f"Embedding modeli değişti ({self.model_name} -> {settings.EMBEDDING_MODEL}), önbellek temizleniyor")
+            self._cache.clear()
+            self.model_name = settings.EMBEDDING_MODEL
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Önbellekteki embedding'i getir"""
+        self._check_model()
+        return self._cache.get((self.model_name, self.normalize_text(text)))
+
+    def set(self, text: str, embedding):
+        """Embedding'i önbelleğe ekle"""
+        self._check_model()
+        self._cache.set(
+            (self.model_name, self.normalize_text(text)),
+            np.asarray(embedding, dtype=np.float32)
+        )
+
+    def clear(self):
+        """Önbelleği temizle"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Önbellek istatistiklerini getir"""
+        return {**self._cache.stats(), "model_name": self.model_name}
+
+    def load(self):
+        """Kalıcı önbelleği diskten yükle"""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            stored = np.load(self.path, allow_pickle=False)
+            if str(stored['model']) != self.model_name:
+                logger.info("Kayıtlı embedding önbelleği farklı bir modele ait, yok sayılıyor")
+                return
+
+            for text, vector in zip(stored['texts'].tolist(), stored['vectors']):
+                self._cache.set((self.model_name, text), vector)
+            logger.info(f"Embedding önbelleği yüklendi: {len(self._cache)} kayıt")
+
+        except Exception as e:
+            logger.error(f"Embedding önbelleği yükleme hatası: {str(e)}")
+
+    def save(self):
+        """Önbelleği diske yaz"""
+        if not self.path:
+            return
+
+        try:
+            entries = [(key[1], vector) for key, vector in self._cache.items() if key[0] == self.model_name]
+            if not entries:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"tmp.{self.path.name}")
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    model=np.array(self.model_name),
+                    texts=np.array([text for text, _ in entries]),
+                    vectors=np.stack([vector for _, vector in entries])
+                )
+            os.replace(tmp_path, self.path)
+            logger.info(f"Embedding önbelleği kaydedildi: {len(entries)} kayıt")
+
+        except Exception as e:
+            logger.error(f"Embedding önbelleği kaydetme hatası: {str(e)}")
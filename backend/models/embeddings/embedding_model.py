@@ -3,26 +3,39 @@ AppSense Embedding Model
 """
 
 import logging
-from typing import List, Union
-from sentence_transformers import SentenceTransformer
+from typing import Dict, List, Optional, Union
 from core.config import settings
+from models.embeddings.embedding_cache import EmbeddingCache
+from models.embeddings.onnx_encoder import OnnxSentenceEncoder
 
 logger = logging.getLogger(__name__)
 
 class EmbeddingModel:
-    """Sentence Transformers tabanlı embedding modeli"""
+    """
+    Sentence Transformers tabanlı embedding modeli
+
+    settings.EMBEDDING_BACKEND "onnx" ise aynı model, export edilmiş ONNX
+    grafiği üzerinden (OnnxSentenceEncoder) çalıştırılır.
+    """
     
     def __init__(self):
         self.model = None
+        self.cache = EmbeddingCache() if settings.EMBEDDING_CACHE_SIZE > 0 else None
         self._load_model()
     
     def _load_model(self):
         """Embedding modelini yükle"""
         try:
             model_name = settings.EMBEDDING_MODEL
-            logger.info(f"Embedding modeli yükleniyor: {model_name}")
+            logger.info(f"Embedding modeli yükleniyor: {model_name} ({settings.EMBEDDING_BACKEND})")
             
-            self.model = SentenceTransformer(model_name)
+            if settings.EMBEDDING_BACKEND == "onnx":
+                self.model = OnnxSentenceEncoder()
+            elif settings.EMBEDDING_BACKEND == "torch":
+                from sentence_transformers import SentenceTransformer
+                self.model = SentenceTransformer(model_name)
+            else:
+                raise ValueError(f"Bilinmeyen embedding backend'i: {settings.EMBEDDING_BACKEND}")
             logger.info("Embedding modeli başarıyla yüklendi")
             
         except Exception as e:
@@ -33,6 +46,8 @@ class EmbeddingModel:
         """
         Metni embedding'e çevir
         
+        Tek metin sorguları önce embedding önbelleğinde aranır.
+        
         Args:
             text: Tek metin veya metin listesi
             
@@ -43,8 +58,16 @@ class EmbeddingModel:
             if not self.model:
                 raise Exception("Embedding modeli yüklenmemiş")
             
+            if isinstance(text, str) and self.cache:
+                cached = self.cache.get(text)
+                if cached is not None:
+                    return cached.tolist()
+            
             embeddings = self.model.encode(text)
             
+            if isinstance(text, str) and self.cache:
+                self.cache.set(text, embeddings)
+            
             # Tek metin için liste döndür
             if isinstance(text, str):
                 return embeddings.tolist()
@@ -55,6 +78,47 @@ class EmbeddingModel:
             logger.error(f"Embedding oluşturma hatası: {str(e)}")
             raise Exception(f"Embedding oluşturulamadı: {str(e)}")
     
+    def encode_queries(self, texts: List[str], check_cache: bool = True) -> List[List[float]]:
+        """
+        Sorgu listesini önbellek üzerinden tek model çağrısıyla embedding'e çevir
+        
+        Args:
+            texts: Sorgu metinleri
+            check_cache: False ise önbellekte aranmaz (çağıran zaten baktıysa), yalnızca yazılır
+            
+        Returns:
+            Girdi sırasıyla embedding vektörleri
+        """
+        try:
+            if not self.model:
+                raise Exception("Embedding modeli yüklenmemiş")
+            
+            results: List[Optional[List[float]]] = [None] * len(texts)
+            missing: Dict[str, List[int]] = {}
+            for i, text in enumerate(texts):
+                cached = self.cache.get(text) if self.cache and check_cache else None
+                if cached is not None:
+                    results[i] = cached.tolist()
+                else:
+                    # Aynı sorgu batch'te birden fazla kez varsa bir kez encode et
+                    missing.setdefault(text, []).append(i)
+            
+            if missing:
+                missing_texts = list(missing)
+                embeddings = self.model.encode(missing_texts, batch_size=len(missing_texts))
+                for text, embedding in zip(missing_texts, embeddings):
+                    if self.cache:
+                        self.cache.set(text, embedding)
+                    vector = embedding.tolist()
+                    for i in missing[text]:
+                        results[i] = vector
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Sorgu embedding oluşturma hatası: {str(e)}")
+            raise Exception(f"Sorgu embedding'leri oluşturulamadı: {str(e)}")
+    
     def encode_batch(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
         """
         Toplu embedding oluştur
@@ -77,6 +141,12 @@ class EmbeddingModel:
             logger.error(f"Toplu embedding oluşturma hatası: {str(e)}")
             raise Exception(f"Toplu embedding oluşturulamadı: {str(e)}")
     
+    def close(self):
+        """Model belleğini serbest bırak, önbelleği kalıcı hale getir"""
+        if self.cache:
+            self.cache.save()
+        self.model = None
+    
     def get_model_info(self) -> dict:
         """Model bilgilerini getir"""
         if not self.model:
@@ -84,6 +154,8 @@ class EmbeddingModel:
         
         return {
             "model_name": settings.EMBEDDING_MODEL,
+            "backend": settings.EMBEDDING_BACKEND,
             "max_seq_length": self.model.max_seq_length,
-            "embedding_dimension": self.model.get_sentence_embedding_dimension()
+            "embedding_dimension": self.model.get_sentence_embedding_dimension(),
+            "cache": self.cache.stats() if self.cache else None
         } 
\ No newline at end of file
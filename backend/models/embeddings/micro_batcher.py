@@ -0,0 +1,178 @@
+"""
+AppSense Embedding Mikro-Batch'leyicisi
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from core.config import settings
+from core.executors import run_blocking
+from core.metrics import EMBEDDING_BATCH_SIZE
+from models.embeddings.embedding_model import EmbeddingModel
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingMicroBatcher:
+    """
+    Eşzamanlı tek sorgu embedding isteklerini toplayıp tek model çağrısında işler
+
+    İlk istek geldikten sonra en fazla `max_wait_ms` kadar ya da `max_batch_size`
+    sorgu birikene kadar beklenir, ardından tek bir `model.encode(list)` çağrısı
+    yapılır ve her çağırana kendi vektörü döndürülür.
+    """
+
+    def __init__(
+        self,
+        embedding_model: EmbeddingModel,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        max_queue_size: Optional[int] = None
+    ):
+        self.embedding_model = embedding_model
+        self.max_batch_size = max_batch_size or settings.EMBEDDING_BATCH_MAX_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.EMBEDDING_BATCH_MAX_WAIT_MS) / 1000
+        self.max_queue_size = max_queue_size or settings.EMBEDDING_BATCH_QUEUE_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Kuyruktan alınıp henüz yanıtlanmamış istekler (kapanışta iptal edilir)
+        self._current: list = []
+
+        # Metrikler
+        self.batches = 0
+        self.items = 0
+        self.cache_hits = 0
+        self.max_observed_batch = 0
+        self.max_observed_queue_depth = 0
+        self.total_wait_ms = 0.0
+        self.batch_size_counts: Dict[int, int] = {}
+
+    async def start(self):
+        """Arka plan işleyicisini başlat"""
+        if self._worker:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Embedding mikro-batch'leyici başlatıldı (batch: {self.max_batch_size}, "
+            f"bekleme: {self.max_wait * 1000:.1f} ms)"
+        )
+
+    async def stop(self):
+        """Arka plan işleyicisini durdur, bekleyen ve işlenmekte olan istekleri iptal et"""
+        if not self._worker:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        for _, future, _ in self._current:
+            if not future.done():
+                future.cancel()
+        self._current = []
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def encode(self, text: str) -> List[float]:
+        """
+        Tek sorguyu batch'e ekleyip embedding'ini bekle
+
+        Args:
+            text: Sorgu metni
+
+        Returns:
+            Embedding vektörü
+        """
+        if not self._worker:
+            raise Exception("Embedding mikro-batch'leyici başlatılmamış")
+
+        # Önbellekte varsa kuyruğa girmeden döndür
+        cache = self.embedding_model.cache
+        if cache:
+            cached = cache.get(text)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached.tolist()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        self.max_observed_queue_depth = max(self.max_observed_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> list:
+        """İlk istekten sonra pencere dolana kadar istekleri topla"""
+        loop = asyncio.get_running_loop()
+        # Toplanan istekler self._current üzerinde tutulur; toplama sırasında iptal edilse de kaybolmaz
+        batch = self._current = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Kuyrukta hazır bekleyenleri beklemeden al
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        """Batch'leri toplayıp modeli çalıştıran ana döngü"""
+        while True:
+            batch = await self._collect()
+
+            # İptal edilmiş istekleri modele gönderme
+            batch = self._current = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            texts = [text for text, _, _ in batch]
+            try:
+                # Önbellek encode() içinde kontrol edildi, burada tekrar bakma
+                vectors = await run_blocking(
+                    "encode", self.embedding_model.encode_queries, texts, check_cache=False
+                )
+            except Exception as e:
+                logger.error(f"Batch embedding hatası: {str(e)}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._current = []
+                continue
+
+            for (_, future, enqueued), vector in zip(batch, vectors):
+                self.total_wait_ms += (started - enqueued) * 1000
+                if not future.done():
+                    future.set_result(vector)
+            self._current = []
+
+            size = len(batch)
+            self.batches += 1
+            self.items += size
+            self.max_observed_batch = max(self.max_observed_batch, size)
+            self.batch_size_counts[size] = self.batch_size_counts.get(size, 0) + 1
+            EMBEDDING_BATCH_SIZE.observe(size)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch boyutu, bekleme süresi ve kuyruk derinliği metrikleri"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "cache_hits": self.cache_hits,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_observed_batch,
+            "batch_size_counts": dict(sorted(self.batch_size_counts.items())),
+            "avg_wait_ms": self.total_wait_ms / self.items if self.items else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self.max_observed_queue_depth
+        }
@@ -0,0 +1,119 @@
+"""
+AppSense ONNX Embedding Encoder
+Dışa aktarılmış (int8 quantize edilmiş) ONNX grafiği ile CPU üzerinde embedding
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Union
+import numpy as np
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+CONFIG_FILE = "encoder_config.json"
+
+class OnnxSentenceEncoder:
+    """
+    SentenceTransformer.encode ile aynı arayüze sahip ONNX Runtime encoder'ı
+
+    Klasör scripts/export_onnx_model.py ile oluşturulur: transformer grafiği,
+    hızlı (Rust) tokenizer ve pooling/normalize ayarlarını içeren
+    encoder_config.json. Pooling numpy ile yapıldığı için vektörler mevcut
+    index'teki SentenceTransformer vektörleriyle uyumludur.
+    """
+
+    def __init__(self, path: str = None, quantized: bool = None, num_threads: int = None):
+        """
+        Args:
+            path: Export klasörü (varsayılan: settings.EMBEDDING_ONNX_PATH)
+            quantized: int8 grafiği kullan (varsayılan: settings.EMBEDDING_ONNX_QUANTIZED)
+            num_threads: Operatör içi thread sayısı, 0 ise ONNX Runtime seçer
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.path = Path(path or settings.EMBEDDING_ONNX_PATH)
+        quantized = settings.EMBEDDING_ONNX_QUANTIZED if quantized is None else quantized
+        num_threads = settings.EMBEDDING_ONNX_THREADS if num_threads is None else num_threads
+
+        config_path = self.path / CONFIG_FILE
+        if not config_path.exists():
+            raise FileNotFoundError(
+                f"ONNX modeli bulunamadı: {self.path} (scripts/export_onnx_model.py ile oluşturun)"
+            )
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+        if config["model_name"] != settings.EMBEDDING_MODEL:
+            raise ValueError(
+                f"ONNX modeli {config['model_name']} için export edilmiş, beklenen {settings.EMBEDDING_MODEL}"
+            )
+
+        self.model_name = config["model_name"]
+        self.max_seq_length = config["max_seq_length"]
+        self.dimension = config["dimension"]
+        self.pooling = config["pooling"]
+        self.normalize = config["normalize"]
+
+        self.tokenizer = Tokenizer.from_file(str(self.path / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=config["pad_token_id"], pad_token=config["pad_token"])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        model_file = self.path / (QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        self.session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self._input_names = {node.name for node in self.session.get_inputs()}
+        self.model_file = model_file
+        logger.info(f"ONNX embedding modeli yüklendi: {model_file.name} ({'int8' if quantized else 'float32'})")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _pool(self, token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Token embedding'lerinden cümle embedding'i (sentence-transformers Pooling ile aynı)"""
+        if self.pooling == "cls":
+            return token_embeddings[:, 0]
+        mask = attention_mask[..., None].astype(np.float32)
+        if self.pooling == "max":
+            return np.where(mask > 0, token_embeddings, -1e9).max(axis=1)
+        summed = (token_embeddings * mask).sum(axis=1)
+        return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        embeddings = self._pool(token_embeddings, attention_mask)
+        if self.normalize:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype(np.float32)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32) -> np.ndarray:
+        """
+        Metin(ler)i embedding'e çevir
+
+        Padding'i azaltmak için metinler uzunluğa göre sıralanıp batch'lenir,
+        sonuç girdi sırasıyla döner.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            rows = order[start:start + batch_size]
+            embeddings[rows] = self._encode_batch([texts[i] for i in rows])
+
+        return embeddings[0] if single else embeddings
@@ -0,0 +1,186 @@
+"""
+AppSense Uygulama Adı (Lexical) Index'i
+Normalize edilmiş ad -> uygulama eşlemesi ve ad/açıklama üzerinde BM25
+"""
+
+import logging
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+def normalize(text: str) -> str:
+    """Küçük harf, aksansız, yalnızca harf/rakam ve tek boşluk ("WhatsApp®  Messenger" -> "whatsapp messenger")"""
+    text = unicodedata.normalize('NFKD', (text or '').casefold().replace('ı', 'i'))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(TOKEN_RE.findall(text))
+
+def tokenize(text: str) -> List[str]:
+    return normalize(text).split()
+
+class NameIndex:
+    """
+    Katalogdan kurulan bellek içi lexical index
+
+    Tam eşleşme için boşluksuz normalize ad -> satırlar eşlemesi ("Whats App" ve
+    "WhatsApp" aynı anahtara düşer), sıralı aday için ad ve açıklama
+    alanlarında BM25 tutar. Her terimin posting listesi (satırlar, skor katkısı)
+    kurulumda hesaplanır; sorgu skoru katkıların toplamıdır.
+    """
+
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    # Ad alanındaki eşleşmeler açıklamadakinden değerli
+    FIELD_WEIGHTS = {'name': 2.0, 'description': 1.0}
+    # Katalogun yarısından fazlasında geçen sorgu terimleri atlanır (açıklama etiketleri vb.)
+    MAX_DOCUMENT_FREQUENCY = 0.5
+
+    def __init__(self):
+        self._apps: List[Dict[str, Any]] = []
+        self._categories = np.empty(0, dtype=object)
+        self._popularity = np.empty(0, dtype=np.float64)
+        self._exact: Dict[str, List[int]] = {}
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.lookups = 0
+        self.exact_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._apps)
+
+    @staticmethod
+    def name_key(name: str) -> str:
+        """Tam eşleşme anahtarı (normalize ad, boşluksuz)"""
+        return normalize(name).replace(' ', '')
+
+    def build(self, apps: Iterable[Dict[str, Any]]):
+        """
+        Index'i uygulama listesinden kur (mevcut index'in yerine geçer)
+
+        Args:
+            apps: 'id' ve metadata alanlarını içeren uygulamalar
+        """
+        apps = list(apps)
+        exact: Dict[str, List[int]] = {}
+        for row, app in enumerate(apps):
+            key = self.name_key(app.get('name', ''))
+            if key:
+                exact.setdefault(key, []).append(row)
+
+        # terim -> [(satırlar, katkılar), ...] alan başına
+        parts: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        for field, weight in self.FIELD_WEIGHTS.items():
+            counts = [Counter(tokenize(app.get(field, ''))) for app in apps]
+            lengths = np.array([sum(count.values()) for count in counts], dtype=np.float64)
+            average_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+            norms = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * lengths / average_length)
+
+            field_postings: Dict[str, Tuple[List[int], List[int]]] = {}
+            for row, count in enumerate(counts):
+                for token, tf in count.items():
+                    rows, tfs = field_postings.setdefault(token, ([], []))
+                    rows.append(row)
+                    tfs.append(tf)
+
+            for token, (rows, tfs) in field_postings.items():
+                rows = np.array(rows, dtype=np.int64)
+                tfs = np.array(tfs, dtype=np.float64)
+                idf = np.log(1 + (len(apps) - len(rows) + 0.5) / (len(rows) + 0.5))
+                contribution = weight * idf * tfs * (self.BM25_K1 + 1) / (tfs + norms[rows])
+                parts.setdefault(token, []).append((rows, contribution))
+
+        postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for token, token_parts in parts.items():
+            if len(token_parts) == 1:
+                rows, contribution = token_parts[0]
+            else:
+                # Terim hem adda hem açıklamada geçiyorsa katkılar satır başına toplanır
+                rows, inverse = np.unique(np.concatenate([p[0] for p in token_parts]), return_inverse=True)
+                contribution = np.bincount(inverse, weights=np.concatenate([p[1] for p in token_parts]))
+            postings[token] = (rows.astype(np.int32), contribution.astype(np.float32))
+
+        self._apps = apps
+        self._categories = np.array([app.get('category', '') for app in apps], dtype=object)
+        self._popularity = np.array([app.get('review_count') or 0 for app in apps], dtype=np.float64)
+        self._exact = exact
+        self._postings = postings
+        logger.info(f"Uygulama adı index'i kuruldu: {len(apps)} uygulama, {len(postings)} terim")
+
+    def _result(self, row: int, score: float) -> Dict[str, Any]:
+        # Vektör skorundan (cosine) ayrı alan: API'de lexical_score olarak döner
+        return {**self._apps[row], 'lexical_score': score}
+
+    def lookup_exact(self, query: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Adı sorguyla (normalize edilmiş halde) birebir aynı olan uygulamalar
+
+        Aynı ada sahip birden fazla uygulama varsa yorum sayısına göre sıralanır.
+
+        Returns:
+            lexical_score=1.0 ile sonuçlar (eşleşme yoksa boş)
+        """
+        self.lookups += 1
+        rows = self._exact.get(self.name_key(query), [])
+        if category:
+            rows = [row for row in rows if self._categories[row] == category]
+        if not rows:
+            return []
+        self.exact_hits += 1
+        rows = sorted(rows, key=lambda row: -self._popularity[row])
+        return [self._result(row, 1.0) for row in rows]
+
+    def search(self, query: str, top_k: int, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        BM25 ile en iyi top_k uygulama
+
+        Returns:
+            Skora göre azalan sonuçlar; 'lexical_score' en iyi sonucun skoruna bölünür (0-1]
+        """
+        max_rows = self.MAX_DOCUMENT_FREQUENCY * len(self._apps)
+        matched = [
+            self._postings[token] for token in dict.fromkeys(tokenize(query))
+            if token in self._postings and len(self._postings[token][0]) <= max_rows
+        ]
+        if not matched or top_k <= 0:
+            return []
+
+        rows, inverse = np.unique(np.concatenate([m[0] for m in matched]), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate([m[1] for m in matched]))
+        if category:
+            keep = self._categories[rows] == category
+            rows, scores = rows[keep], scores[keep]
+            if not len(rows):
+                return []
+
+        k = min(top_k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        best = scores[top[0]]
+        return [self._result(int(rows[i]), float(scores[i] / best)) for i in top]
+
+    def match(
+        self,
+        query: str,
+        top_k: int,
+        category: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Tam ad eşleşmeleri ve BM25 adayları (aramanın tek thread pool çağrısı)
+
+        Returns:
+            (lookup_exact sonuçları, search sonuçları)
+        """
+        return self.lookup_exact(query, category), self.search(query, top_k, category)
+
+    def stats(self) -> Dict[str, Any]:
+        """Index boyutu ve tam eşleşme istatistikleri"""
+        return {
+            "apps": len(self._apps),
+            "terms": len(self._postings),
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits
+        }
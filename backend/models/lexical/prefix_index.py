@@ -0,0 +1,287 @@
+"""
+AppSense Öneri (Typeahead) Prefix Index'i
+Uygulama adları, kategoriler ve popüler sorgular üzerinde sıralı dizi + ikili arama
+"""
+
+import logging
+import math
+import re
+import threading
+from bisect import bisect_left
+from heapq import nlargest
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from models.lexical.name_index import normalize
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+NON_DIGIT_RE = re.compile(r'\D')
+
+# (gösterilen metin, tip, skor, uygulama ID'si)
+Entry = Tuple[str, str, float, Optional[str]]
+
+class PrefixIndex:
+    """
+    Typeahead için prefix index'i
+
+    Normalize edilmiş metinler sıralı bir listede tutulur, prefix'in aralığı
+    ikili aramayla bulunur. Çok kayıt içeren kısa prefix'ler ("a", "fi") için
+    en iyi kayıtlar önceden hesaplanır (ağır prefix'ler); böylece her sorgu en
+    fazla HEAVY_RANGE kaydı sıralar. Uygulamalar eklenip silindikçe liste ve
+    ağır prefix'ler yerinde güncellenir.
+
+    Skorlar: uygulama = log10(indirme + 1) + puan, kategori = içindeki en
+    yüksek uygulama skoru, popüler sorgu = QUERY_BASE_SCORE + log2(arama sayısı).
+    """
+
+    # Bu kadar kayıttan fazlasını kapsayan prefix'lerin en iyileri önceden tutulur
+    HEAVY_RANGE = 64
+    # Ağır prefix başına tutulan kayıt (aynı metinli kayıtlar elendikten sonra yetmesi için geniş)
+    HEAVY_TOP = 64
+    # Silmelerle bu sayının altına düşen liste aralıktan yeniden hesaplanır
+    HEAVY_REFILL = 32
+    MAX_LIMIT = 20
+    QUERY_BASE_SCORE = 8.0
+
+    def __init__(self, query_min_count: int = 3, query_track_size: int = 50000):
+        """
+        Args:
+            query_min_count: Sorgunun öneri olması için gereken arama sayısı
+            query_track_size: Sayacı tutulan en fazla farklı sorgu
+        """
+        self.query_min_count = query_min_count
+        self._query_counts = LRUCache(max_size=query_track_size)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        self._entries: Dict[int, Entry] = {}
+        self._entry_keys: Dict[int, str] = {}
+        self._next_id = 0
+        # uygulama ID'si / "category:<ad>" / "query:<metin>" -> kayıt ID'si
+        self._owners: Dict[str, int] = {}
+        self._heavy: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def app_score(app: Dict[str, Any]) -> float:
+        """İndirme sayısı ("1,000,000+") ve puana göre skor"""
+        installs = NON_DIGIT_RE.sub('', str(app.get('download_count') or ''))
+        rating = app.get('rating') or 0.0
+        return math.log10(int(installs) + 1 if installs else 1) + float(rating)
+
+    def build(self, apps: Iterable[Dict[str, Any]]):
+        """Index'i uygulama listesinden baştan kur (izlenen sorgu sayaçları korunur)"""
+        with self._lock:
+            self._reset()
+            for app in apps:
+                self._add_app(app, sort=False)
+            order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+            self._keys = [self._keys[i] for i in order]
+            self._ids = [self._ids[i] for i in order]
+            self._compute_heavy()
+            logger.info(f"Öneri index'i kuruldu: {len(self._keys)} kayıt, {len(self._heavy)} ağır prefix")
+
+    def _compute_heavy(self):
+        """Aralığı HEAVY_RANGE'den büyük tüm prefix'lerin en iyi kayıtlarını hesapla"""
+        self._heavy = {}
+        pending = sorted({key[:1] for key in self._keys if key})
+        while pending:
+            longer = []
+            for prefix in pending:
+                lo, hi = self._range(prefix)
+                if hi - lo <= self.HEAVY_RANGE:
+                    continue
+                self._heavy[prefix] = self._top(lo, hi)
+                longer.extend({key[:len(prefix) + 1] for key in self._keys[lo:hi] if len(key) > len(prefix)})
+            pending = longer
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + '\uffff')
+
+    def _top(self, lo: int, hi: int) -> List[int]:
+        return nlargest(self.HEAVY_TOP, self._ids[lo:hi], key=lambda entry_id: self._entries[entry_id][2])
+
+    def _insert(self, key: str, entry: Entry, owner: str, sort: bool = True):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+        self._entry_keys[entry_id] = key
+        self._owners[owner] = entry_id
+        if not sort:
+            self._keys.append(key)
+            self._ids.append(entry_id)
+            return
+
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._ids.insert(position, entry_id)
+        self._promote(key, entry_id)
+
+    def _promote(self, key: str, entry_id: int):
+        """Kaydı (yeni veya skoru artmış) ağır prefix listelerine yerleştir"""
+        score = self._entries[entry_id][2]
+        for length in range(1, len(key) + 1):
+            top = self._heavy.get(key[:length])
+            if top is None:
+                continue
+            if entry_id in top:
+                top.remove(entry_id)
+            elif len(top) >= self.HEAVY_TOP and score <= self._entries[top[-1]][2]:
+                continue
+            scores = [-self._entries[other][2] for other in top]
+            top.insert(bisect_left(scores, -score), entry_id)
+            del top[self.HEAVY_TOP:]
+
+    def _remove(self, owner: str):
+        entry_id = self._owners.pop(owner, None)
+        if entry_id is None:
+            return
+        key = self._entry_keys.pop(entry_id)
+        position = bisect_left(self._keys, key)
+        while self._ids[position] != entry_id:
+            position += 1
+        del self._keys[position]
+        del self._ids[position]
+        del self._entries[entry_id]
+
+        for length in range(1, len(key) + 1):
+            prefix = key[:length]
+            top = self._heavy.get(prefix)
+            if top is None or entry_id not in top:
+                continue
+            top.remove(entry_id)
+            # Kalan liste hâlâ kalan kayıtların en iyileridir; yalnızca çok kısalınca yeniden hesapla
+            if len(top) < self.HEAVY_REFILL:
+                lo, hi = self._range(prefix)
+                if hi - lo > self.HEAVY_RANGE:
+                    self._heavy[prefix] = self._top(lo, hi)
+                else:
+                    del self._heavy[prefix]
+
+    def _add_app(self, app: Dict[str, Any], sort: bool = True):
+        name = app.get('name') or ''
+        key = normalize(name)
+        if not key:
+            return
+        score = self.app_score(app)
+        self._insert(key, (name, 'app', score, app.get('id')), app.get('id'), sort)
+
+        category = app.get('category') or ''
+        category_key = normalize(category)
+        if not category_key:
+            return
+        owner = f"category:{category_key}"
+        entry_id = self._owners.get(owner)
+        if entry_id is None:
+            self._insert(category_key, (category, 'category', score, None), owner, sort)
+        elif score > self._entries[entry_id][2]:
+            self._entries[entry_id] = (category, 'category', score, None)
+            if sort:
+                self._promote(category_key, entry_id)
+
+    def upsert_apps(self, apps: Iterable[Dict[str, Any]]):
+        """Eklenen/güncellenen uygulamaları index'e yansıt"""
+        with self._lock:
+            for app in apps:
+                self._remove(app.get('id'))
+                self._add_app(app)
+
+    def delete_apps(self, app_ids: Iterable[str]):
+        """Silinen uygulamaları index'ten çıkar (kategori skorları korunur)"""
+        with self._lock:
+            for app_id in app_ids:
+                self._remove(app_id)
+
+    def adopt_queries(self, other: "PrefixIndex"):
+        """
+        Eski index'in sorgu sayaçlarını ve popüler sorgu önerilerini devral
+
+        Katalog değişince index yeni bir nesne olarak kurulup eskisinin yerine
+        konur; aramalardan biriken sorgu önerileri böylece kaybolmaz. Sayaçlar
+        paylaşılır, takas sırasında eski index'e yazılan sayımlar da korunur.
+        """
+        with other._lock:
+            queries = [
+                (owner[len("query:"):], other._entries[entry_id])
+                for owner, entry_id in other._owners.items() if owner.startswith("query:")
+            ]
+            query_counts = other._query_counts
+        with self._lock:
+            self._query_counts = query_counts
+            for key, entry in queries:
+                if f"query:{key}" not in self._owners:
+                    self._insert(key, entry, f"query:{key}")
+
+    def record_query(self, query: str):
+        """Aranan sorguyu say; yeterince aranınca öneri olarak ekle"""
+        key = normalize(query)
+        if not key:
+            return
+        with self._lock:
+            count = (self._query_counts.get(key) or 0) + 1
+            self._query_counts.set(key, count)
+            if count < self.query_min_count:
+                return
+            score = self.QUERY_BASE_SCORE + math.log2(count)
+            owner = f"query:{key}"
+            entry_id = self._owners.get(owner)
+            if entry_id is None:
+                self._insert(key, (query.strip(), 'query', score, None), owner)
+            else:
+                self._entries[entry_id] = (self._entries[entry_id][0], 'query', score, None)
+                self._promote(key, entry_id)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Prefix ile başlayan en yüksek skorlu öneriler
+
+        Aynı metin birden fazla kez geçiyorsa (aynı adlı uygulamalar) en
+        yüksek skorlu olanı döner.
+
+        Args:
+            prefix: Kullanıcının yazdığı metin
+            limit: Öneri sayısı (en fazla MAX_LIMIT)
+
+        Returns:
+            'text', 'type' ('app', 'category', 'query'), 'score' ve 'app_id' alanlı öneriler
+        """
+        key = normalize(prefix)
+        limit = min(limit, self.MAX_LIMIT)
+        if not key or limit <= 0:
+            return []
+
+        with self._lock:
+            candidates = self._heavy.get(key)
+            if candidates is None:
+                lo, hi = self._range(key)
+                if hi - lo > self.HEAVY_RANGE:
+                    # Eklemelerle ağırlaşan prefix: bir kez hesapla, sonra yerinde güncellenir
+                    candidates = self._heavy[key] = self._top(lo, hi)
+                else:
+                    candidates = sorted(self._ids[lo:hi], key=lambda entry_id: -self._entries[entry_id][2])
+
+            suggestions = []
+            seen = set()
+            for entry_id in candidates:
+                text, kind, score, app_id = self._entries[entry_id]
+                dedupe_key = (self._entry_keys[entry_id], kind)
+                if dedupe_key in seen:
+                    continue
+                seen.add(dedupe_key)
+                suggestions.append({'text': text, 'type': kind, 'score': score, 'app_id': app_id})
+                if len(suggestions) >= limit:
+                    break
+            return suggestions
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._keys),
+                "heavy_prefixes": len(self._heavy),
+                "tracked_queries": len(self._query_counts)
+            }
@@ -0,0 +1,163 @@
+"""
+AppSense Vector Store Arayüzü
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+from core.config import settings
+
+class VectorStore(ABC):
+    """Tüm vektör veritabanı backend'lerinin uyguladığı arayüz"""
+
+    # Doküman deposu açıkken vektörle saklanan (filtrelemede kullanılan) alanlar
+    FILTER_FIELDS = ('category', 'language')
+
+    @abstractmethod
+    async def upsert_apps(self, apps_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Uygulamaları vektör veritabanına ekle/güncelle
+
+        Args:
+            apps_data: Uygulama verileri listesi ('embedding' alanı ile)
+
+        Returns:
+            Batch başına sonuçlar: 'batch', 'ids', 'size_bytes', 'attempts',
+            'success' ve 'error' alanları (bkz. upsert_succeeded)
+        """
+
+    @abstractmethod
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filter_category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vektör veritabanında arama yap
+
+        Args:
+            query_embedding: Sorgu embedding'i
+            top_k: Maksimum sonuç sayısı
+            filter_category: Kategori filtresi
+
+        Returns:
+            'id', 'score' ve metadata alanlarını içeren sonuçlar
+        """
+
+    async def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_ks: List[int],
+        filter_categories: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu ara (varsayılan: sorgular eşzamanlı aranır)
+
+        Args:
+            query_embeddings: Sorgu embedding'leri
+            top_ks: Her sorgu için maksimum sonuç sayısı
+            filter_categories: Her sorgu için kategori filtresi
+
+        Returns:
+            Girdi sırasıyla her sorgunun sonuçları
+        """
+        filter_categories = filter_categories or [None] * len(query_embeddings)
+        return list(await asyncio.gather(*(
+            self.search(query_embedding=embedding, top_k=top_k, filter_category=category)
+            for embedding, top_k, category in zip(query_embeddings, top_ks, filter_categories)
+        )))
+
+    @abstractmethod
+    async def get_by_id(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """ID ile uygulama getir"""
+
+    async def get_by_ids(self, app_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Birden fazla ID ile uygulama getir (varsayılan: ID'ler eşzamanlı getirilir)
+
+        Returns:
+            ID -> 'id' ve metadata alanlarını içeren uygulama (bulunamayanlar yer almaz)
+        """
+        apps = await asyncio.gather(*(self.get_by_id(app_id) for app_id in app_ids))
+        return {app_id: app for app_id, app in zip(app_ids, apps) if app}
+
+    @abstractmethod
+    async def delete_app(self, app_id: str) -> bool:
+        """Uygulamayı sil"""
+
+    async def delete_apps(self, app_ids: List[str]) -> int:
+        """
+        Birden fazla uygulamayı sil
+
+        Returns:
+            Silinen uygulama sayısı
+        """
+        deleted = 0
+        for app_id in app_ids:
+            if await self.delete_app(app_id):
+                deleted += 1
+        return deleted
+
+    @abstractmethod
+    async def get_index_stats(self) -> Dict[str, Any]:
+        """Index istatistiklerini getir"""
+
+    @staticmethod
+    def batch_result(
+        batch: int,
+        ids: List[str],
+        success: bool,
+        size_bytes: int = 0,
+        attempts: int = 1,
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Tek bir upsert batch'inin sonucu"""
+        return {
+            'batch': batch,
+            'ids': ids,
+            'size_bytes': size_bytes,
+            'attempts': attempts,
+            'success': success,
+            'error': error
+        }
+
+    @staticmethod
+    def upsert_succeeded(results: List[Dict[str, Any]]) -> bool:
+        """Tüm batch'ler başarılıysa (ve en az bir batch varsa) True"""
+        return bool(results) and all(result['success'] for result in results)
+
+    async def close(self):
+        """Kaynakları serbest bırak (gerekiyorsa kalıcı hale getir)"""
+
+    @staticmethod
+    def build_document(app: Dict[str, Any]) -> Dict[str, Any]:
+        """Uygulama verisinden tam metadata'yı (doküman) oluştur"""
+        document = {
+            'name': app.get('name', ''),
+            'description': app.get('description', ''),
+            'category': app.get('category', ''),
+            'rating': app.get('rating'),
+            'review_count': app.get('review_count'),
+            'download_count': app.get('download_count', ''),
+            'price': app.get('price', 'Ücretsiz'),
+            'developer': app.get('developer', ''),
+            'app_id': app.get('id', '')
+        }
+        # Dil yalnızca ingestion'da algılandıysa yazılır
+        if app.get('language'):
+            document['language'] = app['language']
+        return document
+
+    @classmethod
+    def build_metadata(cls, app: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vektörle saklanan metadata
+
+        Doküman deposu açıksa yalnızca filtre alanları (FILTER_FIELDS) yazılır;
+        sonuçların geri kalanı arama sonrası depodan doldurulur.
+        """
+        document = cls.build_document(app)
+        if not settings.DOCUMENT_STORE_ENABLED:
+            return document
+        return {field: document[field] for field in cls.FILTER_FIELDS if field in document}
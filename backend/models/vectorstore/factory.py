@@ -0,0 +1,33 @@
+"""
+AppSense Vector Store Fabrikası
+"""
+
+import logging
+from typing import Optional
+from core.config import settings
+from models.vectorstore.base import VectorStore
+
+logger = logging.getLogger(__name__)
+
+def create_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    Ayarlara göre vektör veritabanı backend'ini oluştur
+
+    Args:
+        backend: "pinecone" veya "local" (varsayılan: settings.VECTOR_STORE_BACKEND)
+
+    Returns:
+        VectorStore örneği
+    """
+    backend = (backend or settings.VECTOR_STORE_BACKEND).lower()
+    logger.info(f"Vektör veritabanı backend'i: {backend}")
+
+    # Kullanılmayan backend'in bağımlılıklarını yüklememek için geç import
+    if backend == "local":
+        from models.vectorstore.local_store import LocalVectorStore
+        return LocalVectorStore()
+    if backend == "pinecone":
+        from models.vectorstore.pinecone_store import PineconeStore
+        return PineconeStore()
+
+    raise ValueError(f"Bilinmeyen vektör veritabanı backend'i: {backend}")
@@ -0,0 +1,202 @@
+"""
+AppSense IVF (Inverted File) Yaklaşık En Yakın Komşu Index'i
+"""
+
+import logging
+import math
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class IVFIndex:
+    """
+    Küme tabanlı yaklaşık en yakın komşu index'i
+
+    Vektörler küresel k-means ile `nlist` kümeye ayrılır. Sorguda yalnızca
+    sorguya en yakın `nprobe` kümenin satırları aday olarak döndürülür;
+    skorlama vektörleri tutan store tarafından yapılır. Index yalnızca satır
+    numarası -> küme atamasını tutar, vektörlerin kopyasını tutmaz.
+    """
+
+    # Küme başına eğitimde kullanılacak örnek sayısı
+    TRAIN_SAMPLES_PER_LIST = 64
+    # Eğitim için küme başına gereken minimum vektör sayısı
+    MIN_POINTS_PER_LIST = 39
+    ASSIGN_CHUNK_SIZE = 65536
+
+    def __init__(self, dimension: int, nlist: int = 0, nprobe: int = 16, train_iterations: int = 20, seed: int = 0):
+        """
+        Args:
+            dimension: Vektör boyutu
+            nlist: Küme sayısı (0 ise eğitimde 4 * sqrt(N) seçilir)
+            nprobe: Sorguda taranacak varsayılan küme sayısı
+            train_iterations: k-means iterasyon sayısı
+            seed: Rastgelelik tohumu
+        """
+        self.dimension = dimension
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._lists_dirty = True
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def effective_nlist(self, count: int) -> int:
+        """Verilen vektör sayısı için kullanılacak küme sayısı"""
+        if self.nlist > 0:
+            return self.nlist
+        return max(1, int(4 * math.sqrt(count)))
+
+    def can_train(self, count: int) -> bool:
+        """Eğitim için yeterli vektör var mı"""
+        return count >= self.effective_nlist(count) * self.MIN_POINTS_PER_LIST
+
+    def train(self, vectors: np.ndarray):
+        """
+        Küresel k-means ile küme merkezlerini öğren ve tüm satırları ata
+
+        Args:
+            vectors: Normalize edilmiş vektörler (N, D)
+        """
+        count = vectors.shape[0]
+        nlist = min(self.effective_nlist(count), count)
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(count, nlist * self.TRAIN_SAMPLES_PER_LIST)
+        sample = vectors[np.sort(rng.choice(count, sample_size, replace=False))]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(self.train_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            sizes = np.bincount(labels, minlength=nlist)
+
+            # Boş kalan kümeleri rastgele örneklerle yeniden başlat
+            empty = np.flatnonzero(sizes == 0)
+            if len(empty):
+                sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        self.centroids = np.ascontiguousarray(centroids)
+        self._assignments = np.empty(0, dtype=np.int32)
+        self.add(np.arange(count), vectors)
+        self._rebuild_lists(count)
+        logger.info(f"IVF index eğitildi: {count} vektör, {nlist} küme")
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Vektörleri en yakın kümeye ata (bellek için parçalar halinde)"""
+        labels = np.empty(vectors.shape[0], dtype=np.int32)
+        for start in range(0, vectors.shape[0], self.ASSIGN_CHUNK_SIZE):
+            chunk = vectors[start:start + self.ASSIGN_CHUNK_SIZE]
+            labels[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        """
+        Yeni veya güncellenen satırları yeniden eğitmeden kümelere ata
+
+        Args:
+            rows: Store'daki satır numaraları
+            vectors: Bu satırların normalize edilmiş vektörleri
+        """
+        if not self.is_trained or len(rows) == 0:
+            return
+        rows = np.asarray(rows)
+        required = int(rows.max()) + 1
+        if required > len(self._assignments):
+            grown = np.full(max(required, len(self._assignments) * 2), -1, dtype=np.int32)
+            grown[:len(self._assignments)] = self._assignments
+            self._assignments = grown
+        self._assignments[rows] = self._assign(vectors)
+        self._lists_dirty = True
+
+    def remove(self, row: int):
+        """Silinen satırı kümelerden çıkar"""
+        if not self.is_trained or row >= len(self._assignments):
+            return
+        self._assignments[row] = -1
+        self._lists_dirty = True
+
+    def move(self, src: int, dst: int):
+        """Store'da taşınan satırın atamasını güncelle"""
+        if not self.is_trained:
+            return
+        self._assignments[dst] = self._assignments[src]
+        self._assignments[src] = -1
+        self._lists_dirty = True
+
+    def _rebuild_lists(self, count: int):
+        """Atamalardan CSR biçiminde ters listeleri oluştur"""
+        labels = self._assignments[:count]
+        self._order = np.argsort(labels, kind='stable').astype(np.int64)
+        sizes = np.bincount(labels[labels >= 0], minlength=len(self.centroids))
+        # -1 (atanmamış) satırlar sıralamanın başında kalır, atlanır
+        skipped = count - int(sizes.sum())
+        self._offsets = np.concatenate(([0], np.cumsum(sizes))) + skipped
+        self._lists_dirty = False
+
+    def candidates(self, query: np.ndarray, count: int, nprobe: Optional[int] = None) -> np.ndarray:
+        """
+        Sorguya en yakın kümelerdeki aday satırları getir
+
+        Args:
+            query: Normalize edilmiş sorgu vektörü
+            count: Store'daki geçerli satır sayısı
+            nprobe: Taranacak küme sayısı
+
+        Returns:
+            Aday satır numaraları
+        """
+        if self._lists_dirty:
+            self._rebuild_lists(count)
+
+        nlist = len(self.centroids)
+        nprobe = min(max(1, nprobe or self.nprobe), nlist)
+        centroid_scores = self.centroids @ query
+        if nprobe < nlist:
+            probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probes = np.arange(nlist)
+
+        return np.concatenate([
+            self._order[self._offsets[p]:self._offsets[p + 1]] for p in probes
+        ])
+
+    def save(self, path: Path, count: int):
+        """Index'i diske yaz"""
+        if not self.is_trained:
+            return
+        np.savez(path, centroids=self.centroids, assignments=self._assignments[:count])
+
+    def load(self, path: Path, count: int) -> bool:
+        """
+        Diskteki index'i yükle
+
+        Returns:
+            Index store ile uyumluysa True
+        """
+        if not path.exists():
+            return False
+        stored = np.load(path)
+        centroids = stored['centroids']
+        assignments = stored['assignments']
+        if centroids.shape[1] != self.dimension or len(assignments) != count:
+            logger.warning("Kayıtlı IVF index'i store ile uyumsuz, yok sayılıyor")
+            return False
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._assignments = assignments.astype(np.int32)
+        self._lists_dirty = True
+        return True
@@ -0,0 +1,591 @@
+"""
+AppSense Yerel (In-Process) Vector Store
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+from core.config import settings
+from core.executors import run_blocking
+from models.vectorstore.base import VectorStore
+from models.vectorstore.ivf_index import IVFIndex
+from models.vectorstore.quantization import VectorCodec, create_codec
+
+logger = logging.getLogger(__name__)
+
+class LocalVectorStore(VectorStore):
+    """
+    NumPy tabanlı yerel vektör veritabanı
+
+    Normalize edilmiş embedding'ler tek bir bitişik float32 matriste tutulur,
+    kosinüs benzerliği tek bir matris çarpımı ve argpartition ile hesaplanır.
+    index_type "ivf" ise aramalar IVF index'inin seçtiği aday satırlarla
+    sınırlanır (yaklaşık arama).
+
+    storage "float16", "int8" veya "pq" ise bellekte yalnızca sıkıştırılmış
+    kodlar tutulur; tam hassasiyetli vektörler diskteki vectors.npy'den
+    copy-on-write memory-map ile okunur (worker'lar sayfa önbelleğini paylaşır).
+    Arama kodları tarar, en iyi top_k * rescore_factor adayı tam hassasiyetli
+    vektörlerle yeniden skorlar. Ekleme yapan süreçte (ingestion) matris
+    büyürken vektörler yeniden belleğe alınır, save() sonrası tekrar map edilir.
+    """
+
+    # Toplu aramada tek seferde hesaplanan en fazla skor (sorgu x satır)
+    BATCH_SCORE_ELEMENTS = 1 << 24
+
+    VECTORS_FILE = "vectors.npy"
+    METADATA_FILE = "metadata.json"
+    IVF_FILE = "ivf.npz"
+    CODES_FILE = "codes.npz"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dimension: Optional[int] = None,
+        index_type: Optional[str] = None,
+        storage: Optional[str] = None,
+        rescore_factor: Optional[int] = None,
+        pq_subvectors: Optional[int] = None
+    ):
+        self.path = Path(path or settings.LOCAL_VECTOR_STORE_PATH)
+        self.dimension = dimension or settings.EMBEDDING_DIMENSION
+        self.index_type = (index_type or settings.LOCAL_INDEX_TYPE).lower()
+        if self.index_type not in ("flat", "ivf"):
+            raise ValueError(f"Bilinmeyen index tipi: {self.index_type}")
+        self._ann: Optional[IVFIndex] = None
+        if self.index_type == "ivf":
+            self._ann = IVFIndex(
+                dimension=self.dimension,
+                nlist=settings.IVF_NLIST,
+                nprobe=settings.IVF_NPROBE,
+                train_iterations=settings.IVF_TRAIN_ITERATIONS
+            )
+        self.storage = (storage or settings.LOCAL_VECTOR_STORAGE).lower()
+        self.rescore_factor = max(1, rescore_factor or settings.LOCAL_RESCORE_FACTOR)
+        self._codec: Optional[VectorCodec] = None
+        if self.storage != "float32":
+            self._codec = create_codec(
+                self.storage, self.dimension, pq_subvectors or settings.LOCAL_PQ_SUBVECTORS
+            )
+            self._codes = np.empty((0, self._codec.code_size), dtype=self._codec.code_dtype)
+        self._lock = threading.RLock()
+        self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+        self._count = 0
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._category_masks: Dict[str, np.ndarray] = {}
+        self._masks_dirty = True
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Diskteki index'i yükle"""
+        vectors_path = self.path / self.VECTORS_FILE
+        metadata_path = self.path / self.METADATA_FILE
+        if not vectors_path.exists() or not metadata_path.exists():
+            logger.info(f"Yerel vektör index'i bulunamadı, boş başlatılıyor: {self.path}")
+            return
+
+        try:
+            # Sıkıştırılmış modda tam hassasiyetli vektörler belleğe okunmaz
+            vectors = np.load(vectors_path, mmap_mode='c' if self._codec else None)
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+
+            if vectors.shape[0] != len(stored['ids']) or vectors.shape[1] != self.dimension:
+                raise ValueError(f"Index boyutu uyumsuz: {vectors.shape}")
+
+            self._vectors = vectors if self._codec else np.ascontiguousarray(vectors, dtype=np.float32)
+            self._count = vectors.shape[0]
+            self._ids = stored['ids']
+            self._metadata = stored['metadata']
+            self._id_to_row = {app_id: row for row, app_id in enumerate(self._ids)}
+            self._masks_dirty = True
+            logger.info(f"Yerel vektör index'i yüklendi: {self._count} vektör")
+
+            if self._ann and not self._ann.load(self.path / self.IVF_FILE, self._count):
+                self._maybe_train()
+            if self._codec and not self._load_codes():
+                self._maybe_train_codec()
+
+        except Exception as e:
+            logger.error(f"Yerel index yükleme hatası: {str(e)}")
+            raise Exception(f"Yerel vektör index'i yüklenemedi: {str(e)}")
+
+    def _load_codes(self) -> bool:
+        """Kayıtlı codec parametrelerini ve kodları yükle"""
+        codes_path = self.path / self.CODES_FILE
+        if not codes_path.exists():
+            return False
+        stored = dict(np.load(codes_path))
+        codes = stored.pop('codes')
+        if (
+            str(stored.pop('storage')) != self.storage
+            or codes.shape != (self._count, self._codec.code_size)
+            or not self._codec.load_state(stored)
+        ):
+            logger.warning("Kayıtlı vektör kodları store ile uyumsuz, yeniden oluşturuluyor")
+            return False
+        self._codes = codes.astype(self._codec.code_dtype)
+        return True
+
+    def _maybe_train_codec(self):
+        """Codec eğitilmemişse ve yeterli vektör varsa eğit, tüm satırları kodla"""
+        if not self._codec or self._codec.is_trained or not self._codec.can_train(self._count):
+            return
+        vectors = self._vectors[:self._count]
+        self._codec.train(vectors)
+        codes = np.empty((self._vectors.shape[0], self._codec.code_size), dtype=self._codec.code_dtype)
+        codes[:self._count] = self._codec.encode(vectors)
+        self._codes = codes
+        logger.info(f"Vektör kodları oluşturuldu: {self._count} vektör ({self.storage})")
+
+    @property
+    def _compressed(self) -> bool:
+        """Aramalar sıkıştırılmış kodlar üzerinden mi yapılıyor"""
+        return self._codec is not None and self._codec.is_trained
+
+    def save(self):
+        """Index'i diske yaz"""
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            vectors_path = self.path / self.VECTORS_FILE
+            metadata_path = self.path / self.METADATA_FILE
+
+            # Yarım kalmış yazmaların index'i bozmaması için önce geçici dosyaya yaz
+            tmp_vectors = vectors_path.with_suffix('.tmp.npy')
+            tmp_metadata = metadata_path.with_suffix('.tmp')
+            np.save(tmp_vectors, self._vectors[:self._count])
+            with open(tmp_metadata, 'w', encoding='utf-8') as f:
+                json.dump({'ids': self._ids, 'metadata': self._metadata}, f, ensure_ascii=False)
+            os.replace(tmp_vectors, vectors_path)
+            os.replace(tmp_metadata, metadata_path)
+
+            if self._ann and self._ann.is_trained:
+                tmp_ivf = self.path / f"tmp.{self.IVF_FILE}"
+                self._ann.save(tmp_ivf, self._count)
+                os.replace(tmp_ivf, self.path / self.IVF_FILE)
+
+            if self._compressed:
+                tmp_codes = self.path / f"tmp.{self.CODES_FILE}"
+                np.savez(tmp_codes, storage=np.array(self.storage), codes=self._codes[:self._count], **self._codec.state())
+                os.replace(tmp_codes, self.path / self.CODES_FILE)
+
+            if self._codec:
+                # Bellekteki tam hassasiyetli kopyayı bırak, yazılan dosyayı map et
+                self._vectors = np.load(vectors_path, mmap_mode='c')
+
+            self._dirty = False
+            logger.info(f"Yerel vektör index'i kaydedildi: {self._count} vektör")
+
+    def _ensure_capacity(self, required: int):
+        """Matris kapasitesini gerekirse iki katına çıkar"""
+        capacity = self._vectors.shape[0]
+        if required > capacity:
+            new_capacity = max(required, capacity * 2, 1024)
+            grown = np.empty((new_capacity, self.dimension), dtype=np.float32)
+            grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+
+        if self._compressed and self._codes.shape[0] < required:
+            grown_codes = np.empty((self._vectors.shape[0], self._codec.code_size), dtype=self._codec.code_dtype)
+            grown_codes[:self._count] = self._codes[:self._count]
+            self._codes = grown_codes
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Vektörleri birim uzunluğa getir"""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _get_category_mask(self, category: str) -> Optional[np.ndarray]:
+        """Kategori için önceden hesaplanmış satır maskesini getir"""
+        if self._masks_dirty:
+            categories = np.array([m.get('category', '') for m in self._metadata], dtype=object)
+            self._category_masks = {
+                value: categories == value for value in set(categories.tolist())
+            }
+            self._masks_dirty = False
+        return self._category_masks.get(category)
+
+    def _maybe_train(self):
+        """Yeterli vektör biriktiyse IVF index'ini eğit"""
+        if self._ann and not self._ann.is_trained and self._ann.can_train(self._count):
+            self._ann.train(self._vectors[:self._count])
+
+    def train_index(self):
+        """IVF index'ini mevcut vektörlerle (yeniden) eğit"""
+        if not self._ann:
+            raise ValueError("IVF index'i yalnızca index_type='ivf' ile kullanılabilir")
+        with self._lock:
+            if self._count == 0:
+                return
+            self._ann.train(self._vectors[:self._count])
+            self._dirty = True
+
+    def _upsert_sync(self, apps: List[Dict[str, Any]]) -> int:
+        """Embedding'leri normalize edip index'e yaz (vektörlerin bayt boyutunu döndürür)"""
+        vectors = self._normalize(np.asarray([app['embedding'] for app in apps], dtype=np.float32))
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(f"Embedding boyutu {vectors.shape[1]}, beklenen {self.dimension}")
+
+        with self._lock:
+            self._ensure_capacity(self._count + len(apps))
+            rows = np.empty(len(apps), dtype=np.int64)
+            for i, (app, vector) in enumerate(zip(apps, vectors)):
+                app_id = app.get('id')
+                row = self._id_to_row.get(app_id)
+                if row is None:
+                    row = self._count
+                    self._count += 1
+                    self._ids.append(app_id)
+                    self._metadata.append({})
+                    self._id_to_row[app_id] = row
+                self._vectors[row] = vector
+                self._metadata[row] = self.build_metadata(app)
+                rows[i] = row
+
+            # Eğitilmiş IVF index'ine yeniden eğitmeden ekle
+            if self._ann and self._ann.is_trained:
+                self._ann.add(rows, vectors)
+            else:
+                self._maybe_train()
+
+            if self._compressed:
+                self._codes[rows] = self._codec.encode(vectors)
+            else:
+                self._maybe_train_codec()
+
+            self._masks_dirty = True
+            self._dirty = True
+        return vectors.nbytes
+
+    async def upsert_apps(self, apps_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Uygulamaları yerel index'e ekle/güncelle
+
+        Args:
+            apps_data: Uygulama verileri listesi
+
+        Returns:
+            Tek batch'lik sonuç listesi (tüm uygulamalar tek seferde eklenir)
+        """
+        apps = [app for app in apps_data if app.get('embedding') is not None and len(app['embedding']) > 0]
+        ids = [app.get('id') for app in apps]
+        if not apps:
+            logger.warning("Eklenecek vektör bulunamadı")
+            return []
+
+        try:
+
+            # Kilit arama thread'leriyle paylaşılır; event loop'ta beklenmez
+            size_bytes = await run_blocking("vectorstore", self._upsert_sync, apps)
+            logger.info(f"{len(apps)} uygulama yerel vektör index'ine eklendi")
+            return [self.batch_result(0, ids, True, size_bytes=size_bytes)]
+
+        except Exception as e:
+            logger.error(f"Vektör ekleme hatası: {str(e)}")
+            return [self.batch_result(0, ids, False, error=str(e))]
+
+    def _top_k(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        filter_category: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        exact: bool = False
+    ):
+        """
+        En yüksek skorlu satırları bul (kilit altında çağrılmalıdır)
+
+        Returns:
+            (satır numaraları, skorlar) - skora göre azalan sırada
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        if self._count == 0 or top_k <= 0:
+            return empty
+
+        mask = None
+        if filter_category:
+            mask = self._get_category_mask(filter_category)
+            if mask is None:
+                return empty
+
+        # Sıkıştırılmış modda kodlarla daha fazla aday seçilip yeniden skorlanır
+        candidates = top_k * self.rescore_factor if self._compressed and not exact else top_k
+
+        # Yaklaşık arama: yalnızca yakın kümelerdeki adayları skorla
+        if self._ann and self._ann.is_trained and not exact:
+            rows = self._ann.candidates(query, self._count, nprobe)
+            if mask is not None:
+                rows = rows[mask[rows]]
+            if len(rows) >= top_k:
+                top, scores = self._select_top(self._scan(query, rows), candidates)
+                return self._rescore(query, rows[top], scores, top_k)
+            # Filtre sonrası aday yetersizse tam aramaya düş
+
+        if exact:
+            return self._select_top(self._vectors[:self._count] @ query, top_k, mask)
+        rows, scores = self._select_top(self._scan(query), candidates, mask)
+        return self._rescore(query, rows, scores, top_k)
+
+    def _scan(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Satırların skorları; sıkıştırılmış modda kodlar üzerinden yaklaşık"""
+        if self._compressed:
+            codes = self._codes[:self._count] if rows is None else self._codes[rows]
+            return self._codec.scores(query, codes)
+        vectors = self._vectors[:self._count] if rows is None else self._vectors[rows]
+        return vectors @ query
+
+    def _rescore(self, query: np.ndarray, rows: np.ndarray, scores: np.ndarray, top_k: int):
+        """Kodlarla seçilen adayları tam hassasiyetli vektörlerle yeniden skorla"""
+        if not self._compressed:
+            return rows, scores
+        exact_scores = self._vectors[rows] @ query
+        order = np.argsort(-exact_scores)[:top_k]
+        return rows[order], exact_scores[order]
+
+    @staticmethod
+    def _select_top(scores: np.ndarray, top_k: int, mask: Optional[np.ndarray] = None):
+        """Tüm satırların skorlarından (varsa maske içindeki) en iyi top_k'yı seç"""
+        available = len(scores)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            available = int(np.count_nonzero(mask))
+
+        k = min(top_k, available)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top_rows = np.argpartition(-scores, k - 1)[:k]
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
+        return top_rows, scores[top_rows]
+
+    def _format_rows(self, rows: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        """Satırları arama sonucu formatına çevir (kilit altında çağrılmalıdır)"""
+        return [
+            {
+                'id': self._ids[row],
+                'score': float(score),
+                **self._metadata[row]
+            }
+            for row, score in zip(rows, scores)
+        ]
+
+    def _search_sync(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        filter_category: Optional[str],
+        nprobe: Optional[int],
+        exact: bool
+    ) -> List[Dict[str, Any]]:
+        """Aramayı kilit altında yap ve sonuçları formatla"""
+        with self._lock:
+            rows, scores = self._top_k(query, top_k, filter_category, nprobe, exact)
+            return self._format_rows(rows, scores)
+
+    def _search_batch_sync(
+        self,
+        queries: np.ndarray,
+        top_ks: List[int],
+        filter_categories: List[Optional[str]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu tek kilit altında ara
+
+        Tam aramada skorlar sorgu blokları halinde tek matris çarpımıyla
+        hesaplanır; IVF eğitilmişse veya vektörler sıkıştırılmışsa her sorgu
+        ayrı aranır.
+        """
+        with self._lock:
+            if self._count == 0:
+                return [[] for _ in top_ks]
+
+            if (self._ann and self._ann.is_trained) or self._compressed:
+                return [
+                    self._format_rows(*self._top_k(query, top_k, category))
+                    for query, top_k, category in zip(queries, top_ks, filter_categories)
+                ]
+
+            results: List[List[Dict[str, Any]]] = []
+            block_size = max(1, self.BATCH_SCORE_ELEMENTS // self._count)
+            vectors = self._vectors[:self._count]
+            for start in range(0, len(queries), block_size):
+                block_scores = queries[start:start + block_size] @ vectors.T
+                for offset, scores in enumerate(block_scores):
+                    index = start + offset
+                    category = filter_categories[index]
+                    mask = self._get_category_mask(category) if category else None
+                    if category and mask is None:
+                        results.append([])
+                        continue
+                    results.append(self._format_rows(*self._select_top(scores, top_ks[index], mask)))
+            return results
+
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filter_category: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        exact: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Yerel index'te kosinüs benzerliği ile arama yap
+
+        Args:
+            query_embedding: Sorgu embedding'i
+            top_k: Maksimum sonuç sayısı
+            filter_category: Kategori filtresi
+            nprobe: IVF'de taranacak küme sayısı (varsayılan: settings.IVF_NPROBE)
+            exact: IVF index'i olsa bile tam arama yap
+
+        Returns:
+            Arama sonuçları
+        """
+        try:
+            query = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+
+            # Büyük kataloglarda matris çarpımı event loop'u bloklamasın
+            formatted_results = await run_blocking(
+                "vectorstore", self._search_sync, query, top_k, filter_category, nprobe, exact
+            )
+
+            logger.info(f"Arama tamamlandı: {len(formatted_results)} sonuç bulundu")
+            return formatted_results
+
+        except Exception as e:
+            logger.error(f"Arama hatası: {str(e)}")
+            return []
+
+    async def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_ks: List[int],
+        filter_categories: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Sorguları tek bir thread pool çağrısında, bloklu matris çarpımıyla ara"""
+        if not query_embeddings:
+            return []
+        filter_categories = filter_categories or [None] * len(query_embeddings)
+        try:
+            queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+            results = await run_blocking(
+                "vectorstore", self._search_batch_sync, queries, top_ks, filter_categories
+            )
+            logger.info(f"Toplu arama tamamlandı: {len(results)} sorgu")
+            return results
+
+        except Exception as e:
+            logger.error(f"Toplu arama hatası: {str(e)}")
+            return [[] for _ in query_embeddings]
+
+    def _get_by_id_sync(self, app_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._id_to_row.get(app_id)
+            if row is None:
+                return None
+            return {
+                'id': app_id,
+                **self._metadata[row]
+            }
+
+    def _get_by_ids_sync(self, app_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                app_id: {'id': app_id, **self._metadata[self._id_to_row[app_id]]}
+                for app_id in app_ids if app_id in self._id_to_row
+            }
+
+    # Kilit, tam matris taraması boyunca arama thread'lerinde tutulur; event loop'ta alınmaz
+    async def get_by_id(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """ID ile uygulama getir"""
+        return await run_blocking("vectorstore", self._get_by_id_sync, app_id)
+
+    async def get_by_ids(self, app_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Birden fazla ID ile uygulama getir (tek kilit altında)"""
+        return await run_blocking("vectorstore", self._get_by_ids_sync, app_ids)
+
+    def _delete_locked(self, app_id: str) -> bool:
+        """Uygulamayı sil, son satır boşalan yere taşınır (kilit altında çağrılmalıdır)"""
+        row = self._id_to_row.pop(app_id, None)
+        if row is None:
+            return False
+
+        last = self._count - 1
+        if self._ann:
+            self._ann.remove(row)
+        if row != last:
+            moved_id = self._ids[last]
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = moved_id
+            self._metadata[row] = self._metadata[last]
+            self._id_to_row[moved_id] = row
+            if self._compressed:
+                self._codes[row] = self._codes[last]
+            if self._ann:
+                self._ann.move(last, row)
+
+        self._ids.pop()
+        self._metadata.pop()
+        self._count -= 1
+        self._masks_dirty = True
+        self._dirty = True
+        return True
+
+    def _delete_sync(self, app_ids: List[str]) -> int:
+        with self._lock:
+            return sum(1 for app_id in app_ids if self._delete_locked(app_id))
+
+    async def delete_app(self, app_id: str) -> bool:
+        """Uygulamayı sil"""
+        deleted = bool(await run_blocking("vectorstore", self._delete_sync, [app_id]))
+        if deleted:
+            logger.info(f"Uygulama silindi: {app_id}")
+        return deleted
+
+    async def delete_apps(self, app_ids: List[str]) -> int:
+        """Uygulamaları tek kilit altında sil"""
+        deleted = await run_blocking("vectorstore", self._delete_sync, app_ids)
+        logger.info(f"{deleted} uygulama silindi")
+        return deleted
+
+    async def get_index_stats(self) -> Dict[str, Any]:
+        """Index istatistiklerini getir"""
+        return await run_blocking("vectorstore", self._index_stats_sync)
+
+    def _index_stats_sync(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_vector_count": self._count,
+                "dimension": self.dimension,
+                "index_fullness": self._count / max(self._vectors.shape[0], 1),
+                "namespaces": {},
+                "backend": "local",
+                "path": str(self.path),
+                "index_type": self.index_type,
+                "ann_trained": bool(self._ann and self._ann.is_trained),
+                "ann_nlist": len(self._ann.centroids) if self._ann and self._ann.is_trained else 0,
+                "storage": self.storage,
+                "storage_compressed": self._compressed,
+                "rescore_factor": self.rescore_factor if self._compressed else None,
+                "vector_memory_bytes": self._vector_memory_bytes()
+            }
+
+    def _vector_memory_bytes(self) -> int:
+        """Vektörler için ayrılmış (memory-map dışındaki) bellek"""
+        total = 0 if isinstance(self._vectors, np.memmap) else self._vectors.nbytes
+        if self._compressed:
+            total += self._codes.nbytes
+        return total
+
+    async def close(self):
+        """Değişiklikleri diske yaz"""
+        if self._dirty:
+            await run_blocking("vectorstore", self.save)
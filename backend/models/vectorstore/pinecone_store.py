@@ -2,19 +2,32 @@
 AppSense Pinecone Vector Store
 """
 
+import asyncio
+import json
 import logging
+import random
 from typing import List, Dict, Any, Optional
 from pinecone import Pinecone
 from core.config import settings
+from core.executors import run_blocking
+from models.vectorstore.base import VectorStore
 
 logger = logging.getLogger(__name__)
 
-class PineconeStore:
+class PineconeStore(VectorStore):
     """Pinecone vektör veritabanı işlemleri"""
     
+    # fetch ID'leri URL'de taşır; çağrı başına ID sayısı sınırlı tutulur
+    FETCH_MAX_IDS = 200
+    
     def __init__(self):
         self.index = None
         self.pc = None
+        self.upsert_max_bytes = settings.PINECONE_UPSERT_MAX_BYTES
+        self.upsert_max_vectors = settings.PINECONE_UPSERT_MAX_VECTORS
+        self.upsert_concurrency = settings.PINECONE_UPSERT_CONCURRENCY
+        self.upsert_retries = settings.PINECONE_UPSERT_RETRIES
+        self.upsert_backoff = settings.PINECONE_UPSERT_BACKOFF
         self._initialize_pinecone()
     
     def _initialize_pinecone(self):
@@ -33,7 +46,7 @@ class PineconeStore:
                 logger.info(f"Pinecone index oluşturuluyor: {index_name}")
                 self.pc.create_index(
                     name=index_name,
-                    dimension=384,  # sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2
+                    dimension=settings.EMBEDDING_DIMENSION,
                     metric="cosine"
                 )
             
@@ -44,58 +57,110 @@ class PineconeStore:
             logger.error(f"Pinecone başlatma hatası: {str(e)}")
             self.index = None
     
-    async def upsert_apps(self, apps_data: List[Dict[str, Any]]) -> bool:
+    async def upsert_apps(self, apps_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Uygulamaları vektör veritabanına ekle/güncelle
         
+        Vektörler tahmini JSON boyutlarına göre istek limitini aşmayacak
+        batch'lere paketlenir, batch'ler sınırlı eşzamanlılıkla gönderilir ve
+        başarısız olanlar üstel bekleme ile yeniden denenir.
+        
         Args:
             apps_data: Uygulama verileri listesi
             
         Returns:
-            Başarı durumu
+            Batch başına sonuçlar
         """
         if not self.index:
             logger.error("Pinecone index bulunamadı")
-            return False
+            return []
         
-        try:
-            vectors = []
-            for app in apps_data:
-                # Embedding'i hazırla
-                embedding = app.get('embedding')
-                if not embedding:
-                    continue
-                
-                # Metadata'yı hazırla
-                metadata = {
-                    'name': app.get('name', ''),
-                    'description': app.get('description', ''),
-                    'category': app.get('category', ''),
-                    'rating': app.get('rating'),
-                    'review_count': app.get('review_count'),
-                    'download_count': app.get('download_count', ''),
-                    'price': app.get('price', 'Ücretsiz'),
-                    'developer': app.get('developer', ''),
-                    'app_id': app.get('id', '')
-                }
-                
-                vectors.append({
-                    'id': app.get('id'),
-                    'values': embedding,
-                    'metadata': metadata
-                })
+        vectors = []
+        for app in apps_data:
+            # Embedding'i hazırla
+            embedding = app.get('embedding')
+            if embedding is None or len(embedding) == 0:
+                continue
             
-            if vectors:
-                self.index.upsert(vectors=vectors)
-                logger.info(f"{len(vectors)} uygulama vektör veritabanına eklendi")
-                return True
-            else:
-                logger.warning("Eklenecek vektör bulunamadı")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Vektör ekleme hatası: {str(e)}")
-            return False
+            vectors.append({
+                'id': app.get('id'),
+                'values': [float(value) for value in embedding],
+                'metadata': self.build_metadata(app)
+            })
+        
+        if not vectors:
+            logger.warning("Eklenecek vektör bulunamadı")
+            return []
+        
+        batches = self._pack_batches(vectors, self.upsert_max_bytes, self.upsert_max_vectors)
+        semaphore = asyncio.Semaphore(self.upsert_concurrency)
+        
+        async def send(number: int, batch: List[Dict[str, Any]], size: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._upsert_batch(number, batch, size)
+        
+        results = await asyncio.gather(*(
+            send(number, batch, size) for number, (batch, size) in enumerate(batches)
+        ))
+        
+        uploaded = sum(len(result['ids']) for result in results if result['success'])
+        failed = len(results) - sum(1 for result in results if result['success'])
+        if failed:
+            logger.error(f"{failed}/{len(results)} batch yüklenemedi ({uploaded}/{len(vectors)} uygulama eklendi)")
+        else:
+            logger.info(f"{uploaded} uygulama {len(results)} batch ile vektör veritabanına eklendi")
+        return list(results)
+    
+    @staticmethod
+    def _estimate_size(vector: Dict[str, Any]) -> int:
+        """Vektörün istek gövdesindeki JSON boyutu (bayt)"""
+        return len(json.dumps(vector, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+    
+    @classmethod
+    def _pack_batches(cls, vectors: List[Dict[str, Any]], max_bytes: int, max_vectors: int):
+        """
+        Vektörleri boyut ve adet limitine göre sırayla batch'lere paketle
+        
+        Returns:
+            (batch, tahmini boyut) listesi
+        """
+        # {"vectors":[...]} zarfı
+        envelope = len('{"vectors":[]}')
+        batches = []
+        current: List[Dict[str, Any]] = []
+        current_size = envelope
+        for vector in vectors:
+            size = cls._estimate_size(vector) + 1  # ayırıcı virgül
+            if current and (current_size + size > max_bytes or len(current) >= max_vectors):
+                batches.append((current, current_size))
+                current, current_size = [], envelope
+            if envelope + size > max_bytes:
+                logger.warning(f"Vektör tek başına istek limitini aşıyor: {vector['id']} ({size} bayt)")
+            current.append(vector)
+            current_size += size
+        if current:
+            batches.append((current, current_size))
+        return batches
+    
+    async def _upsert_batch(self, number: int, batch: List[Dict[str, Any]], size: int) -> Dict[str, Any]:
+        """Tek batch'i gönder, geçici hatalarda üstel bekleme ile yeniden dene"""
+        ids = [vector['id'] for vector in batch]
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                await run_blocking("vectorstore", self.index.upsert, vectors=batch)
+                return self.batch_result(number, ids, True, size_bytes=size, attempts=attempts)
+            except Exception as e:
+                status = getattr(e, 'status', None)
+                # 4xx (429 hariç) tekrar denemekle düzelmez
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempts > self.upsert_retries:
+                    logger.error(f"Batch {number} yüklenemedi ({attempts} deneme): {str(e)}")
+                    return self.batch_result(number, ids, False, size_bytes=size, attempts=attempts, error=str(e))
+                delay = self.upsert_backoff * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+                logger.warning(f"Batch {number} hatası, {delay:.2f} sn sonra tekrar denenecek: {str(e)}")
+                await asyncio.sleep(delay)
     
     async def search(
         self, 
@@ -125,10 +190,13 @@ class PineconeStore:
                 filter_dict['category'] = filter_category
             
             # Arama yap
-            search_results = self.index.query(
+            search_results = await run_blocking(
+                "vectorstore",
+                self.index.query,
                 vector=query_embedding,
                 top_k=top_k,
-                include_metadata=True,
+                # Doküman deposu açıksa sonuçlar oradan doldurulur; metadata transferi gereksiz
+                include_metadata=not settings.DOCUMENT_STORE_ENABLED,
                 filter=filter_dict if filter_dict else None
             )
             
@@ -138,7 +206,7 @@ class PineconeStore:
                 result = {
                     'id': match.id,
                     'score': match.score,
-                    **match.metadata
+                    **(match.metadata or {})
                 }
                 formatted_results.append(result)
             
@@ -155,12 +223,12 @@ class PineconeStore:
             return None
         
         try:
-            fetch_results = self.index.fetch(ids=[app_id])
+            fetch_results = await run_blocking("vectorstore", self.index.fetch, ids=[app_id])
             if app_id in fetch_results.vectors:
                 vector = fetch_results.vectors[app_id]
                 return {
                     'id': vector.id,
-                    **vector.metadata
+                    **(vector.metadata or {})
                 }
             return None
             
@@ -168,13 +236,32 @@ class PineconeStore:
             logger.error(f"ID ile getirme hatası: {str(e)}")
             return None
     
+    def _get_by_ids_sync(self, app_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        apps = {}
+        for start in range(0, len(app_ids), self.FETCH_MAX_IDS):
+            fetch_results = self.index.fetch(ids=app_ids[start:start + self.FETCH_MAX_IDS])
+            for vector in fetch_results.vectors.values():
+                apps[vector.id] = {'id': vector.id, **(vector.metadata or {})}
+        return apps
+    
+    async def get_by_ids(self, app_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Birden fazla ID ile uygulama getir (FETCH_MAX_IDS'lik fetch çağrıları)"""
+        if not self.index or not app_ids:
+            return {}
+        
+        try:
+            return await run_blocking("vectorstore", self._get_by_ids_sync, app_ids)
+        except Exception as e:
+            logger.error(f"Toplu ID ile getirme hatası: {str(e)}")
+            return {}
+    
     async def delete_app(self, app_id: str) -> bool:
         """Uygulamayı sil"""
         if not self.index:
             return False
         
         try:
-            self.index.delete(ids=[app_id])
+            await run_blocking("vectorstore", self.index.delete, ids=[app_id])
             logger.info(f"Uygulama silindi: {app_id}")
             return True
             
@@ -182,13 +269,30 @@ class PineconeStore:
             logger.error(f"Silme hatası: {str(e)}")
             return False
     
+    async def delete_apps(self, app_ids: List[str]) -> int:
+        """Uygulamaları istek başına en fazla 1000 ID ile toplu sil"""
+        if not self.index:
+            return 0
+        
+        deleted = 0
+        for i in range(0, len(app_ids), 1000):
+            batch = app_ids[i:i + 1000]
+            try:
+                await run_blocking("vectorstore", self.index.delete, ids=batch)
+                deleted += len(batch)
+            except Exception as e:
+                logger.error(f"Toplu silme hatası: {str(e)}")
+        
+        logger.info(f"{deleted} uygulama silindi")
+        return deleted
+    
     async def get_index_stats(self) -> Dict[str, Any]:
         """Index istatistiklerini getir"""
         if not self.index:
             return {"error": "Index bulunamadı"}
         
         try:
-            stats = self.index.describe_index_stats()
+            stats = await run_blocking("vectorstore", self.index.describe_index_stats)
             return {
                 "total_vector_count": stats.total_vector_count,
                 "dimension": stats.dimension,
@@ -0,0 +1,261 @@
+"""
+AppSense Vektör Sıkıştırma (Quantization) Codec'leri
+Yerel vector store'un bellekte tuttuğu sıkıştırılmış kodlar
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class VectorCodec(ABC):
+    """
+    Normalize edilmiş vektörleri sıkıştırılmış kodlara çeviren codec arayüzü
+
+    Kodlar üzerinden hesaplanan skorlar iç çarpımın yaklaşığıdır; store en iyi
+    adayları tam hassasiyetli vektörlerle yeniden skorlar. Alt sınıflar en az
+    encode'u, kodları float32'ye açmıyorsa scores'u da uygular.
+    """
+
+    # Alt sınıflar tanımlar (float32 saklamada codec kullanılmaz)
+    name: str
+    code_dtype: type
+    # Kod taramasında tek seferde float32'ye açılan satır sayısı (blok önbellekte kalacak kadar küçük)
+    SCORE_BLOCK_ROWS = 2048
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    @property
+    def code_size(self) -> int:
+        """Vektör başına kod eleman sayısı"""
+        return self.dimension
+
+    @property
+    def is_trained(self) -> bool:
+        return True
+
+    def can_train(self, count: int) -> bool:
+        """Eğitim için yeterli vektör var mı"""
+        return True
+
+    def train(self, vectors: np.ndarray):
+        """Codec parametrelerini öğren"""
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Vektörleri kodlara çevir
+
+        Args:
+            vectors: (N, dimension) normalize edilmiş float32 vektörler
+
+        Returns:
+            (N, code_size) code_dtype tipinde kodlar
+        """
+
+    def _decode_block(self, codes: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32)
+
+    def query_vector(self, query: np.ndarray) -> np.ndarray:
+        """Kodlarla çarpılacak sorgu vektörü"""
+        return query
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Kodlar için yaklaşık iç çarpım skorları
+
+        Kodlar bellek için bloklar halinde float32'ye açılıp çarpılır.
+        """
+        query = self.query_vector(query)
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), self.SCORE_BLOCK_ROWS):
+            block = codes[start:start + self.SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = self._decode_block(block) @ query
+        return scores
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Diske yazılacak codec parametreleri"""
+        return {}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> bool:
+        """
+        Kayıtlı codec parametrelerini yükle
+
+        Returns:
+            Parametreler uyumluysa True
+        """
+        return True
+
+class Float16Codec(VectorCodec):
+    """Vektörleri float16 olarak saklar (2x küçük)"""
+
+    name = "float16"
+    code_dtype = np.float16
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.astype(np.float16)
+
+class Int8Codec(VectorCodec):
+    """
+    Boyut başına simetrik ölçekli skaler int8 quantization (4x küçük)
+
+    Ölçek her boyutun eğitim verisindeki en büyük mutlak değeridir; sorgu
+    vektörü ölçekle çarpılarak kodlar açılmadan skorlanır.
+    """
+
+    name = "int8"
+    code_dtype = np.int8
+    MIN_TRAIN_VECTORS = 1000
+
+    def __init__(self, dimension: int):
+        super().__init__(dimension)
+        self.scale = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.scale is not None
+
+    def can_train(self, count: int) -> bool:
+        return count >= self.MIN_TRAIN_VECTORS
+
+    def train(self, vectors: np.ndarray):
+        scale = np.abs(vectors).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        self.scale = scale.astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        # Eğitimden sonra eklenen vektörlerin aralık dışı değerleri kırpılır
+        return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+
+    def query_vector(self, query: np.ndarray) -> np.ndarray:
+        return query * self.scale
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'scale': self.scale}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> bool:
+        if 'scale' not in state or state['scale'].shape != (self.dimension,):
+            return False
+        self.scale = state['scale'].astype(np.float32)
+        return True
+
+class ProductQuantizer(VectorCodec):
+    """
+    Product quantization (vektör başına `subvectors` bayt)
+
+    Vektör `subvectors` alt vektöre bölünür, her alt uzay için 256 merkezli
+    k-means kod kitabı öğrenilir. Sorguda alt uzay başına sorgu x merkez iç
+    çarpım tablosu bir kez hesaplanır, skorlar tablo okumalarının toplamıdır
+    (asimetrik mesafe hesabı).
+    """
+
+    name = "pq"
+    code_dtype = np.uint8
+    CENTROIDS = 256
+    TRAIN_SAMPLES = 32768
+    MIN_TRAIN_VECTORS = CENTROIDS * 16
+    ENCODE_CHUNK_SIZE = 65536
+
+    def __init__(self, dimension: int, subvectors: int = 48, train_iterations: int = 15, seed: int = 0):
+        """
+        Args:
+            dimension: Vektör boyutu
+            subvectors: Alt vektör sayısı (boyutu tam bölmelidir)
+            train_iterations: k-means iterasyon sayısı
+            seed: Rastgelelik tohumu
+        """
+        super().__init__(dimension)
+        if dimension % subvectors != 0:
+            raise ValueError(f"Boyut ({dimension}) alt vektör sayısına ({subvectors}) tam bölünmeli")
+        self.subvectors = subvectors
+        self.sub_dimension = dimension // subvectors
+        self.train_iterations = train_iterations
+        self.seed = seed
+        self.codebooks = None  # (subvectors, 256, sub_dimension)
+        self._offsets = np.arange(subvectors, dtype=np.intp) * self.CENTROIDS
+
+    @property
+    def code_size(self) -> int:
+        return self.subvectors
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def can_train(self, count: int) -> bool:
+        return count >= self.MIN_TRAIN_VECTORS
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, D) -> (subvectors, N, sub_dimension)"""
+        return vectors.reshape(len(vectors), self.subvectors, self.sub_dimension).transpose(1, 0, 2)
+
+    @staticmethod
+    def _nearest(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Öklid uzaklığına göre en yakın merkez: argmax(x·c - |c|²/2)"""
+        return np.argmax(points @ centroids.T - 0.5 * (centroids ** 2).sum(axis=1), axis=1)
+
+    def train(self, vectors: np.ndarray):
+        rng = np.random.default_rng(self.seed)
+        count = len(vectors)
+        sample_size = min(count, self.TRAIN_SAMPLES)
+        sample = self._split(np.asarray(vectors[np.sort(rng.choice(count, sample_size, replace=False))], dtype=np.float32))
+
+        codebooks = np.empty((self.subvectors, self.CENTROIDS, self.sub_dimension), dtype=np.float32)
+        for m in range(self.subvectors):
+            points = sample[m]
+            centroids = points[rng.choice(sample_size, self.CENTROIDS, replace=False)].copy()
+            for _ in range(self.train_iterations):
+                labels = self._nearest(points, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, points)
+                sizes = np.bincount(labels, minlength=self.CENTROIDS)
+
+                # Boş kalan merkezleri rastgele örneklerle yeniden başlat
+                empty = sizes == 0
+                centroids[~empty] = sums[~empty] / sizes[~empty, None]
+                if empty.any():
+                    centroids[empty] = points[rng.choice(sample_size, int(empty.sum()), replace=False)]
+            codebooks[m] = centroids
+
+        self.codebooks = codebooks
+        logger.info(f"PQ kod kitabı eğitildi: {sample_size} örnek, {self.subvectors}x{self.CENTROIDS} merkez")
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.empty((len(vectors), self.subvectors), dtype=np.uint8)
+        for start in range(0, len(vectors), self.ENCODE_CHUNK_SIZE):
+            chunk = self._split(np.asarray(vectors[start:start + self.ENCODE_CHUNK_SIZE], dtype=np.float32))
+            for m in range(self.subvectors):
+                codes[start:start + chunk.shape[1], m] = self._nearest(chunk[m], self.codebooks[m])
+        return codes
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        # (subvectors, 256) iç çarpım tablosu, düzleştirilip kod + ofset ile okunur
+        table = np.einsum('mkd,md->mk', self.codebooks, query.reshape(self.subvectors, self.sub_dimension)).ravel()
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), self.SCORE_BLOCK_ROWS):
+            block = codes[start:start + self.SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = table[block + self._offsets].sum(axis=1)
+        return scores
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'codebooks': self.codebooks}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> bool:
+        expected = (self.subvectors, self.CENTROIDS, self.sub_dimension)
+        if 'codebooks' not in state or state['codebooks'].shape != expected:
+            return False
+        self.codebooks = state['codebooks'].astype(np.float32)
+        return True
+
+def create_codec(storage: str, dimension: int, pq_subvectors: int = 48) -> VectorCodec:
+    """Saklama tipine göre codec oluştur"""
+    if storage == "float16":
+        return Float16Codec(dimension)
+    if storage == "int8":
+        return Int8Codec(dimension)
+    if storage == "pq":
+        return ProductQuantizer(dimension, subvectors=pq_subvectors)
+    raise ValueError(f"Bilinmeyen vektör saklama tipi: {storage}")
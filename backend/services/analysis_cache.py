@@ -0,0 +1,144 @@
+"""
+AppSense Semantik LLM Analiz Önbelleği
+"""
+
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class _CacheEntry:
+    __slots__ = ("partition", "embedding", "analysis", "tokens", "latency", "expires_at")
+
+    def __init__(self, partition, embedding, analysis, tokens, latency, expires_at):
+        self.partition = partition
+        self.embedding = embedding
+        self.analysis = analysis
+        self.tokens = tokens
+        self.latency = latency
+        self.expires_at = expires_at
+
+class SemanticAnalysisCache:
+    """
+    Benzer sorgular için LLM analizlerini yeniden kullanan önbellek
+
+    Kayıtlar (dil, sonuç kümesi parmak izi) ile bölümlenir. Aynı bölümde sorgu
+    embedding'i kosinüs mesafesi `max_distance` içinde olan bir kayıt varsa
+    analiz yeniden kullanılır. Boyut sınırı LRU ile, ömür TTL ile uygulanır.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_distance: Optional[float] = None
+    ):
+        self.max_size = max_size or settings.ANALYSIS_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.ANALYSIS_CACHE_TTL
+        self.max_distance = max_distance if max_distance is not None else settings.ANALYSIS_CACHE_MAX_DISTANCE
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._partitions: Dict[Tuple[str, str], List[int]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.saved_latency = 0.0
+
+    @staticmethod
+    def fingerprint(result_ids: List[str]) -> str:
+        """LLM'e gönderilen sonuç ID'lerinin (sıralı) parmak izi"""
+        return hashlib.sha1("\x1f".join(result_ids).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove(self, entry_id: int):
+        """Kaydı ve bölüm referansını sil (kilit altında)"""
+        entry = self._entries.pop(entry_id)
+        members = self._partitions.get(entry.partition)
+        if members:
+            members.remove(entry_id)
+            if not members:
+                del self._partitions[entry.partition]
+
+    def get(self, language: str, fingerprint: str, embedding) -> Optional[str]:
+        """
+        Yeterince benzer bir sorgunun analizini getir
+
+        Args:
+            language: Algılanan dil
+            fingerprint: Sonuç kümesi parmak izi
+            embedding: Sorgu embedding'i
+
+        Returns:
+            Önbellekteki analiz veya None
+        """
+        query = self._normalize(embedding)
+        now = time.monotonic()
+        with self._lock:
+            members = list(self._partitions.get((language, fingerprint), []))
+            live = []
+            for entry_id in members:
+                entry = self._entries[entry_id]
+                if entry.expires_at is not None and entry.expires_at <= now:
+                    self._remove(entry_id)
+                else:
+                    live.append(entry_id)
+
+            if live:
+                similarities = np.stack([self._entries[i].embedding for i in live]) @ query
+                best = int(np.argmax(similarities))
+                if 1.0 - float(similarities[best]) <= self.max_distance:
+                    entry = self._entries[live[best]]
+                    self._entries.move_to_end(live[best])
+                    self.hits += 1
+                    self.saved_tokens += entry.tokens
+                    self.saved_latency += entry.latency
+                    return entry.analysis
+
+            self.misses += 1
+            return None
+
+    def set(self, language: str, fingerprint: str, embedding, analysis: str, tokens: int = 0, latency: float = 0.0):
+        """
+        Analizi önbelleğe ekle
+
+        Args:
+            tokens: Analiz için harcanan token sayısı (tasarruf metriği için)
+            latency: Analizin üretim süresi saniye (tasarruf metriği için)
+        """
+        partition = (language, fingerprint)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        entry = _CacheEntry(partition, self._normalize(embedding), analysis, tokens, latency, expires_at)
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = entry
+            self._partitions.setdefault(partition, []).append(entry_id)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet oranı ve tasarruf metrikleri"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "partitions": len(self._partitions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_tokens": self.saved_tokens,
+            "saved_latency_seconds": self.saved_latency
+        }
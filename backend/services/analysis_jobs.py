@@ -0,0 +1,176 @@
+"""
+AppSense Arka Plan LLM Analiz İşleri
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from core.config import settings
+from core.request_context import RequestContext
+from services.llm_service import LLMService
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class AnalysisJob:
+    """Tek bir arka plan analiz işi"""
+
+    def __init__(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        detected_language: str,
+        context: Optional[RequestContext] = None
+    ):
+        self.analysis_id = uuid.uuid4().hex
+        self.query = query
+        self.search_results = search_results
+        self.detected_language = detected_language
+        self.context = context
+        self.status = "pending"
+        self.llm_analysis: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.completed_at: Optional[float] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analysis_id": self.analysis_id,
+            "status": self.status,
+            "llm_analysis": self.llm_analysis,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at
+        }
+
+class AnalysisJobManager:
+    """
+    LLM analizlerini sınırlı eşzamanlılıkla arka planda çalıştırır
+
+    Biten analizler süreli (TTL) ve boyut sınırlı bir bellek içi depoda tutulur.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        max_concurrency: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        result_ttl: Optional[float] = None,
+        max_stored: Optional[int] = None
+    ):
+        self.llm_service = llm_service
+        self.max_concurrency = max_concurrency or settings.ANALYSIS_MAX_CONCURRENCY
+        self.max_pending = max_pending or settings.ANALYSIS_QUEUE_SIZE
+        self._jobs = LRUCache(
+            max_size=max_stored or settings.ANALYSIS_MAX_STORED,
+            ttl=result_ttl or settings.ANALYSIS_RESULT_TTL
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def start(self):
+        """Worker'ları başlat"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+        logger.info(f"Analiz iş kuyruğu başlatıldı ({self.max_concurrency} worker)")
+
+    async def stop(self):
+        """Worker'ları durdur"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        detected_language: str,
+        context: Optional[RequestContext] = None
+    ) -> Optional[str]:
+        """
+        Analizi kuyruğa ekle
+
+        Returns:
+            analysis_id veya kuyruk doluysa None
+        """
+        job = AnalysisJob(query, search_results, detected_language, context)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning("Analiz kuyruğu dolu, analiz atlanıyor")
+            return None
+
+        self._jobs.set(job.analysis_id, job)
+        self.submitted += 1
+        return job.analysis_id
+
+    async def get(self, analysis_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Analiz durumunu getir
+
+        Args:
+            analysis_id: Analiz ID'si
+            wait: İş bitmediyse en fazla bu kadar saniye bekle (long-poll)
+
+        Returns:
+            İş bilgisi veya bulunamazsa/süresi dolduysa None
+        """
+        job: Optional[AnalysisJob] = self._jobs.get(analysis_id)
+        if job is None:
+            return None
+
+        if wait > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+        return job.to_dict()
+
+    async def _worker(self):
+        """Kuyruktan iş alıp analizi çalıştır"""
+        while True:
+            job: AnalysisJob = await self._queue.get()
+            job.status = "running"
+            try:
+                job.llm_analysis = await self.llm_service.analyze_search_results(
+                    query=job.query,
+                    search_results=job.search_results,
+                    detected_language=job.detected_language,
+                    context=job.context
+                )
+                job.status = "completed"
+                self.completed += 1
+            except Exception as e:
+                logger.error(f"Arka plan analiz hatası: {str(e)}")
+                job.status = "failed"
+                job.error = str(e)
+                self.failed += 1
+            finally:
+                job.completed_at = time.time()
+                # Sonuç tutulurken arama sonuçlarına gerek yok
+                job.search_results = []
+                job.context = None
+                job.done.set()
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Kuyruk istatistikleri"""
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "stored": len(self._jobs)
+        }
@@ -3,9 +3,13 @@ AppSense LLM Service
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 import groq
+import httpx
+import time
 from core.config import settings
+from core.request_context import RequestContext
+from services.analysis_cache import SemanticAnalysisCache
 from utils.language_detector import LanguageDetector
 import json
 
@@ -14,9 +18,10 @@ logger = logging.getLogger(__name__)
 class LLMService:
     """LLM servisi - Groq entegrasyonu"""
 
-    def __init__(self):
+    def __init__(self, language_detector: Optional[LanguageDetector] = None):
         self.client = None
-        self.language_detector = LanguageDetector()
+        self.language_detector = language_detector or LanguageDetector()
+        self.analysis_cache = SemanticAnalysisCache() if settings.ANALYSIS_CACHE_ENABLED else None
         self._initialize_groq()
 
     def _initialize_groq(self):
@@ -25,54 +30,102 @@ class LLMService:
             if not settings.GROQ_API_KEY:
                 logger.warning("Groq API key bulunamadı")
                 return
-            self.client = groq.Groq(api_key=settings.GROQ_API_KEY)
+            # Async client: LLM çağrıları event loop'u bloklamaz
+            self.client = groq.AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                timeout=settings.LLM_TIMEOUT,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.LLM_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+                    ),
+                    timeout=settings.LLM_TIMEOUT
+                )
+            )
             logger.info("Groq client başarıyla başlatıldı")
         except Exception as e:
             logger.error(f"Groq başlatma hatası: {str(e)}")
             self.client = None
 
-    async def analyze_search_results(
+    async def close(self):
+        """Groq client bağlantılarını kapat"""
+        if self.client:
+            try:
+                await self.client.close()
+            except Exception as e:
+                logger.error(f"Groq kapatma hatası: {str(e)}")
+            self.client = None
+
+    @staticmethod
+    def _filter_results(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """4.0 altı veya 0 puanlı uygulamaları filtrele, LLM'e gidecek ilk 10'u döndür"""
+        return [
+            r for r in search_results
+            if (r.get('rating') or 0) >= 4.0
+        ][:10]
+
+    def _cache_key(
         self,
-        query: str,
         search_results: List[Dict[str, Any]],
-        detected_language: str = "tr"
-    ) -> str:
+        detected_language: str,
+        context: Optional[RequestContext]
+    ) -> Optional[Tuple[str, str, List[float]]]:
         """
-        Arama sonuçlarını LLM ile analiz edip geliştirilmiş öneri döndürür.
-        0 puanlı veya 4.0 altındaki uygulamalar filtrelenir.
+        Semantik önbellek anahtarı: (dil, sonuç parmak izi, sorgu embedding'i)
+
+        Ad eşleşmesi yolu embedding hesaplamaz; bu sorgular aynı sonuç kümesiyle
+        birebir eşleşir ("exact:" bölümü, sabit embedding). Bölüm ayrı olduğu
+        için semantik kayıtlarla karşılaştırılmazlar.
         """
-        if not self.client:
-            logger.warning("Groq client bulunamadı, analiz yapılamıyor")
-            return "LLM analizi mevcut değil."
+        if not self.analysis_cache or context is None:
+            return None
+        result_ids = [str(r.get('id')) for r in self._filter_results(search_results)]
+        if not result_ids:
+            return None
+        fingerprint = SemanticAnalysisCache.fingerprint(result_ids)
+        if context.query_embedding is None:
+            return detected_language, f"exact:{fingerprint}", [1.0]
+        return detected_language, fingerprint, context.query_embedding
+
+    def _build_analysis_messages(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        detected_language: str,
+        context: Optional[RequestContext] = None
+    ) -> Tuple[Optional[List[Dict[str, str]]], Optional[str]]:
+        """
+        Analiz için LLM mesajlarını hazırla
 
-        try:
-            # Dil algılama
-            if not detected_language or detected_language == "auto":
+        Returns:
+            (mesajlar, None) veya LLM çağrısı gerekmiyorsa (None, sabit yanıt)
+        """
+        # Dil algılama (istek bağlamında varsa tekrarlanmaz)
+        if not detected_language or detected_language == "auto":
+            if context is not None and context.language:
+                detected_language = context.language
+            else:
                 detected_language = self.language_detector.detect_language(query)
 
-            # 4.0 altı veya 0 puanlı uygulamaları filtrele
-            filtered_results = [
-                r for r in search_results
-                if (r.get('rating') or 0) >= 4.0
-            ]
-
-            if not filtered_results:
-                return "Uygun kriterlerde (puanı 4.0 ve üzeri) uygulama bulunamadı."
-
-            # Arama sonuçlarını formatla
-            formatted_results = []
-            for i, result in enumerate(filtered_results[:10], 1):
-                rating = result.get('rating', 0)
-                download_count = result.get('download_count', 'Bilinmeyen')
-                formatted_results.append(
-                    f"{i}. {result.get('name', 'Bilinmeyen')} "
-                    f"({result.get('category', 'Bilinmeyen')}) - "
-                    f"Puan: {rating:.1f} - İndirme: {download_count}"
-                )
+        filtered_results = self._filter_results(search_results)
+
+        if not filtered_results:
+            return None, "Uygun kriterlerde (puanı 4.0 ve üzeri) uygulama bulunamadı."
+
+        # Arama sonuçlarını formatla
+        formatted_results = []
+        for i, result in enumerate(filtered_results, 1):
+            rating = result.get('rating', 0)
+            download_count = result.get('download_count', 'Bilinmeyen')
+            formatted_results.append(
+                f"{i}. {result.get('name', 'Bilinmeyen')} "
+                f"({result.get('category', 'Bilinmeyen')}) - "
+                f"Puan: {rating:.1f} - İndirme: {download_count}"
+            )
 
-            # Kullanıcı prompt'u
-            if detected_language == "tr":
-                prompt = f"""
+        # Kullanıcı prompt'u
+        if detected_language == "tr":
+            prompt = f"""
 Kullanıcı sorgusu: "{query}"
 
 Bulunan uygulamalar (puanı 4.0 ve üzeri):
@@ -96,8 +149,8 @@ Görevin:
 8. Yanıtı Türkçe yaz, düzenli paragraflar ve madde işaretleri kullan.
 9. Yanıtı tam olarak bitir, asla yarım bırakma.
 """
-            else:
-                prompt = f"""
+        else:
+            prompt = f"""
 User query: "{query}"
 
 Found applications (rating 4.0 and above):
@@ -122,13 +175,10 @@ Your task:
 9. Fully complete your answer, never leave it unfinished.
 """
 
-            # LLM çağrısı
-            response = self.client.chat.completions.create(
-                model=settings.LLM_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """
+        messages = [
+            {
+                "role": "system",
+                "content": """
 Sen AppSense uygulama mağazası asistanısın.
 Görevin: Kullanıcının ihtiyacını doğru anlayarak ona en uygun uygulamaları profesyonel, empatik ve düzenli formatta sunmak.
 
@@ -139,21 +189,131 @@ Kurallar:
 4. Gereksiz tekrar ve uzun cümlelerden kaçın.
 5. Yanıtı tam olarak bitir, asla yarım bırakma.
 """
-                    },
-                    {"role": "user", "content": prompt}
-                ],
+            },
+            {"role": "user", "content": prompt}
+        ]
+        return messages, None
+
+    async def analyze_search_results(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        detected_language: str = "tr",
+        context: Optional[RequestContext] = None
+    ) -> str:
+        """
+        Arama sonuçlarını LLM ile analiz edip geliştirilmiş öneri döndürür.
+        0 puanlı veya 4.0 altındaki uygulamalar filtrelenir.
+        Benzer bir sorgunun aynı sonuçlar için analizi önbellekteyse o kullanılır.
+        """
+        if not self.client:
+            logger.warning("Groq client bulunamadı, analiz yapılamıyor")
+            return "LLM analizi mevcut değil."
+
+        try:
+            cache_key = self._cache_key(search_results, detected_language, context)
+            if cache_key:
+                cached = self.analysis_cache.get(*cache_key)
+                if cached is not None:
+                    logger.info("LLM analizi semantik önbellekten döndürüldü")
+                    return cached
+
+            messages, fallback = self._build_analysis_messages(query, search_results, detected_language, context)
+            if fallback:
+                return fallback
+
+            # LLM çağrısı
+            started = time.perf_counter()
+            response = await self.client.chat.completions.create(
+                model=settings.LLM_MODEL,
+                messages=messages,
                 max_tokens=1000,
                 temperature=0.7
             )
 
             enhanced_response = response.choices[0].message.content
             logger.info(f"LLM analizi: {enhanced_response}")
+
+            if cache_key and enhanced_response:
+                usage = getattr(response, 'usage', None)
+                self.analysis_cache.set(
+                    *cache_key,
+                    analysis=enhanced_response,
+                    tokens=getattr(usage, 'total_tokens', 0) or 0,
+                    latency=time.perf_counter() - started
+                )
             return enhanced_response
 
         except Exception as e:
             logger.error(f"LLM yanıt oluşturma hatası: {str(e)}")
             return "LLM analizi sırasında hata oluştu."
 
+    async def stream_analysis(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        detected_language: str = "tr",
+        context: Optional[RequestContext] = None
+    ) -> AsyncIterator[str]:
+        """
+        Arama sonuçlarının LLM analizini üretildikçe parça parça döndürür.
+
+        Tüketici akışı erken kapatırsa (ör. istemci bağlantısı koptuğunda)
+        Groq'a açılan akış da kapatılır ve üretim durdurulur. Groq hataları
+        token olarak dönmez, yükseltilir; route bunları "error" olayına çevirir.
+        """
+        if not self.client:
+            logger.warning("Groq client bulunamadı, analiz yapılamıyor")
+            yield "LLM analizi mevcut değil."
+            return
+
+        stream = None
+        try:
+            cache_key = self._cache_key(search_results, detected_language, context)
+            if cache_key:
+                cached = self.analysis_cache.get(*cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+
+            messages, fallback = self._build_analysis_messages(query, search_results, detected_language, context)
+            if fallback:
+                yield fallback
+                return
+
+            started = time.perf_counter()
+            chunks = []
+            stream = await self.client.chat.completions.create(
+                model=settings.LLM_MODEL,
+                messages=messages,
+                max_tokens=1000,
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+
+            # Yalnızca tamamlanmış akışları önbelleğe al (parça sayısı ~ üretilen token)
+            if cache_key and chunks:
+                self.analysis_cache.set(
+                    *cache_key,
+                    analysis="".join(chunks),
+                    tokens=len(chunks),
+                    latency=time.perf_counter() - started
+                )
+
+        except Exception as e:
+            logger.error(f"LLM akış hatası: {str(e)}")
+            raise
+
+        finally:
+            # Upstream üretimi iptal et (istemci koptuysa bağlantıyı kapat)
+            if stream is not None:
+                await stream.response.aclose()
+
     def _format_simple_response(self, search_results: List[Dict[str, Any]]) -> str:
         """Basit yanıt formatla"""
         if not search_results:
@@ -190,7 +350,7 @@ Kurallar:
 5. Teknik terimlerden kaçın.
 6. Yanıtı tam olarak bitir.
 """
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=settings.LLM_MODEL,
                 messages=[
                     {
@@ -227,7 +387,7 @@ Kurallar:
 {{"suggestions": ["öneri1", "öneri2", "öneri3"]}}
 5. Yanıtı tam olarak bitir.
 """
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=settings.LLM_MODEL,
                 messages=[
                     {
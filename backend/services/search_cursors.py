@@ -0,0 +1,138 @@
+"""
+AppSense Arama Sayfalama (Cursor) Önbelleği
+"""
+
+import base64
+import binascii
+import logging
+import uuid
+from array import array
+from math import isnan, nan
+from typing import Any, Dict, List, Optional, Tuple
+from core.config import settings
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class SearchCursor:
+    """İlk sayfada bulunan sıralı aday listesi (yalnızca ID ve skorlar)"""
+
+    __slots__ = ("query", "language", "ids", "scores", "lexical_scores")
+
+    def __init__(self, query: str, language: str, ranking: List[Tuple[str, float, Optional[float]]]):
+        self.query = query
+        self.language = language
+        self.ids = tuple(app_id for app_id, _, _ in ranking)
+        self.scores = array('d', (score for _, score, _ in ranking))
+        # Lexical skoru olmayan adaylar NaN olarak saklanır
+        self.lexical_scores = array('d', (nan if lexical is None else lexical for _, _, lexical in ranking))
+
+    def entries(self, start: int, end: int) -> List[Tuple[str, float, Optional[float]]]:
+        """[start, end) aralığındaki (ID, vektör skoru, lexical skor) kayıtları"""
+        return [
+            (app_id, score, None if isnan(lexical) else lexical)
+            for app_id, score, lexical in zip(
+                self.ids[start:end], self.scores[start:end], self.lexical_scores[start:end]
+            )
+        ]
+
+class SearchCursorCache:
+    """
+    Sonraki sayfaları embedding ve vektör araması yapmadan sunmak için cursor önbelleği
+
+    İlk sayfada sayfa boyutunun SEARCH_CURSOR_PAGES katı kadar (en fazla
+    SEARCH_CURSOR_MAX_RESULTS) aday sıralanır; ID'leri ve skorları
+    opak bir cursor altında TTL ile saklanır. Sonraki sayfaların uygulamaları
+    ID ile (doküman deposundan) okunur. Cursor başına en fazla max_results ID,
+    toplamda en fazla max_cursors cursor tutulur (en eski kullanılan düşer).
+    """
+
+    def __init__(
+        self,
+        max_cursors: Optional[int] = None,
+        max_results: Optional[int] = None,
+        ttl: Optional[float] = None,
+        pages: Optional[int] = None
+    ):
+        self.max_results = settings.SEARCH_CURSOR_MAX_RESULTS if max_results is None else max_results
+        self.pages = settings.SEARCH_CURSOR_PAGES if pages is None else pages
+        self._cursors = LRUCache(
+            max_size=max_cursors or settings.SEARCH_CURSOR_CACHE_SIZE,
+            ttl=ttl if ttl is not None else settings.SEARCH_CURSOR_TTL
+        )
+
+    @staticmethod
+    def _encode(key: str, offset: int) -> str:
+        return base64.urlsafe_b64encode(f"{key}:{offset}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(cursor: str) -> Tuple[str, int]:
+        try:
+            key, offset = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+            return key, int(offset)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Geçersiz cursor") from None
+
+    def window(self, page_size: int) -> int:
+        """
+        İlk sayfada sıralanacak aday sayısı
+
+        Her ilk sayfa bu kadar aday sıralayıp vektör deposundan ister; bu yüzden
+        cursor'ın kapsadığı sayfa sayısı ile sınırlanır.
+        """
+        return min(self.max_results, page_size * max(self.pages, 1))
+
+    def create(
+        self,
+        query: str,
+        language: str,
+        ranking: List[Tuple[str, float, Optional[float]]],
+        page_size: int
+    ) -> Optional[str]:
+        """
+        İlk sayfanın sıralamasını sakla
+
+        Args:
+            ranking: (uygulama ID'si, vektör skoru, lexical skor) sıralı aday listesi
+            page_size: İlk sayfada dönen sonuç sayısı
+
+        Returns:
+            İkinci sayfanın cursor'ı (başka aday yoksa None)
+        """
+        ranking = ranking[:self.max_results]
+        if len(ranking) <= page_size:
+            return None
+        key = uuid.uuid4().hex
+        self._cursors.set(key, SearchCursor(query, language, ranking))
+        return self._encode(key, page_size)
+
+    def page(
+        self,
+        cursor: str,
+        page_size: int
+    ) -> Tuple[SearchCursor, List[Tuple[str, float, Optional[float]]], Optional[str]]:
+        """
+        Cursor'ın gösterdiği sayfa
+
+        Returns:
+            (cursor kaydı, sayfadaki (ID, vektör skoru, lexical skor) listesi,
+            sonraki sayfanın cursor'ı)
+
+        Raises:
+            ValueError: Cursor geçersiz
+            KeyError: Cursor'ın süresi dolmuş veya önbellekten düşmüş
+        """
+        key, offset = self._decode(cursor)
+        entry: Optional[SearchCursor] = self._cursors.get(key)
+        if entry is None:
+            raise KeyError(key)
+        if offset < 0 or page_size <= 0:
+            raise ValueError("Geçersiz cursor")
+
+        end = offset + page_size
+        page = entry.entries(offset, end)
+        next_cursor = self._encode(key, end) if end < len(entry.ids) else None
+        return entry, page, next_cursor
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cursors.stats()
@@ -3,73 +3,254 @@ AppSense Arama Servisi
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from models.embeddings.embedding_model import EmbeddingModel
-from models.vectorstore.pinecone_store import PineconeStore
+from models.embeddings.micro_batcher import EmbeddingMicroBatcher
+from models.documentstore.sqlite_store import SQLiteDocumentStore, create_document_store
+from models.lexical.name_index import NameIndex
+from models.lexical.prefix_index import PrefixIndex
+from models.vectorstore.base import VectorStore
+from models.vectorstore.factory import create_vector_store
 from utils.language_detector import LanguageDetector
+from utils.lru_cache import LRUCache
 from core.config import settings
+from core.executors import run_blocking
+from core.metrics import SEARCH_PATH_LATENCY
+from core.request_context import RequestContext
 
 logger = logging.getLogger(__name__)
 
 class SearchService:
     """Uygulama arama servisi"""
     
-    def __init__(self):
-        self.embedding_model = EmbeddingModel()
-        self.vector_store = PineconeStore()
-        self.language_detector = LanguageDetector()
+    def __init__(
+        self,
+        embedding_model: Optional[EmbeddingModel] = None,
+        vector_store: Optional[VectorStore] = None,
+        language_detector: Optional[LanguageDetector] = None,
+        document_store: Optional[SQLiteDocumentStore] = None
+    ):
+        self.embedding_model = embedding_model or EmbeddingModel()
+        self.vector_store = vector_store or create_vector_store()
+        # Kapalıysa (DOCUMENT_STORE_ENABLED) sonuçlar vektör metadata'sından döner
+        self.document_store = document_store or create_document_store()
+        # Doküman deposu kendi önbelleğini tutar; yoksa ID ile okunan uygulamalar burada önbelleklenir
+        self.app_cache: Optional[LRUCache] = None
+        if self.document_store is None and settings.APP_CACHE_SIZE > 0:
+            self.app_cache = LRUCache(max_size=settings.APP_CACHE_SIZE, ttl=settings.APP_CACHE_TTL)
+        self.language_detector = language_detector or LanguageDetector()
+        # Lifespan tarafından başlatılır; yoksa doğrudan model çağrılır
+        self.embedding_batcher: Optional[EmbeddingMicroBatcher] = None
+        # load_lexical_indexes ile kurulur; ad index'i yoksa tüm sorgular vektör aramasına gider
+        self.name_index: Optional[NameIndex] = None
+        self.suggest_index: Optional[PrefixIndex] = None
+        # Index'lerin kurulduğu katalog sürümü (doküman sayısı, son yazma zamanı)
+        self._catalogue_version: Optional[Tuple[int, float]] = None
+    
+    def warm_up(self):
+        """İlk sorgunun gecikmesini önlemek için modeli ısındır"""
+        self.embedding_model.encode("warm up")
+    
+    async def load_lexical_indexes(self, name_index: bool = True, suggest_index: bool = True) -> bool:
+        """
+        Doküman deposundaki katalogdan uygulama adı ve öneri index'lerini kur
+        
+        Args:
+            name_index: Ad eşleşmesi / BM25 index'ini kur
+            suggest_index: Typeahead prefix index'ini kur
+            
+        Returns:
+            Index'ler kurulduysa True (depo kapalı veya boşsa False)
+        """
+        if self.document_store is None:
+            # Vector store'u baştan sona taramak (Pinecone'da 100'lük fetch'ler) açılışı dakikalarca uzatır
+            logger.warning("Doküman deposu kapalı, uygulama adı ve öneri index'leri kurulmadı")
+            return False
+        # Sürüm listelemeden önce okunur; listeleme sırasında yapılan yazmalar sonraki yenilemede görülür
+        self._catalogue_version = await run_blocking("documentstore", self.document_store.version)
+        apps = await run_blocking("documentstore", self.document_store.list_documents)
+        if not apps:
+            logger.warning("Doküman deposu boş, uygulama adı ve öneri index'leri kurulmadı")
+            return False
+        if name_index:
+            index = NameIndex()
+            await run_blocking("lexical", index.build, apps)
+            self.name_index = index
+        if suggest_index:
+            index = PrefixIndex(
+                query_min_count=settings.SUGGEST_QUERY_MIN_COUNT,
+                query_track_size=settings.SUGGEST_QUERY_TRACK_SIZE
+            )
+            await run_blocking("lexical", index.build, apps)
+            if self.suggest_index is not None:
+                index.adopt_queries(self.suggest_index)
+            self.suggest_index = index
+        return True
+    
+    async def refresh_lexical_indexes(self, name_index: bool = True, suggest_index: bool = True) -> bool:
+        """
+        Doküman deposu son kurulumdan beri değiştiyse index'leri yeniden kur
+        
+        Ingestion depoya ayrı bir process'te yazar; upsert_apps/delete_apps
+        üzerinden gelmeyen bu değişiklikler index'lere ancak böyle yansır.
+        Yeni index'ler ayrı nesneler olarak kurulup eskilerinin yerine konur,
+        kurulum sırasında aramalar eski index'lerle devam eder.
+        
+        Returns:
+            Index'ler yeniden kurulduysa True
+        """
+        if self.document_store is None:
+            return False
+        version = await run_blocking("documentstore", self.document_store.version)
+        if version == self._catalogue_version:
+            return False
+        logger.info("Katalog değişti, uygulama adı ve öneri index'leri yeniden kuruluyor")
+        return await self.load_lexical_indexes(name_index=name_index, suggest_index=suggest_index)
+    
+    async def upsert_apps(self, apps_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Uygulamaları doküman deposuna ve vector store'a yaz, başarılı batch'leri öneri index'ine yansıt
+        
+        Dokümanlar vektörlerden önce yazılır; böylece arama sonucu olarak
+        dönen her uygulamanın dokümanı depoda bulunur.
+        
+        Returns:
+            Vector store'un batch sonuçları
+        """
+        if self.document_store is not None:
+            await run_blocking("documentstore", self.document_store.upsert_documents, apps_data)
+        results = await self.vector_store.upsert_apps(apps_data)
+        self._invalidate(app.get('id') for app in apps_data)
+        if self.suggest_index is not None:
+            written = {app_id for result in results if result['success'] for app_id in result['ids']}
+            apps = [app for app in apps_data if app.get('id') in written]
+            # Öneri index'i event loop'tan okunur; kilidi thread'le çekişmesin diye yerinde güncellenir
+            self.suggest_index.upsert_apps(apps)
+        return results
+    
+    async def delete_apps(self, app_ids: List[str]) -> int:
+        """Uygulamaları vector store'dan, doküman deposundan ve öneri index'inden sil"""
+        deleted = await self.vector_store.delete_apps(app_ids)
+        self._invalidate(app_ids)
+        if self.document_store is not None:
+            await run_blocking("documentstore", self.document_store.delete_documents, app_ids)
+        if self.suggest_index is not None:
+            self.suggest_index.delete_apps(app_ids)
+        return deleted
+    
+    def _invalidate(self, app_ids):
+        if self.app_cache is not None:
+            for app_id in app_ids:
+                self.app_cache.pop(app_id)
+    
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Typeahead önerileri (öneri index'i yoksa boş)"""
+        if self.suggest_index is None:
+            return []
+        return self.suggest_index.suggest(prefix, limit)
+    
+    async def close(self):
+        """Servis kaynaklarını serbest bırak"""
+        await self.vector_store.close()
+        if self.document_store is not None:
+            self.document_store.close()
+        self.embedding_model.close()
         
     async def search_apps(
         self, 
         query: str, 
         language: Optional[str] = None,
         category: Optional[str] = None,
-        max_results: int = 10
+        max_results: int = 10,
+        context: Optional[RequestContext] = None,
+        window: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Uygulama arama fonksiyonu
         
+        Sorgu bir uygulamanın adıyla birebir eşleşiyorsa embedding ve vektör
+        araması yapılmaz (lexical yol). Aksi halde BM25 ve vektör adayları
+        reciprocal rank fusion ile birleştirilir (hybrid yol).
+        
         Args:
             query: Arama sorgusu
             language: Dil (opsiyonel)
             category: Kategori filtresi (opsiyonel)
             max_results: Maksimum sonuç sayısı
+            context: İstek bağlamı (sorgu embedding'i ve aşama süreleri buraya yazılır)
+            window: Sıralanacak aday sayısı (sayfalama için); yalnızca ilk
+                max_results doldurulup döner, tüm sıralama context.ranking'e yazılır
             
         Returns:
             Uygulama listesi
         """
+        # Aşama süreleri bağlama yazılır
+        context = context or RequestContext(query)
+        started = time.perf_counter()
         try:
-            # Dil algılama
+            # Dil algılama (istek başında algılandıysa tekrarlanmaz)
+            language = language or context.language
             if not language:
-                language = self.language_detector.detect_language(query)
+                with context.stage("language_detection"):
+                    language = self.language_detector.detect_language(query)
+                context.language = language
+            
+            top_k = max(max_results, window)
             
-            # Sorguyu embedding'e çevir
-            query_embedding = self.embedding_model.encode(query)
+            # Uygulama adı index'i: tam eşleşme varsa doğrudan döndür
+            lexical_results = []
+            # Yenileme sırasında index değiştirilebilir; istek boyunca aynı index kullanılır
+            name_index = self.name_index
+            if name_index is not None and len(name_index):
+                candidates = max(top_k, settings.HYBRID_CANDIDATES)
+                # Tam eşleşme ve BM25 birlikte event loop dışında (index taraması CPU işi)
+                with context.stage("lexical_search"):
+                    exact_results, lexical_results = await run_blocking(
+                        "lexical", name_index.match, query, candidates, category
+                    )
+                if exact_results:
+                    with context.stage("formatting"):
+                        exact_ids = {result['id'] for result in exact_results}
+                        search_results = exact_results + [r for r in lexical_results if r['id'] not in exact_ids]
+                        context.ranking = self._ranking(search_results[:top_k])
+                        formatted_results = [self._format_result(result) for result in search_results[:max_results]]
+                    self._record_query(query, formatted_results)
+                    SEARCH_PATH_LATENCY.observe(time.perf_counter() - started, path="lexical")
+                    logger.info(f"Arama tamamlandı (ad eşleşmesi): {len(formatted_results)} sonuç bulundu")
+                    return formatted_results
+            
+            # Sorguyu embedding'e çevir (eşzamanlı sorgular tek batch'te işlenir)
+            with context.stage("embedding"):
+                if self.embedding_batcher:
+                    query_embedding = await self.embedding_batcher.encode(query)
+                else:
+                    query_embedding = await run_blocking("encode", self.embedding_model.encode, query)
+            context.query_embedding = query_embedding
             
             # Vektör veritabanında arama
-            search_results = await self.vector_store.search(
-                query_embedding=query_embedding,
-                top_k=max_results,
-                filter_category=category
-            )
+            with context.stage("vector_search"):
+                search_results = await self.vector_store.search(
+                    query_embedding=query_embedding,
+                    top_k=max(top_k, settings.HYBRID_CANDIDATES) if lexical_results else top_k,
+                    filter_category=category
+                )
+            
+            if lexical_results:
+                with context.stage("fusion"):
+                    search_results = self.fuse_results([search_results, lexical_results], top_k)
+            context.ranking = self._ranking(search_results)
+            
+            # Vektör sonuçlarının ad, açıklama vb. alanları doküman deposundan (yalnızca dönen sayfa)
+            with context.stage("hydration"):
+                search_results = (await self._hydrate([search_results[:max_results]]))[0]
             
             # Sonuçları formatla
-            formatted_results = []
-            for result in search_results:
-                app_data = {
-                    'id': result.get('id'),
-                    'name': result.get('name', ''),
-                    'description': result.get('description', ''),
-                    'category': result.get('category', ''),
-                    'rating': result.get('rating'),
-                    'review_count': result.get('review_count'),
-                    'download_count': result.get('download_count', ''),
-                    'price': result.get('price', 'Ücretsiz'),
-                    'developer': result.get('developer', ''),
-                    'similarity_score': result.get('score', 0.0)
-                }
-                formatted_results.append(app_data)
+            with context.stage("formatting"):
+                formatted_results = [self._format_result(result) for result in search_results]
             
+            self._record_query(query, formatted_results)
+            SEARCH_PATH_LATENCY.observe(time.perf_counter() - started, path="hybrid" if lexical_results else "vector")
             logger.info(f"Arama tamamlandı: {len(formatted_results)} sonuç bulundu")
             return formatted_results
             
@@ -77,6 +258,143 @@ class SearchService:
             logger.error(f"Arama hatası: {str(e)}")
             raise Exception(f"Arama sırasında hata oluştu: {str(e)}")
     
+    async def search_apps_batch(
+        self,
+        queries: List[str],
+        categories: Optional[List[Optional[str]]] = None,
+        max_results: Optional[List[int]] = None,
+        context: Optional[RequestContext] = None,
+        item_contexts: Optional[List[RequestContext]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu tek embedding çağrısı ve toplu vektör aramasıyla ara
+        
+        Args:
+            queries: Arama sorguları
+            categories: Her sorgu için kategori filtresi (opsiyonel)
+            max_results: Her sorgu için maksimum sonuç sayısı (varsayılan 10)
+            context: Toplu istek bağlamı (aşama süreleri buraya yazılır)
+            item_contexts: Sorgu başına bağlamlar (sorgu embedding'leri buraya yazılır)
+            
+        Returns:
+            Girdi sırasıyla her sorgunun uygulama listesi
+        """
+        if not queries:
+            return []
+        context = context or RequestContext(" | ".join(queries))
+        categories = categories or [None] * len(queries)
+        max_results = max_results or [10] * len(queries)
+        try:
+            # Tüm sorgular tek model çağrısında (önbellekte olmayanlar) encode edilir
+            with context.stage("embedding"):
+                query_embeddings = await run_blocking("encode", self.embedding_model.encode_queries, queries)
+            for item_context, query_embedding in zip(item_contexts or [], query_embeddings):
+                item_context.query_embedding = query_embedding
+            
+            with context.stage("vector_search"):
+                batch_results = await self.vector_store.search_batch(
+                    query_embeddings=query_embeddings,
+                    top_ks=max_results,
+                    filter_categories=categories
+                )
+            
+            # Tüm sorguların sonuçları tek depo sorgusuyla doldurulur
+            with context.stage("hydration"):
+                batch_results = await self._hydrate(batch_results)
+            
+            with context.stage("formatting"):
+                formatted_batch = [
+                    [self._format_result(result) for result in search_results]
+                    for search_results in batch_results
+                ]
+            
+            logger.info(f"Toplu arama tamamlandı: {len(queries)} sorgu")
+            return formatted_batch
+            
+        except Exception as e:
+            logger.error(f"Toplu arama hatası: {str(e)}")
+            raise Exception(f"Toplu arama sırasında hata oluştu: {str(e)}")
+    
+    async def _hydrate(self, result_lists: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Yalnızca ID ve filtre alanlarını içeren sonuçları doküman deposundan doldur
+        
+        Tam metadata'lı sonuçlar (lexical index, depo öncesi yüklenmiş vektörler)
+        olduğu gibi kalır; diğerlerinin ID'leri tek toplu sorguda okunur. Depoda
+        satırı olmayan ID'ler (depo henüz doldurulmamışsa) vector store'un
+        metadata'sından tamamlanır.
+        """
+        if self.document_store is None:
+            return result_lists
+        missing = [result['id'] for results in result_lists for result in results if 'name' not in result]
+        if not missing:
+            return result_lists
+        documents = await run_blocking("documentstore", self.document_store.get_documents, missing)
+        absent = [app_id for app_id in dict.fromkeys(missing) if app_id not in documents]
+        if absent:
+            logger.debug(f"Doküman deposunda olmayan {len(absent)} sonuç vector store'dan dolduruluyor")
+            documents = {**documents, **await self.vector_store.get_by_ids(absent)}
+        return [
+            [{**result, **documents.get(result['id'], {})} if 'name' not in result else result for result in results]
+            for results in result_lists
+        ]
+    
+    @staticmethod
+    def _ranking(results: List[Dict[str, Any]]) -> List[Tuple[str, float, Optional[float]]]:
+        return [(result['id'], result.get('score', 0.0), result.get('lexical_score')) for result in results]
+    
+    def _record_query(self, query: str, results: List[Dict[str, Any]]):
+        """Sonuç dönen sorguları popüler sorgu önerileri için say"""
+        if self.suggest_index is not None and results:
+            self.suggest_index.record_query(query)
+    
+    @staticmethod
+    def fuse_results(
+        result_lists: List[List[Dict[str, Any]]],
+        top_k: int,
+        rrf_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sıralı sonuç listelerini reciprocal rank fusion ile birleştir
+        
+        Sıralama listeler üzerinden toplam 1 / (rrf_k + sıra) ile yapılır. Bir
+        uygulama birden fazla listede varsa sonuçları birleştirilir; her listenin
+        kendi skor alanı ('score', 'lexical_score') korunur.
+        
+        Args:
+            result_lists: 'id' alanlı sonuç listeleri (öncelik sırasıyla)
+            top_k: Döndürülecek sonuç sayısı
+            rrf_k: Sıra sabiti (varsayılan: settings.RRF_K)
+        """
+        rrf_k = rrf_k or settings.RRF_K
+        fused: Dict[str, float] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        for result_list in result_lists:
+            for rank, result in enumerate(result_list, start=1):
+                app_id = result['id']
+                fused[app_id] = fused.get(app_id, 0.0) + 1.0 / (rrf_k + rank)
+                results[app_id] = {**result, **results[app_id]} if app_id in results else result
+        ordered = sorted(fused, key=fused.get, reverse=True)
+        return [results[app_id] for app_id in ordered[:top_k]]
+    
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Vektör veritabanı sonucunu API formatına çevir"""
+        return {
+            'id': result.get('id'),
+            'name': result.get('name', ''),
+            'description': result.get('description', ''),
+            'category': result.get('category', ''),
+            'rating': result.get('rating'),
+            'review_count': result.get('review_count'),
+            'download_count': result.get('download_count', ''),
+            'price': result.get('price', 'Ücretsiz'),
+            'developer': result.get('developer', ''),
+            # Vektör (cosine) skoru; yalnızca ad index'inden gelen sonuçlarda 0
+            'similarity_score': result.get('score', 0.0),
+            'lexical_score': result.get('lexical_score')
+        }
+    
     async def get_categories(self) -> List[str]:
         """Mevcut kategorileri getir"""
         return [
@@ -84,24 +402,55 @@ class SearchService:
             "Productivity", "Social", "Games", "Health", "Travel"
         ]
     
+    async def get_apps_by_ids(self, app_ids: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        ID'lere göre uygulamalar (tekrarlanan ID'ler bir kez okunur)
+        
+        Doküman deposu açıksa tek IN sorgusu ve deponun önbelleği, kapalıysa
+        app_cache ve vector store'un toplu fetch'i kullanılır. Depoda olmayan
+        ID'ler vector store'dan tamamlanır.
+        
+        Returns:
+            (Bulunan uygulamalar istek sırasıyla, 'requested', 'unique',
+            'cache_hits', 'fetched' ve 'found' sayıları)
+        """
+        unique = list(dict.fromkeys(app_ids))
+        found: Dict[str, Dict[str, Any]] = {}
+        cache_hits = 0
+        if self.document_store is not None:
+            documents, cache_hits = await run_blocking("documentstore", self.document_store.lookup_documents, unique)
+            found = {app_id: {'id': app_id, **document} for app_id, document in documents.items()}
+        elif self.app_cache is not None:
+            for app_id in unique:
+                app = self.app_cache.get(app_id)
+                if app is not None:
+                    found[app_id] = app
+            cache_hits = len(found)
+        
+        missing = [app_id for app_id in unique if app_id not in found]
+        if missing:
+            apps = await self.vector_store.get_by_ids(missing)
+            found.update(apps)
+            if self.app_cache is not None:
+                for app_id, app in apps.items():
+                    self.app_cache.set(app_id, app)
+        
+        apps = [self._format_result({**found[app_id], 'score': 1.0}) for app_id in unique if app_id in found]
+        # Önbellekten karşılanmayan her ID bir kez sayılır (depodan veya vector store'dan)
+        fetched = len(unique) - cache_hits
+        return apps, {
+            'requested': len(app_ids),
+            'unique': len(unique),
+            'cache_hits': cache_hits,
+            'fetched': fetched,
+            'found': len(apps)
+        }
+    
     async def get_app_by_id(self, app_id: str) -> Optional[Dict[str, Any]]:
         """ID ile uygulama getir"""
         try:
-            app_data = await self.vector_store.get_by_id(app_id)
-            if app_data:
-                return {
-                    'id': app_data.get('id'),
-                    'name': app_data.get('name', ''),
-                    'description': app_data.get('description', ''),
-                    'category': app_data.get('category', ''),
-                    'rating': app_data.get('rating'),
-                    'review_count': app_data.get('review_count'),
-                    'download_count': app_data.get('download_count', ''),
-                    'price': app_data.get('price', 'Ücretsiz'),
-                    'developer': app_data.get('developer', ''),
-                    'similarity_score': 1.0
-                }
-            return None
+            apps, _ = await self.get_apps_by_ids([app_id])
+            return apps[0] if apps else None
         except Exception as e:
             logger.error(f"Uygulama getirme hatası: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
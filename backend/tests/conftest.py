@@ -0,0 +1,9 @@
+"""
+AppSense test yapılandırması
+"""
+
+import sys
+from pathlib import Path
+
+# Backend modülleri (core, models, services...) kök paket olarak import edilir
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,66 @@
+"""
+EmbeddingArtifactCache testleri
+"""
+
+import json
+
+import numpy as np
+
+from models.embeddings.artifact_cache import EmbeddingArtifactCache
+
+def fake_encode(texts):
+    return [[float(len(text)), 1.0] for text in texts]
+
+def unexpected_encode(texts):
+    raise AssertionError(f"Önbellekte olması gereken metinler yeniden encode edildi: {texts}")
+
+def make_cache(tmp_path):
+    return EmbeddingArtifactCache(path=str(tmp_path), model_name="test-model", dimension=2, dtype="float32")
+
+def test_encode_appends_keys_and_survives_reopen(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.encode(["a", "bb"], fake_encode)
+    cache.encode(["ccc"], fake_encode)
+    keys_path = cache.path / cache.KEYS_FILE
+    assert keys_path.stat().st_size == 3 * cache.KEY_SIZE
+
+    reopened = make_cache(tmp_path)
+    assert reopened.count == 3
+    vectors = reopened.encode(["ccc", "a"], unexpected_encode)
+    assert vectors.tolist() == [[3.0, 1.0], [1.0, 1.0]]
+
+def test_uncounted_trailing_keys_are_ignored_and_overwritten(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.encode(["a"], fake_encode)
+    # meta.json yazılmadan kesilen bir eklemenin artığı
+    with open(cache.path / cache.KEYS_FILE, "ab") as f:
+        f.write(b"\xff" * cache.KEY_SIZE * 2)
+
+    reopened = make_cache(tmp_path)
+    assert reopened.count == 1
+    reopened.encode(["bb"], fake_encode)
+    assert (reopened.path / reopened.KEYS_FILE).stat().st_size == 2 * reopened.KEY_SIZE
+    assert make_cache(tmp_path).count == 2
+
+def test_legacy_keys_file_is_migrated(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.encode(["a", "bb"], fake_encode)
+    keys_path = cache.path / cache.KEYS_FILE
+    legacy = np.frombuffer(keys_path.read_bytes(), dtype=np.uint8).reshape(-1, cache.KEY_SIZE)
+    np.save(cache.path / cache.LEGACY_KEYS_FILE, legacy)
+    keys_path.unlink()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.count == 2
+    assert keys_path.exists()
+    assert not (reopened.path / reopened.LEGACY_KEYS_FILE).exists()
+    assert json.loads((reopened.path / reopened.META_FILE).read_text())["count"] == 2
+
+def test_prune_rewrites_keys(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.encode(["a", "bb", "ccc"], fake_encode)
+    assert cache.prune(["bb"]) == 2
+
+    reopened = make_cache(tmp_path)
+    assert reopened.count == 1
+    assert reopened.encode(["bb"], unexpected_encode).tolist() == [[2.0, 1.0]]
@@ -0,0 +1,36 @@
+"""
+ServiceContainer yaşam döngüsü testleri
+"""
+
+import asyncio
+
+import pytest
+
+from core import executors
+from core.container import ServiceContainer
+
+class FakeSearchService:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+def test_failed_startup_releases_created_resources(monkeypatch):
+    search_service = FakeSearchService()
+
+    def create_services(self):
+        # Havuz ve servis oluşturulduktan sonra ısındırma hata verir
+        executors.get_executor("documentstore")
+        self.search_service = search_service
+        raise RuntimeError("warm up failed")
+
+    monkeypatch.setattr(ServiceContainer, "_create_services", create_services)
+    container = ServiceContainer()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(container.startup())
+
+    assert search_service.closed
+    assert container.search_service is None and not container.ready
+    assert executors._executors == {}
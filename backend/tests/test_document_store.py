@@ -0,0 +1,56 @@
+"""
+SQLiteDocumentStore testleri
+"""
+
+from core.config import PROJECT_ROOT
+from models.documentstore.sqlite_store import SQLiteDocumentStore
+
+def test_relative_url_resolves_against_project_root():
+    assert SQLiteDocumentStore.parse_url("sqlite:///./appsense.db") == str(PROJECT_ROOT / "appsense.db")
+    assert SQLiteDocumentStore.parse_url("sqlite:////tmp/appsense.db") == "/tmp/appsense.db"
+
+import pytest
+
+def make_app(app_id, name):
+    return {'id': app_id, 'name': name, 'description': '', 'category': 'GAME', 'rating': 4.0}
+
+@pytest.fixture
+def url(tmp_path):
+    return f"sqlite:///{tmp_path}/documents.db"
+
+def test_batched_lookup_uses_cache_and_skips_unknown_ids(url):
+    store = SQLiteDocumentStore(url, pool_size=2, cache_size=100)
+    store.upsert_documents([make_app('a1', 'Bir'), make_app('a2', 'İki')])
+
+    documents, cache_hits = store.lookup_documents(['a1', 'a2', 'a1', 'yok'])
+    assert set(documents) == {'a1', 'a2'} and cache_hits == 0
+    documents, cache_hits = store.lookup_documents(['a1', 'a2'])
+    assert documents['a2']['name'] == 'İki' and cache_hits == 2
+    store.close()
+
+def test_own_writes_invalidate_cached_rows(url):
+    store = SQLiteDocumentStore(url, pool_size=2, cache_size=100)
+    store.upsert_documents([make_app('a1', 'Eski')])
+    assert store.get_document('a1')['name'] == 'Eski'
+
+    store.upsert_documents([make_app('a1', 'Yeni')])
+    assert store.get_document('a1')['name'] == 'Yeni'
+    store.delete_documents(['a1'])
+    assert store.get_document('a1') is None
+    store.close()
+
+def test_writes_from_another_process_invalidate_cache(url):
+    # API ve ingestion scripti aynı dosyayı ayrı bağlantılarla açar
+    api = SQLiteDocumentStore(url, pool_size=2, cache_size=100)
+    ingestion = SQLiteDocumentStore(url, pool_size=1, cache_size=0)
+    ingestion.upsert_documents([make_app('a1', 'Eski'), make_app('a2', 'Silinecek')])
+    assert api.get_documents(['a1', 'a2'])['a1']['name'] == 'Eski'
+
+    ingestion.upsert_documents([make_app('a1', 'Yeni')])
+    ingestion.delete_documents(['a2'])
+
+    documents, cache_hits = api.lookup_documents(['a1', 'a2'])
+    assert documents == {'a1': documents['a1']} and documents['a1']['name'] == 'Yeni'
+    assert cache_hits == 0
+    api.close()
+    ingestion.close()
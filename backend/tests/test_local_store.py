@@ -0,0 +1,84 @@
+"""
+LocalVectorStore testleri
+"""
+
+import asyncio
+
+import numpy as np
+
+from models.vectorstore.local_store import LocalVectorStore
+
+DIMENSION = 16
+
+def make_apps(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'id': f'a{i}',
+            'name': f'App {i}',
+            'category': 'GAME' if i % 2 else 'TOOLS',
+            'embedding': rng.normal(size=DIMENSION).astype(np.float32)
+        }
+        for i in range(count)
+    ]
+
+def make_ivf_store(tmp_path, apps):
+    store = LocalVectorStore(path=str(tmp_path), dimension=DIMENSION, index_type="ivf", storage="float32")
+    store._ann.nlist = 4
+    store._ann.nprobe = 4
+    asyncio.run(store.upsert_apps(apps))
+    assert store._ann.is_trained
+    return store
+
+def test_ivf_delete_last_row_keeps_search_working(tmp_path):
+    apps = make_apps(400)
+    store = make_ivf_store(tmp_path, apps)
+
+    assert asyncio.run(store.delete_app('a399'))
+
+    query = apps[10]['embedding'].tolist()
+    results = asyncio.run(store.search(query, top_k=5))
+    assert results and results[0]['id'] == 'a10'
+    assert all(result['id'] != 'a399' for result in results)
+
+    filtered = asyncio.run(store.search(apps[399]['embedding'].tolist(), top_k=5, filter_category='GAME'))
+    assert filtered
+    assert all(result['category'] == 'GAME' and result['id'] != 'a399' for result in filtered)
+
+def test_ivf_delete_middle_row_moves_last_row(tmp_path):
+    apps = make_apps(400)
+    store = make_ivf_store(tmp_path, apps)
+
+    assert asyncio.run(store.delete_app('a5'))
+
+    results = asyncio.run(store.search(apps[399]['embedding'].tolist(), top_k=3))
+    assert results[0]['id'] == 'a399'
+    assert all(result['id'] != 'a5' for result in results)
+
+def test_id_lookups_wait_for_lock_off_the_event_loop(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path), dimension=DIMENSION, index_type="flat", storage="float32")
+    asyncio.run(store.upsert_apps(make_apps(10)))
+
+    async def lookup_while_search_holds_lock():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        # Uzun bir arama taraması gibi kilidi bir thread'de tut
+        store._lock.acquire()
+        task = asyncio.create_task(ticker())
+        lookup = asyncio.create_task(store.get_by_ids(['a1', 'a2']))
+        await asyncio.sleep(0.1)
+        assert not lookup.done()
+        store._lock.release()
+        apps = await lookup
+        task.cancel()
+        return ticks, apps
+
+    ticks, apps = asyncio.run(lookup_while_search_holds_lock())
+    assert ticks >= 5
+    assert sorted(apps) == ['a1', 'a2']
@@ -0,0 +1,24 @@
+"""
+/metrics toplayıcı testleri
+"""
+
+from types import SimpleNamespace
+
+from core.container import ServiceContainer
+from services.analysis_cache import SemanticAnalysisCache
+
+def collected(container):
+    return {name: value for name, _, _, value in container.collect_metrics()}
+
+def test_analysis_cache_savings_are_exported():
+    cache = SemanticAnalysisCache(max_size=10, ttl=0, max_distance=0.1)
+    cache.set("tr", "fp", [1.0, 0.0], analysis="analiz", tokens=120, latency=0.8)
+    assert cache.get("tr", "fp", [1.0, 0.0]) == "analiz"
+    container = ServiceContainer()
+    container.llm_service = SimpleNamespace(analysis_cache=cache)
+
+    metrics = collected(container)
+
+    assert metrics["appsense_analysis_cache_hits_total"] == 1
+    assert metrics["appsense_analysis_cache_saved_tokens_total"] == 120
+    assert metrics["appsense_analysis_cache_saved_seconds_total"] == 0.8
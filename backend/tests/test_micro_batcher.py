@@ -0,0 +1,53 @@
+"""
+EmbeddingMicroBatcher testleri
+"""
+
+import asyncio
+import threading
+
+from core.metrics import EMBEDDING_BATCH_SIZE
+from models.embeddings.micro_batcher import EmbeddingMicroBatcher
+
+class SlowModel:
+    """encode_queries, release edilene kadar thread'de bekler"""
+
+    def __init__(self):
+        self.cache = None
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def encode_queries(self, texts, check_cache=True):
+        self.started.set()
+        self.release.wait(5)
+        return [[float(len(text))] for text in texts]
+
+def test_stop_cancels_requests_being_encoded():
+    model = SlowModel()
+
+    async def scenario():
+        batcher = EmbeddingMicroBatcher(model, max_batch_size=4, max_wait_ms=1)
+        await batcher.start()
+        requests = [asyncio.create_task(batcher.encode(text)) for text in ("a", "bb")]
+        await asyncio.get_running_loop().run_in_executor(None, model.started.wait, 5)
+        await batcher.stop()
+        model.release.set()
+        return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), 1)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+def test_batch_sizes_are_observed():
+    model = SlowModel()
+    model.release.set()
+    before = EMBEDDING_BATCH_SIZE._series.get((), [0.0] * 10)[-1]
+
+    async def scenario():
+        batcher = EmbeddingMicroBatcher(model, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        vectors = await asyncio.gather(*(batcher.encode(text) for text in ("a", "bb", "ccc")))
+        await batcher.stop()
+        return vectors
+
+    assert asyncio.run(scenario()) == [[1.0], [2.0], [3.0]]
+    assert EMBEDDING_BATCH_SIZE._series[()][-1] - before == 3
+    assert "appsense_embedding_batch_size_bucket" in "\n".join(EMBEDDING_BATCH_SIZE.render())
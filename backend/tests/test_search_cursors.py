@@ -0,0 +1,134 @@
+"""
+Arama sayfalama (cursor) testleri
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import search_router
+from core.container import (
+    get_analysis_jobs, get_language_detector, get_llm_service, get_search_cursors, get_search_service
+)
+from services.search_cursors import SearchCursorCache
+
+# (ID, vektör skoru, lexical skor); çift sıralı adaylar ad index'inden de eşleşmiş
+RANKING = [(f'a{i}', 1.0 - i / 100, 0.5 if i % 2 == 0 else None) for i in range(25)]
+
+class FakeSearchService:
+    """Yalnızca ID ile okuma (sonraki sayfalar embedding ve vektör araması yapmaz)"""
+
+    async def get_apps_by_ids(self, app_ids):
+        apps = [
+            {
+                'id': app_id, 'name': app_id, 'description': '', 'category': 'GAME', 'rating': 4.0,
+                'review_count': 1, 'download_count': '1+', 'price': '0', 'developer': '', 'similarity_score': 1.0
+            }
+            for app_id in app_ids
+        ]
+        return apps, {}
+
+    async def search_apps(self, query, language=None, category=None, max_results=10, context=None, window=0):
+        # İlk sayfa: istenen pencere kadar aday sıralanır, yalnızca ilk max_results döner
+        self.window = window
+        context.ranking = RANKING[:window]
+        apps, _ = await self.get_apps_by_ids([app_id for app_id, *_ in context.ranking[:max_results]])
+        return apps
+
+class FakeLanguageDetector:
+    def detect_language(self, text):
+        return "tr"
+
+@pytest.fixture
+def cursors():
+    return SearchCursorCache(max_cursors=10, max_results=20, ttl=60)
+
+@pytest.fixture
+def search_service():
+    return FakeSearchService()
+
+@pytest.fixture
+def client(cursors, search_service):
+    app = FastAPI()
+    app.include_router(search_router, prefix="/api/v1")
+    app.dependency_overrides.update({
+        get_search_service: lambda: search_service,
+        get_search_cursors: lambda: cursors,
+        get_llm_service: lambda: None,
+        get_language_detector: FakeLanguageDetector,
+        get_analysis_jobs: lambda: None,
+    })
+    return TestClient(app)
+
+def test_cursor_pages_follow_ranking_and_respect_window(cursors):
+    cursor = cursors.create("oyun", "tr", RANKING, page_size=10)
+    entry, page, next_cursor = cursors.page(cursor, 5)
+    assert entry.query == "oyun"
+    assert [app_id for app_id, *_ in page] == ['a10', 'a11', 'a12', 'a13', 'a14']
+
+    # Cursor başına en fazla max_results (20) aday saklanır
+    _, page, next_cursor = cursors.page(next_cursor, 10)
+    assert [app_id for app_id, *_ in page] == [f'a{i}' for i in range(15, 20)]
+    assert next_cursor is None
+
+def test_no_cursor_when_first_page_covers_ranking(cursors):
+    assert cursors.create("oyun", "tr", RANKING[:5], page_size=10) is None
+
+def test_cursor_expires_after_ttl():
+    cursors = SearchCursorCache(max_cursors=10, max_results=20, ttl=0.01)
+    cursor = cursors.create("oyun", "tr", RANKING, page_size=10)
+    time.sleep(0.02)
+    with pytest.raises(KeyError):
+        cursors.page(cursor, 10)
+
+def test_cursor_cache_is_bounded():
+    cursors = SearchCursorCache(max_cursors=2, max_results=20, ttl=60)
+    first = cursors.create("a", "tr", RANKING, page_size=10)
+    cursors.create("b", "tr", RANKING, page_size=10)
+    cursors.create("c", "tr", RANKING, page_size=10)
+    with pytest.raises(KeyError):
+        cursors.page(first, 10)
+
+def test_window_covers_a_few_pages_up_to_max_results():
+    cursors = SearchCursorCache(max_cursors=10, max_results=20, ttl=60, pages=3)
+    assert cursors.window(5) == 15
+    assert cursors.window(10) == 20
+    assert SearchCursorCache(max_cursors=10, max_results=0, ttl=60, pages=3).window(10) == 0
+
+def test_first_page_ranks_only_the_cursor_window(client, search_service):
+    client.app.dependency_overrides[get_search_cursors] = lambda: SearchCursorCache(
+        max_cursors=10, max_results=20, ttl=60, pages=2
+    )
+    response = client.post("/api/v1/search", json={"query": "oyun", "max_results": 4, "skip_analysis": True})
+    assert response.status_code == 200
+    assert search_service.window == 8
+    body = response.json()
+    assert [app["id"] for app in body["results"]] == ['a0', 'a1', 'a2', 'a3']
+    assert body["next_cursor"]
+
+def test_search_page_served_from_cursor(client, cursors):
+    cursor = cursors.create("oyun", "tr", RANKING, page_size=10)
+    response = client.post("/api/v1/search", json={"cursor": cursor, "max_results": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "oyun"
+    assert [app["id"] for app in body["results"]] == ['a10', 'a11', 'a12', 'a13', 'a14']
+    assert body["results"][0]["similarity_score"] == pytest.approx(0.9)
+    assert [app["lexical_score"] for app in body["results"][:2]] == [0.5, None]
+    assert body["next_cursor"]
+
+def test_invalid_cursor_returns_400(client):
+    assert client.post("/api/v1/search", json={"cursor": "not-a-cursor!"}).status_code == 400
+    assert client.get("/api/v1/search", params={"cursor": "not-a-cursor!"}).status_code == 400
+
+def test_expired_cursor_returns_410(client, cursors):
+    cursor = cursors.create("oyun", "tr", RANKING, page_size=10)
+    cursors._cursors.clear()
+    assert client.post("/api/v1/search", json={"cursor": cursor}).status_code == 410
+    assert client.get("/api/v1/search", params={"cursor": cursor}).status_code == 410
+
+def test_query_required_without_cursor(client):
+    assert client.post("/api/v1/search", json={}).status_code == 422
+    assert client.get("/api/v1/search").status_code == 422
@@ -0,0 +1,153 @@
+"""
+SearchService testleri (doküman doldurma ve ID ile okuma)
+"""
+
+import asyncio
+
+import pytest
+
+from models.documentstore.sqlite_store import SQLiteDocumentStore
+from models.vectorstore.base import VectorStore
+from services.search_service import SearchService
+
+def make_app(app_id, name):
+    return {
+        'id': app_id, 'name': name, 'description': f'{name} açıklaması', 'category': 'GAME',
+        'rating': 4.5, 'review_count': 10, 'download_count': '1,000+', 'price': '0', 'developer': 'Dev'
+    }
+
+class FakeVectorStore(VectorStore):
+    """Tam metadata'yı bellekte tutan vector store (depo öncesi yüklenmiş index gibi)"""
+
+    def __init__(self, apps=()):
+        self.apps = {app['id']: dict(app) for app in apps}
+        self.fetches = 0
+
+    async def upsert_apps(self, apps_data):
+        for app in apps_data:
+            self.apps[app['id']] = dict(app)
+        return [self.batch_result(0, [app['id'] for app in apps_data], True)]
+
+    async def search(self, query_embedding, top_k=10, filter_category=None):
+        return []
+
+    async def get_by_id(self, app_id):
+        self.fetches += 1
+        return self.apps.get(app_id)
+
+    async def delete_app(self, app_id):
+        return self.apps.pop(app_id, None) is not None
+
+    async def get_index_stats(self):
+        return {}
+
+@pytest.fixture
+def document_store(tmp_path):
+    store = SQLiteDocumentStore(f"sqlite:///{tmp_path}/documents.db", pool_size=1, cache_size=100)
+    yield store
+    store.close()
+
+def make_service(vector_store, document_store):
+    return SearchService(
+        embedding_model=object(),
+        vector_store=vector_store,
+        language_detector=object(),
+        document_store=document_store
+    )
+
+def test_hydrate_falls_back_to_vector_metadata_when_store_has_no_row(document_store):
+    vector_store = FakeVectorStore([make_app('a1', 'Eski Uygulama')])
+    document_store.upsert_documents([make_app('a2', 'Yeni Uygulama')])
+    service = make_service(vector_store, document_store)
+
+    [results] = asyncio.run(service._hydrate([[{'id': 'a1', 'score': 0.5}, {'id': 'a2', 'score': 0.4}]]))
+
+    assert [result['name'] for result in results] == ['Eski Uygulama', 'Yeni Uygulama']
+    assert results[0]['score'] == 0.5
+
+def test_get_apps_by_ids_counts_each_fetch_once(document_store):
+    vector_store = FakeVectorStore([make_app('a1', 'Eski Uygulama')])
+    document_store.upsert_documents([make_app('a2', 'Yeni Uygulama')])
+    service = make_service(vector_store, document_store)
+
+    apps, stats = asyncio.run(service.get_apps_by_ids(['a1', 'a2', 'a2', 'yok']))
+    assert [app['id'] for app in apps] == ['a1', 'a2']
+    assert stats == {'requested': 4, 'unique': 3, 'cache_hits': 0, 'fetched': 3, 'found': 2}
+
+    _, stats = asyncio.run(service.get_apps_by_ids(['a1', 'a2']))
+    assert stats['cache_hits'] == 1
+    assert stats['fetched'] == 1
+
+def test_app_cache_expires_so_external_writes_show_up(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("utils.lru_cache.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("services.search_service.settings.DOCUMENT_STORE_ENABLED", False)
+    monkeypatch.setattr("services.search_service.settings.APP_CACHE_TTL", 60)
+    vector_store = FakeVectorStore([make_app('a1', 'Eski Ad')])
+    service = make_service(vector_store, None)
+    assert service.app_cache is not None
+
+    asyncio.run(service.get_apps_by_ids(['a1']))
+    # Ingestion vector store'a doğrudan yazar; SearchService.upsert_apps çağrılmaz
+    vector_store.apps['a1'] = make_app('a1', 'Yeni Ad')
+    apps, stats = asyncio.run(service.get_apps_by_ids(['a1']))
+    assert apps[0]['name'] == 'Eski Ad'
+    assert stats['cache_hits'] == 1
+
+    clock[0] += 61
+    apps, stats = asyncio.run(service.get_apps_by_ids(['a1']))
+    assert apps[0]['name'] == 'Yeni Ad'
+    assert stats['cache_hits'] == 0
+
+def test_lexical_indexes_are_built_from_document_store_only(document_store):
+    vector_store = FakeVectorStore([make_app('a1', 'Fitness Coach')])
+    service = make_service(vector_store, document_store)
+    assert asyncio.run(service.load_lexical_indexes()) is False
+    assert service.name_index is None and service.suggest_index is None
+
+    document_store.upsert_documents([make_app('a1', 'Fitness Coach')])
+    assert asyncio.run(service.load_lexical_indexes()) is True
+    assert [s['app_id'] for s in service.suggest('fit') if s['type'] == 'app'] == ['a1']
+    assert vector_store.fetches == 0
+
+def test_fusion_keeps_vector_and_lexical_scores_separate():
+    vector_results = [{'id': 'a1', 'score': 0.8}, {'id': 'a2', 'score': 0.7}]
+    lexical_results = [{**make_app('a2', 'İkinci'), 'lexical_score': 1.0}, {**make_app('a3', 'Üçüncü'), 'lexical_score': 0.4}]
+
+    fused = SearchService.fuse_results([vector_results, lexical_results], top_k=3)
+    formatted = {result['id']: SearchService._format_result(result) for result in fused}
+
+    assert [result['id'] for result in fused][0] == 'a2'
+    assert (formatted['a2']['similarity_score'], formatted['a2']['lexical_score']) == (0.7, 1.0)
+    assert (formatted['a1']['similarity_score'], formatted['a1']['lexical_score']) == (0.8, None)
+    assert (formatted['a3']['similarity_score'], formatted['a3']['lexical_score']) == (0.0, 0.4)
+
+def test_refresh_rebuilds_indexes_after_external_writes(document_store, monkeypatch):
+    monkeypatch.setattr("services.search_service.settings.SUGGEST_QUERY_MIN_COUNT", 1)
+    document_store.upsert_documents([make_app('a1', 'Fitness Coach')])
+    service = make_service(FakeVectorStore(), document_store)
+    asyncio.run(service.load_lexical_indexes())
+    service.suggest_index.record_query('Fitness Tracker')
+    assert asyncio.run(service.refresh_lexical_indexes()) is False
+
+    # Ingestion depoya ayrı bir process'te yazar
+    ingestion = SQLiteDocumentStore(f"sqlite:///{document_store.path}", pool_size=1, cache_size=0)
+    ingestion.upsert_documents([make_app('a2', 'Fitbit Tracker')])
+    ingestion.close()
+
+    assert asyncio.run(service.refresh_lexical_indexes()) is True
+    texts = {suggestion['text'] for suggestion in service.suggest('fit')}
+    assert {'Fitness Coach', 'Fitbit Tracker', 'Fitness Tracker'} <= texts
+    assert [result['id'] for result in service.name_index.lookup_exact('Fitbit Tracker')] == ['a2']
+    assert asyncio.run(service.refresh_lexical_indexes()) is False
+
+def test_exact_name_match_skips_embedding(document_store):
+    document_store.upsert_documents([make_app('a1', 'Fitness Coach'), make_app('a2', 'Fitness Coach Pro')])
+    service = make_service(FakeVectorStore(), document_store)
+    asyncio.run(service.load_lexical_indexes())
+
+    # embedding_model=object(): embedding'e gidilseydi arama hata verirdi
+    results = asyncio.run(service.search_apps('fitness coach', language='en', max_results=5))
+
+    assert results[0]['id'] == 'a1'
+    assert results[0]['lexical_score'] == 1.0 and results[0]['similarity_score'] == 0.0
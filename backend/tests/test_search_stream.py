@@ -0,0 +1,87 @@
+"""
+Akışlı arama (SSE) testleri
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import search_router
+from core.container import get_language_detector, get_llm_service, get_search_service
+from core.request_context import RequestContext
+from services.llm_service import LLMService
+
+APP = {
+    'id': 'a1', 'name': 'Fitness Coach', 'description': 'Antrenman planları', 'category': 'HEALTH_AND_FITNESS',
+    'rating': 4.6, 'review_count': 120, 'download_count': '1,000+', 'price': '0', 'developer': 'Dev',
+    'similarity_score': 0.9
+}
+
+class FakeSearchService:
+    async def search_apps(self, query, language=None, category=None, max_results=10, context=None, window=0):
+        return [dict(APP)]
+
+class FakeLanguageDetector:
+    def detect_language(self, text):
+        return "tr"
+
+class FailingCompletions:
+    """Groq isteği akış başlamadan başarısız olur"""
+
+    async def create(self, **kwargs):
+        raise RuntimeError("rate limited")
+
+@pytest.fixture
+def llm_service(monkeypatch):
+    monkeypatch.setattr("services.llm_service.settings.ANALYSIS_CACHE_ENABLED", False)
+    monkeypatch.setattr("services.llm_service.settings.GROQ_API_KEY", "")
+    service = LLMService(language_detector=FakeLanguageDetector())
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=FailingCompletions()))
+    return service
+
+@pytest.fixture
+def client(llm_service):
+    app = FastAPI()
+    app.include_router(search_router, prefix="/api/v1")
+    app.dependency_overrides.update({
+        get_search_service: FakeSearchService,
+        get_llm_service: lambda: llm_service,
+        get_language_detector: FakeLanguageDetector,
+    })
+    return TestClient(app)
+
+def events(body):
+    return [block.split("\n")[0][len("event: "):] for block in body.strip().split("\n\n")]
+
+def test_llm_failure_is_sent_as_error_event(client):
+    response = client.get("/api/v1/search/stream", params={"query": "fitness"})
+    assert response.status_code == 200
+    assert events(response.text) == ["results", "error", "done"]
+
+class CountingCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content="Fitness Coach öne çıkıyor.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(total_tokens=50))
+
+def test_exact_name_queries_reuse_cached_analysis(monkeypatch):
+    monkeypatch.setattr("services.llm_service.settings.GROQ_API_KEY", "")
+    service = LLMService(language_detector=FakeLanguageDetector())
+    completions = CountingCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    assert service.analysis_cache is not None
+
+    for _ in range(2):
+        # Ad eşleşmesi yolu: bağlamda sorgu embedding'i yok
+        context = RequestContext("fitness coach")
+        analysis = asyncio.run(service.analyze_search_results("fitness coach", [dict(APP)], "tr", context))
+        assert analysis == "Fitness Coach öne çıkıyor."
+
+    assert completions.calls == 1
+    assert service.analysis_cache.stats()["saved_tokens"] == 50
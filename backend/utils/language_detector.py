@@ -3,18 +3,70 @@ AppSense Dil Algılama Yardımcısı
 """
 
 import logging
-from typing import Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 from langdetect import detect, DetectorFactory
+from langdetect.detector_factory import init_factory
 from langdetect.lang_detect_exception import LangDetectException
+from core.config import settings
+from utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Yalnızca Türkçe'de bulunan harfler (ç, ö, ü başka dillerde de var)
+TURKISH_LETTERS = frozenset("ğĞıİşŞ")
+# Türkçe'de bulunmayan Latin harfleri (Almanca, Fransızca, İspanyolca vb.)
+NON_TURKISH_LATIN_LETTERS = frozenset("äßéèêëàâáãåæœñíìîïóòôõúùûÿøąęłńśźżćčřšžťďňůőű")
+# Rusça'da bulunmayan Kiril harfleri (Ukraynaca, Sırpça, Bulgarca vb.)
+NON_RUSSIAN_CYRILLIC_LETTERS = frozenset("іїєґўјљњћџђѓќѕІЇЄҐЎЈЉЊЋЏЂЃЌЅ")
+
+def _script(char: str) -> Optional[str]:
+    """Harfin yazı sistemi (Latin dışı, dil belirleyici olanlar)"""
+    code = ord(char)
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF:
+        return 'kana'
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return 'hangul'
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return 'han'
+    if 0x0400 <= code <= 0x04FF:
+        return 'cyrillic'
+    return None
+
+# Toplu algılama worker'ının dedektörü (her process'te _init_worker ile kurulur)
+_worker_detector = None
+
+def _init_worker(seed: int):
+    global _worker_detector
+    _worker_detector = LanguageDetector(cache_size=0)
+    DetectorFactory.seed = seed
+    # Dil profillerini ilk parçayı beklemeden yükle
+    init_factory()
+
+def _detect_chunk(texts: List[str]) -> List[str]:
+    """Worker'da bir parça metni langdetect ile algıla"""
+    return [_worker_detector._detect_with_langdetect(text, quiet=True) for text in texts]
+
 class LanguageDetector:
-    """Dil algılama yardımcı sınıfı"""
+    """
+    Dil algılama yardımcı sınıfı
+
+    Yazı sistemi veya Türkçe'ye özgü harflerle kesin karar verilebilen metinler
+    langdetect'e gönderilmez. Sonuçlar normalize edilmiş metin anahtarıyla LRU
+    önbellekte tutulur (langdetect kısa metinlerde yavaştır).
+    """
     
-    def __init__(self):
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Args:
+            cache_size: Önbellek boyutu (varsayılan: settings.LANGUAGE_DETECTION_CACHE_SIZE, 0 ise kapalı)
+        """
         # LangDetect için seed ayarla (tutarlılık için)
         DetectorFactory.seed = 0
+        cache_size = settings.LANGUAGE_DETECTION_CACHE_SIZE if cache_size is None else cache_size
+        self.cache = LRUCache(max_size=cache_size) if cache_size > 0 else None
+        self.fast_path_hits = 0
         
         # Desteklenen diller
         self.supported_languages = {
@@ -41,28 +93,184 @@ class LanguageDetector:
         Returns:
             Dil kodu (örn: 'tr', 'en')
         """
-        try:
-            if not text or not text.strip():
-                return 'en'  # Varsayılan dil
+        if not text or not text.strip():
+            return 'en'  # Varsayılan dil
+        
+        key = self.normalize_text(text)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        detected_lang = self.detect_by_script(key)
+        if detected_lang:
+            self.fast_path_hits += 1
+        else:
+            detected_lang = self._detect_with_langdetect(text)
+        
+        if self.cache is not None:
+            self.cache.set(key, detected_lang)
+        return detected_lang
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Büyük/küçük harf ve boşluk farklarını yok say"""
+        return " ".join(text.casefold().split())
+    
+    @staticmethod
+    def detect_by_script(text: str) -> Optional[str]:
+        """
+        Yazı sistemi ve harf kümesinden kesin olan dili bul
+        
+        Kana -> ja, Hangul -> ko, yalnızca Han -> zh, Kiril -> ru (Rusça'da
+        olmayan Kiril harfleri yoksa), ğ/ı/ş içeren Latin metin -> tr (başka
+        dillere özgü harf yoksa). Belirsizse None.
+        
+        Args:
+            text: Küçük harfe çevrilmiş metin
             
+        Returns:
+            Dil kodu veya None
+        """
+        scripts = {}
+        latin = 0
+        turkish = False
+        for char in text:
+            if not char.isalpha():
+                continue
+            script = _script(char)
+            if script:
+                scripts[script] = scripts.get(script, 0) + 1
+            else:
+                latin += 1
+                if char in TURKISH_LETTERS:
+                    turkish = True
+                elif char in NON_TURKISH_LATIN_LETTERS:
+                    return None
+        
+        if scripts:
+            # Yazı sistemi harflerin çoğunluğunu oluşturmuyorsa (karışık metin) karar verme
+            if sum(scripts.values()) < latin:
+                return None
+            if 'kana' in scripts:
+                return 'ja'
+            if 'hangul' in scripts:
+                return 'ko'
+            if 'han' in scripts:
+                return 'zh'
+            if any(char in NON_RUSSIAN_CYRILLIC_LETTERS for char in text):
+                return None
+            return 'ru'
+        
+        return 'tr' if turkish else None
+    
+    def _detect_with_langdetect(self, text: str, quiet: bool = False) -> str:
+        """langdetect ile algıla, desteklenmeyen dillerde varsayılanı döndür (quiet ise log yazmaz)"""
+        try:
             # LangDetect ile dil algıla
             detected_lang = detect(text)
             
             # Desteklenen dil mi kontrol et
             if detected_lang in self.supported_languages:
-                logger.info(f"Dil algılandı: {detected_lang} ({self.supported_languages[detected_lang]})")
+                if not quiet:
+                    logger.debug(f"Dil algılandı: {detected_lang} ({self.supported_languages[detected_lang]})")
                 return detected_lang
             else:
-                logger.warning(f"Desteklenmeyen dil algılandı: {detected_lang}, varsayılan dil kullanılıyor")
+                if not quiet:
+                    logger.warning(f"Desteklenmeyen dil algılandı: {detected_lang}, varsayılan dil kullanılıyor")
                 return 'en'
                 
         except LangDetectException as e:
-            logger.error(f"Dil algılama hatası: {str(e)}")
+            if not quiet:
+                logger.error(f"Dil algılama hatası: {str(e)}")
             return 'en'
         except Exception as e:
-            logger.error(f"Beklenmeyen dil algılama hatası: {str(e)}")
+            if not quiet:
+                logger.error(f"Beklenmeyen dil algılama hatası: {str(e)}")
             return 'en'
     
+    @staticmethod
+    def create_process_pool(workers: Optional[int] = None, seed: int = 0) -> ProcessPoolExecutor:
+        """
+        Toplu algılama için process havuzu oluştur
+        
+        Her worker aynı langdetect seed'iyle başlar; sonuç metnin hangi worker'a
+        düştüğünden bağımsızdır. Linux'ta worker'lar fork ile ilk işte açılır,
+        bu yüzden havuz thread açan kütüphaneler (model) yüklenmeden önce
+        oluşturulup hemen başlatılır.
+        
+        Args:
+            workers: Worker sayısı (varsayılan: settings.LANGUAGE_DETECTION_WORKERS, 0 ise CPU sayısı)
+            seed: langdetect seed'i
+        """
+        workers = workers or settings.LANGUAGE_DETECTION_WORKERS or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(seed,))
+        executor.submit(_detect_chunk, []).result()
+        logger.info(f"Dil algılama process havuzu oluşturuldu ({workers} worker)")
+        return executor
+    
+    def detect_languages_bulk(
+        self,
+        texts: List[str],
+        executor: Optional[ProcessPoolExecutor] = None,
+        chunk_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        Çok sayıda metnin dilini toplu algıla (ingestion için)
+        
+        Metinler normalize edilmiş halleriyle tekilleştirilir. Yazı sistemiyle
+        çözülenler yerinde, kalanlar parçalar halinde process havuzunda
+        langdetect'e gönderilir. Öğe başına log yazılmaz ve önbellek
+        kullanılmaz (milyonlarca tekil metin önbelleği boşuna döndürür).
+        
+        Args:
+            texts: Metin listesi
+            executor: create_process_pool ile oluşturulmuş havuz (None ise bu process'te algılanır)
+            chunk_size: Worker'a tek seferde gönderilen metin sayısı
+            
+        Returns:
+            Girdi sırasıyla dil kodları
+        """
+        chunk_size = chunk_size or settings.LANGUAGE_DETECTION_CHUNK_SIZE
+        keys = [self.normalize_text(text) if text else '' for text in texts]
+        
+        # normalize metin -> dil; langdetect bekleyenler için ilk orijinal metin
+        languages = {'': 'en'}
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key in languages or key in pending:
+                continue
+            detected_lang = self.detect_by_script(key)
+            if detected_lang:
+                languages[key] = detected_lang
+            else:
+                pending[key] = text
+        self.fast_path_hits += len(languages) - 1
+        
+        pending_keys = list(pending)
+        pending_texts = list(pending.values())
+        chunks = [pending_texts[start:start + chunk_size] for start in range(0, len(pending_texts), chunk_size)]
+        if executor is None or len(chunks) <= 1:
+            # Tek parçada process'ler arası kopyalama kazançtan pahalı
+            results = [[self._detect_with_langdetect(text, quiet=True) for text in chunk] for chunk in chunks]
+        else:
+            results = executor.map(_detect_chunk, chunks)
+        for start, detected in zip(range(0, len(pending_keys), chunk_size), results):
+            languages.update(zip(pending_keys[start:start + chunk_size], detected))
+        
+        logger.debug(
+            f"Toplu dil algılama: {len(texts)} metin, {len(languages) - 1} farklı, "
+            f"{len(pending)} langdetect"
+        )
+        return [languages[key] for key in keys]
+    
+    def stats(self) -> dict:
+        """Önbellek ve hızlı yol istatistikleri"""
+        return {
+            **(self.cache.stats() if self.cache is not None else {}),
+            "fast_path_hits": self.fast_path_hits
+        }
+    
     def get_language_name(self, lang_code: str) -> str:
         """
         Dil kodundan dil adını getir
@@ -98,7 +306,7 @@ class LanguageDetector:
     
     def detect_multiple_languages(self, texts: list) -> list:
         """
-        Birden fazla metnin dilini algıla
+        Birden fazla metnin dilini algıla (bu process'te, bkz. detect_languages_bulk)
         
         Args:
             texts: Metin listesi
@@ -106,8 +314,5 @@ class LanguageDetector:
         Returns:
             Dil kodları listesi
         """
-        results = []
-        for text in texts:
-            lang_code = self.detect_language(text)
-            results.append(lang_code)
-        return results 
\ No newline at end of file
+        return self.detect_languages_bulk(texts)
+ 
\ No newline at end of file
@@ -13,6 +13,7 @@ interface AppResult {
   price?: string;
   developer: string;
   similarity_score: number;
+  lexical_score?: number | null;
 }
 
 interface SearchResponse {
@@ -179,7 +180,11 @@ const SearchPage: React.FC = () => {
                   <span className="text-green-600 font-medium">{app.price}</span>
                   <div className="flex items-center space-x-1 text-xs text-gray-500">
                     <Globe className="w-3 h-3" />
-                    <span>%{Math.round(app.similarity_score * 100)} eşleşme</span>
+                    <span>
+                      {app.similarity_score > 0 || app.lexical_score == null
+                        ? `%${Math.round(app.similarity_score * 100)} eşleşme`
+                        : 'ad eşleşmesi'}
+                    </span>
                   </div>
                 </div>
               </div>
@@ -0,0 +1,91 @@
+"""
+AppSense ANN Benchmark Scripti
+IVF index'inin recall@k ve gecikme (p50/p99) değerlerini tam aramaya karşı ölçer
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from models.vectorstore.local_store import LocalVectorStore
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def make_catalogue(size, dimension, clusters, rng):
+    """Kümelenmiş sentetik embedding'ler üret (gerçek katalog dağılımına yakın)"""
+    centers = rng.normal(size=(clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, size)
+    vectors = centers[labels] + 0.35 * rng.normal(size=(size, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+async def build_store(vectors, batch_size=10000):
+    """Vektörleri IVF modundaki yerel store'a ekle"""
+    store = LocalVectorStore(path=tempfile.mkdtemp(), dimension=vectors.shape[1], index_type="ivf")
+    for start in range(0, len(vectors), batch_size):
+        batch = vectors[start:start + batch_size]
+        await store.upsert_apps([
+            {'id': f'app-{start + i}', 'category': 'Bench', 'embedding': vector}
+            for i, vector in enumerate(batch)
+        ])
+    if not (await store.get_index_stats())['ann_trained']:
+        store.train_index()
+    return store
+
+async def measure(store, queries, k, **search_kwargs):
+    """Her sorgu için sonuç ID'lerini ve gecikmeyi (ms) topla"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        matches = await store.search(query, top_k=k, **search_kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({m['id'] for m in matches})
+    return results, np.array(latencies)
+
+async def run(args):
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'size':>9} {'mode':>12} {'recall@' + str(args.k):>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for size in args.sizes:
+        vectors = make_catalogue(size, args.dimension, args.clusters, rng)
+        queries = make_catalogue(args.queries, args.dimension, args.clusters, rng)
+
+        build_start = time.perf_counter()
+        store = await build_store(vectors)
+        build_time = time.perf_counter() - build_start
+        stats = await store.get_index_stats()
+        logger.warning(f"{size} vektör: index {build_time:.1f} sn'de kuruldu, nlist={stats['ann_nlist']}")
+
+        exact, latencies = await measure(store, queries, args.k, exact=True)
+        print(f"{size:>9} {'exact':>12} {1.0:>10.3f} {np.percentile(latencies, 50):>9.3f} {np.percentile(latencies, 99):>9.3f}")
+
+        for nprobe in args.nprobe:
+            approx, latencies = await measure(store, queries, args.k, nprobe=nprobe)
+            recall = np.mean([len(a & e) / len(e) for a, e in zip(approx, exact)])
+            print(
+                f"{size:>9} {'nprobe=' + str(nprobe):>12} {recall:>10.3f} "
+                f"{np.percentile(latencies, 50):>9.3f} {np.percentile(latencies, 99):>9.3f}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF index recall/gecikme benchmark'ı")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help="Katalog boyutları")
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 16, 64], help="Denenecek nprobe değerleri")
+    parser.add_argument('--queries', type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument('--k', type=int, default=10, help="Recall@k için k")
+    parser.add_argument('--dimension', type=int, default=384, help="Embedding boyutu")
+    parser.add_argument('--clusters', type=int, default=200, help="Sentetik verideki küme sayısı")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+AppSense Eşzamanlılık Benchmark Scripti
+Çalışan bir API'ye artan sayıda eşzamanlı istemciyle istek gönderip
+throughput ve gecikme değerlerini raporlar
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import aiohttp
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERIES = [
+    "fitness tracker", "budget app", "meditation", "language learning",
+    "photo editor", "spor uygulaması", "bütçe takibi", "offline maps",
+    "recipe app", "habit tracker", "podcast player", "sınav hazırlık"
+]
+
+async def client_worker(session, url, queries, deadline, latencies, errors, index):
+    """Süre dolana kadar ardışık istek gönderen istemci"""
+    i = index
+    while time.perf_counter() < deadline:
+        params = {'query': queries[i % len(queries)], 'max_results': 10}
+        i += 1
+        start = time.perf_counter()
+        try:
+            async with session.get(url, params=params) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def run_level(url, concurrency, duration, queries):
+    """Verilen eşzamanlılık seviyesinde benchmark çalıştır"""
+    latencies, errors = [], []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            client_worker(session, url, queries, deadline, latencies, errors, i)
+            for i in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+async def run(args):
+    url = args.base_url.rstrip('/') + args.path
+    print(f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        latencies, errors, elapsed = await run_level(url, concurrency, args.duration, DEFAULT_QUERIES)
+        if latencies:
+            p50, p99 = np.percentile(latencies, 50), np.percentile(latencies, 99)
+        else:
+            p50 = p99 = float('nan')
+        print(
+            f"{concurrency:>8} {len(latencies):>9} {len(errors):>7} "
+            f"{len(latencies) / elapsed:>8.1f} {p50:>9.1f} {p99:>9.1f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="API eşzamanlılık benchmark'ı")
+    parser.add_argument('--base-url', default='http://localhost:8000', help="API adresi")
+    parser.add_argument('--path', default='/api/v1/search', help="Test edilecek endpoint")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--duration', type=float, default=10.0, help="Seviye başına süre (saniye)")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+AppSense Embedding Backend Benchmark Scripti
+PyTorch, ONNX float32 ve ONNX int8 backend'lerinin tek sorgu gecikmesini
+ve batch throughput'unu CPU üzerinde karşılaştırır
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from core.config import settings
+from models.embeddings.onnx_encoder import OnnxSentenceEncoder
+from check_onnx_parity import PARITY_QUERIES
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def load_backends(args):
+    backends = []
+    if 'torch' in args.backends:
+        import torch
+        from sentence_transformers import SentenceTransformer
+        if args.threads:
+            torch.set_num_threads(args.threads)
+        backends.append(('torch', SentenceTransformer(settings.EMBEDDING_MODEL, device='cpu')))
+    if 'onnx' in args.backends:
+        backends.append(('onnx float32', OnnxSentenceEncoder(args.onnx_path, quantized=False, num_threads=args.threads)))
+    if 'onnx-int8' in args.backends:
+        backends.append(('onnx int8', OnnxSentenceEncoder(args.onnx_path, quantized=True, num_threads=args.threads)))
+    return backends
+
+def single_query_latency(model, queries, iterations, warmup):
+    """Tek sorgu encode gecikmeleri (ms)"""
+    for i in range(warmup):
+        model.encode(queries[i % len(queries)])
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        model.encode(queries[i % len(queries)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return np.array(latencies)
+
+def batch_throughput(model, texts, batch_size):
+    """Toplu encode throughput'u (metin/sn)"""
+    model.encode(texts[:batch_size], batch_size=batch_size)
+    started = time.perf_counter()
+    model.encode(texts, batch_size=batch_size)
+    return len(texts) / (time.perf_counter() - started)
+
+def make_documents(count, rng):
+    """prepare_embeddings.py açıklamalarına benzer doküman metinleri"""
+    words = ['Fitness', 'Budget', 'Photo', 'Editor', 'Music', 'Spor', 'Koçu', 'Daily', 'Pro', 'Lite']
+    categories = ['GAME', 'FINANCE', 'HEALTH_AND_FITNESS', 'PHOTOGRAPHY', 'MUSIC_AND_AUDIO']
+    return [
+        f"App: {' '.join(rng.choice(words, 3))} | Category: {rng.choice(categories)} | "
+        f"Rating: {rng.uniform(1, 5):.1f} | Reviews: {rng.integers(0, 100000)} | "
+        f"Installs: 1,000,000+ | Type: Free | Price: 0"
+        for _ in range(count)
+    ]
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    documents = make_documents(args.documents, rng)
+
+    print(f"{'backend':<14} {'p50 ms':>8} {'p99 ms':>8} {'ort ms':>8} {'batch metin/sn':>15}")
+    baseline = None
+    for name, model in load_backends(args):
+        latencies = single_query_latency(model, PARITY_QUERIES, args.iterations, args.warmup)
+        throughput = batch_throughput(model, documents, args.batch_size)
+        baseline = baseline or (np.median(latencies), throughput)
+        print(
+            f"{name:<14} {np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 99):>8.2f} "
+            f"{latencies.mean():>8.2f} {throughput:>15.0f}   "
+            f"(gecikme {baseline[0] / np.median(latencies):.2f}x, throughput {throughput / baseline[1]:.2f}x)"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend'leri gecikme/throughput benchmark'ı")
+    parser.add_argument('--backends', nargs='+', default=['torch', 'onnx', 'onnx-int8'], choices=['torch', 'onnx', 'onnx-int8'])
+    parser.add_argument('--onnx-path', default=settings.EMBEDDING_ONNX_PATH)
+    parser.add_argument('--iterations', type=int, default=200, help="Tek sorgu ölçüm sayısı")
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--documents', type=int, default=2000, help="Batch throughput için doküman sayısı")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--threads', type=int, default=0, help="0 ise kütüphane varsayılanı")
+    parser.add_argument('--seed', type=int, default=0)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
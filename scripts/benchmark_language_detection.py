@@ -0,0 +1,160 @@
+"""
+AppSense Dil Algılama Benchmark Scripti
+Kısa arama sorgularından oluşan bir derlemde langdetect'i, LanguageDetector'ın
+yazı sistemi hızlı yolunu ve LRU önbelleğini karşılaştırır; --bulk-size ile
+ingestion'daki toplu algılamayı (tekilleştirme + process havuzu) döngüyle kıyaslar
+"""
+
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+from langdetect import DetectorFactory, detect
+from langdetect.lang_detect_exception import LangDetectException
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from core.config import settings
+from utils.language_detector import LanguageDetector
+
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# (sorgu, beklenen dil) - gerçek arama trafiğine benzer kısa sorgular
+SHORT_QUERIES = [
+    ("fitness tracker", "en"), ("budget app", "en"), ("offline maps", "en"),
+    ("photo editor", "en"), ("meditation", "en"), ("habit tracker", "en"),
+    ("podcast player", "en"), ("recipe app", "en"), ("language learning", "en"),
+    ("spor uygulaması", "tr"), ("bütçe takibi", "tr"), ("sınav hazırlık", "tr"),
+    ("yemek tarifi", "tr"), ("ücretsiz müzik dinleme", "tr"), ("kilo verme programı", "tr"),
+    ("çocuk oyunları", "tr"), ("hava durumu", "tr"), ("şifre yöneticisi", "tr"),
+    ("namaz vakitleri", "tr"), ("ingilizce öğren", "tr"), ("fotoğraf düzenleme", "tr"),
+    ("приложение для бега", "ru"), ("учет расходов", "ru"), ("карты офлайн", "ru"),
+    ("家計簿アプリ", "ja"), ("ダイエット", "ja"), ("天气预报", "zh"), ("记账", "zh"),
+    ("운동 앱", "ko"), ("가계부", "ko"),
+    ("Fitness-Tracker für Läufer", "de"), ("application météo", "fr"),
+    ("aplicación de recetas", "es"), ("app di meditazione", "it"),
+]
+
+def raw_langdetect(text):
+    try:
+        return detect(text)
+    except LangDetectException:
+        return 'en'
+
+def make_corpus(size, rng):
+    """Zipf dağılımıyla tekrarlanan sorgular (popüler sorgular sık gelir)"""
+    # Popülerlik sırası dilden bağımsız olsun
+    order = rng.permutation(len(SHORT_QUERIES))
+    ranks = np.minimum(rng.zipf(1.3, size), len(SHORT_QUERIES)) - 1
+    return [SHORT_QUERIES[order[rank]] for rank in ranks]
+
+def measure(detect_fn, corpus):
+    """Sorgu başına süreler (mikrosaniye) ve sonuçlar"""
+    latencies, results = [], []
+    for text, _ in corpus:
+        started = time.perf_counter()
+        results.append(detect_fn(text))
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return np.array(latencies), results
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    corpus = make_corpus(args.queries, rng)
+    unique = list(dict.fromkeys(SHORT_QUERIES))
+
+    # Önce langdetect'in seed olmadan aynı sorgu için farklı sonuç verip vermediğini göster
+    DetectorFactory.seed = None
+    unstable = sum(
+        1 for text, _ in unique
+        if len({raw_langdetect(text) for _ in range(args.repeats)}) > 1
+    )
+    print(f"Seed olmadan tutarsız sonuç veren sorgu: {unstable}/{len(unique)} ({args.repeats} tekrar)")
+
+    no_cache = LanguageDetector(cache_size=0)
+    cached = LanguageDetector(cache_size=args.cache_size)
+    DetectorFactory.seed = 0
+    modes = [
+        ("langdetect", raw_langdetect),
+        ("hızlı yol", no_cache.detect_language),
+        ("hızlı yol + LRU", cached.detect_language),
+    ]
+
+    print(f"{len(corpus)} sorgu ({len(unique)} farklı)")
+    print(f"{'mod':<16} {'ort µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'sorgu/sn':>10} {'doğruluk':>9}")
+    for name, detect_fn in modes:
+        latencies, results = measure(detect_fn, corpus)
+        accuracy = np.mean([
+            result.split('-')[0] == expected for result, (_, expected) in zip(results, corpus)
+        ])
+        print(
+            f"{name:<16} {latencies.mean():>9.1f} {np.percentile(latencies, 50):>9.1f} "
+            f"{np.percentile(latencies, 99):>9.1f} {1e6 / latencies.mean():>10.0f} {accuracy:>9.3f}"
+        )
+
+    # Hızlı yolla çözülebilen sorgularda langdetect'e karşı kazanç (önbelleksiz)
+    fast_path = [
+        (text, expected) for text, expected in unique
+        if LanguageDetector.detect_by_script(LanguageDetector.normalize_text(text))
+    ]
+    subset = fast_path * args.repeats
+    langdetect_latencies, _ = measure(raw_langdetect, subset)
+    fast_latencies, _ = measure(no_cache.detect_language, subset)
+    print(
+        f"Hızlı yolla çözülen farklı sorgu: {len(fast_path)}/{len(unique)} - "
+        f"bu sorgularda langdetect {langdetect_latencies.mean():.1f} µs, hızlı yol {fast_latencies.mean():.1f} µs"
+    )
+    print(f"Önbellek: {cached.stats()}")
+
+    if args.bulk_size:
+        run_bulk(args, rng)
+
+def make_app_names(size, rng):
+    """Tekrarlı uygulama adları (aynı ad farklı kategorilerde tekrar eder)"""
+    words = [text for text, _ in SHORT_QUERIES]
+    unique = [f"{words[a]} {words[b]} {n}" for a, b, n in rng.integers([0, 0, 0], [len(words), len(words), 100], (size // 2, 3))]
+    return [unique[i] for i in rng.integers(0, len(unique), size)]
+
+def run_bulk(args, rng):
+    names = make_app_names(args.bulk_size, rng)
+    detector = LanguageDetector(cache_size=0)
+    print(f"\nToplu algılama: {len(names)} ad ({len(set(names))} farklı)")
+
+    started = time.perf_counter()
+    expected = [detector.detect_language(name) for name in names]
+    loop_seconds = time.perf_counter() - started
+    print(f"{'döngü':<24} {loop_seconds:>8.2f} sn {len(names) / loop_seconds:>10.0f} ad/sn")
+
+    started = time.perf_counter()
+    results = detector.detect_languages_bulk(names)
+    seconds = time.perf_counter() - started
+    print(f"{'toplu (tek process)':<24} {seconds:>8.2f} sn {len(names) / seconds:>10.0f} ad/sn  aynı sonuç: {results == expected}")
+
+    pool = LanguageDetector.create_process_pool(args.workers)
+    try:
+        started = time.perf_counter()
+        results = detector.detect_languages_bulk(names, executor=pool, chunk_size=args.chunk_size)
+        seconds = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+    label = f"toplu ({args.workers or settings.LANGUAGE_DETECTION_WORKERS or os.cpu_count()} process)"
+    print(f"{label:<24} {seconds:>8.2f} sn {len(names) / seconds:>10.0f} ad/sn  aynı sonuç: {results == expected}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kısa sorgularda dil algılama benchmark'ı")
+    parser.add_argument('--queries', type=int, default=5000, help="Derlemdeki sorgu sayısı")
+    parser.add_argument('--cache-size', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=10, help="Tutarlılık kontrolündeki tekrar sayısı")
+    parser.add_argument('--bulk-size', type=int, default=0, help="Toplu algılama için ad sayısı (0 ise atlanır)")
+    parser.add_argument('--workers', type=int, default=0, help="Toplu algılama process sayısı (0 ise CPU sayısı)")
+    parser.add_argument('--chunk-size', type=int, default=None, help="Worker'a gönderilen parça boyutu")
+    parser.add_argument('--seed', type=int, default=0)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
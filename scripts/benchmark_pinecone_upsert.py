@@ -0,0 +1,281 @@
+"""
+AppSense Pinecone Upsert Benchmark Scripti
+PineconeStore.upsert_apps'i, Pinecone'un istek boyutu limitini ve gecikmesini
+taklit eden yerel bir HTTP sunucusuna karşı farklı batch stratejileriyle ölçer
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import logging
+import multiprocessing
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from core.config import settings
+from core.executors import shutdown_executors
+from models.vectorstore.pinecone_store import PineconeStore
+
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+# Limit aşımı stratejisinin beklenen hatalarını tabloda gösteriyoruz
+logging.getLogger('models.vectorstore.pinecone_store').setLevel(logging.CRITICAL)
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Pinecone /vectors/upsert endpoint'ini taklit eden sunucu
+
+    Ayrı bir süreçte çalışır; böylece sunucunun JSON işleme maliyeti
+    ölçülen istemciyle aynı GIL'i paylaşmaz.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port, max_bytes, latency_ms, ms_per_mb, failure_rate):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.max_bytes = max_bytes
+        self.latency_ms = latency_ms
+        self.ms_per_mb = ms_per_mb
+        self.failure_rate = failure_rate
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.too_large = 0
+        self.unavailable = 0
+        self.upserted = 0
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'too_large': self.too_large,
+            'unavailable': self.unavailable,
+            'upserted': self.upserted
+        }
+
+def serve(port, max_bytes, latency_ms, ms_per_mb, failure_rate, seed):
+    """Sunucu sürecinin giriş noktası"""
+    random.seed(seed)
+    StandInServer(port, max_bytes, latency_ms, ms_per_mb, failure_rate).serve_forever()
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        # Benchmark sayaçları
+        self._reply(200, self.server.stats())
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if self.path == '/reset':
+            server.reset()
+            return self._reply(200, {})
+        with server.lock:
+            server.requests += 1
+
+        if length > server.max_bytes:
+            with server.lock:
+                server.too_large += 1
+            return self._reply(413, {'message': f'Request size {length} exceeds the maximum of {server.max_bytes}'})
+
+        # Sabit gecikme + gövde boyutuyla orantılı aktarım süresi
+        time.sleep((server.latency_ms + server.ms_per_mb * length / 1_000_000) / 1000)
+        if random.random() < server.failure_rate:
+            with server.lock:
+                server.unavailable += 1
+            return self._reply(503, {'message': 'Service unavailable'})
+
+        count = body.count(b'"values":')
+        with server.lock:
+            server.upserted += count
+        self._reply(200, {'upsertedCount': count})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInError(Exception):
+    """Pinecone istemci hatası gibi HTTP durum kodunu taşır"""
+
+    def __init__(self, status, message):
+        super().__init__(f"({status}) {message}")
+        self.status = status
+
+class StandInIndex:
+    """pinecone.Index.upsert ile aynı çağrı şekline sahip basit REST istemcisi"""
+
+    def __init__(self, port):
+        self.port = port
+        self._local = threading.local()
+
+    def _connection(self):
+        # Thread başına kalıcı (keep-alive) bağlantı
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        return connection
+
+    def upsert(self, vectors):
+        body = json.dumps({'vectors': vectors}, separators=(',', ':')).encode('utf-8')
+        connection = self._connection()
+        connection.request('POST', '/vectors/upsert', body=body, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        payload = json.loads(response.read())
+        if response.status != 200:
+            raise StandInError(response.status, payload.get('message', ''))
+        return payload
+
+def make_apps(count, dimension, description_length, rng):
+    """Sentetik uygulamalar (embedding + gerçekçi uzunlukta açıklama)"""
+    vectors = rng.normal(size=(count, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    words = ['fitness', 'budget', 'photo', 'music', 'game', 'travel', 'social', 'health', 'finance']
+    apps = []
+    for i, vector in enumerate(vectors):
+        description = ' '.join(rng.choice(words, description_length // 7))[:description_length]
+        apps.append({
+            'id': f'bench-app-{i}',
+            'name': f'Bench App {i}',
+            'description': description,
+            'category': words[i % len(words)].upper(),
+            'rating': 4.2,
+            'review_count': 1000 + i,
+            'download_count': '1,000,000+',
+            'price': '0',
+            'developer': 'Unknown',
+            'embedding': vector.tolist()
+        })
+    return apps
+
+async def run_strategy(store, apps, request_rows, **config):
+    """upsert_apps'i verilen ayarlarla, request_rows'luk çağrılarla çalıştır"""
+    for name, value in config.items():
+        setattr(store, name, value)
+
+    started = time.perf_counter()
+    results = []
+    for start in range(0, len(apps), request_rows):
+        results.extend(await store.upsert_apps(apps[start:start + request_rows]))
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(len(result['ids']) for result in results if result['success'])
+    return {
+        'elapsed': elapsed,
+        'rows_per_second': succeeded / elapsed if elapsed else 0.0,
+        'batches': len(results),
+        'failed_batches': sum(1 for result in results if not result['success']),
+        'retries': sum(result['attempts'] - 1 for result in results),
+        'avg_batch_kb': np.mean([result['size_bytes'] for result in results]) / 1024 if results else 0.0,
+        'uploaded': succeeded
+    }
+
+def server_request(port, method, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request(method, path, body=b'' if method == 'POST' else None)
+    payload = json.loads(connection.getresponse().read())
+    connection.close()
+    return payload
+
+def start_server(args):
+    """Sunucu sürecini başlat ve hazır olmasını bekle"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    process = multiprocessing.Process(
+        target=serve,
+        args=(port, args.max_bytes, args.latency_ms, args.ms_per_mb, args.failure_rate, args.seed),
+        daemon=True
+    )
+    process.start()
+    for _ in range(100):
+        try:
+            server_request(port, 'GET', '/stats')
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("Stand-in sunucu başlatılamadı")
+
+async def run(args):
+    rng = np.random.default_rng(args.seed)
+    apps = make_apps(args.rows, args.dimension, args.description_length, rng)
+
+    server, port = start_server(args)
+    store = PineconeStore()
+    store.index = StandInIndex(port)
+
+    unlimited = 10 ** 12
+    strategies = [
+        # Eski davranış: sabit 100 satırlık batch'ler, sırayla, tekrar denemesiz
+        ("sabit 100, sıralı", len(apps), dict(
+            upsert_max_bytes=unlimited, upsert_max_vectors=100, upsert_concurrency=1, upsert_retries=0)),
+        # Satır sayısını tahminle büyütmek limit aşımına yol açar
+        (f"sabit {args.fixed_rows}, sıralı", len(apps), dict(
+            upsert_max_bytes=unlimited, upsert_max_vectors=args.fixed_rows, upsert_concurrency=1, upsert_retries=0)),
+        ("boyuta göre, sıralı", len(apps), dict(
+            upsert_max_bytes=settings.PINECONE_UPSERT_MAX_BYTES, upsert_max_vectors=1000,
+            upsert_concurrency=1, upsert_retries=args.retries)),
+    ] + [
+        (f"boyuta göre, eşzamanlı={concurrency}", len(apps), dict(
+            upsert_max_bytes=settings.PINECONE_UPSERT_MAX_BYTES, upsert_max_vectors=1000,
+            upsert_concurrency=concurrency, upsert_retries=args.retries))
+        for concurrency in args.concurrency
+    ]
+
+    print(
+        f"{args.rows} vektör, boyut {args.dimension}, limit {args.max_bytes} bayt, "
+        f"gecikme {args.latency_ms} ms + {args.ms_per_mb} ms/MB, hata oranı {args.failure_rate}"
+    )
+    print(f"{'strateji':<26} {'süre sn':>8} {'satır/sn':>9} {'batch':>6} {'ort KB':>7} {'başarısız':>9} {'tekrar':>6} {'413':>4} {'yüklenen':>9}")
+    for name, request_rows, config in strategies:
+        server_request(port, 'POST', '/reset')
+        config['upsert_backoff'] = args.backoff
+        result = await run_strategy(store, apps, request_rows, **config)
+        server_stats = server_request(port, 'GET', '/stats')
+        print(
+            f"{name:<26} {result['elapsed']:>8.2f} {result['rows_per_second']:>9.0f} {result['batches']:>6} "
+            f"{result['avg_batch_kb']:>7.0f} {result['failed_batches']:>9} {result['retries']:>6} "
+            f"{server_stats['too_large']:>4} {result['uploaded']:>9}"
+        )
+
+    server.terminate()
+    shutdown_executors()
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinecone upsert batch stratejisi benchmark'ı")
+    parser.add_argument('--rows', type=int, default=20000, help="Yüklenecek vektör sayısı")
+    parser.add_argument('--dimension', type=int, default=384, help="Embedding boyutu")
+    parser.add_argument('--description-length', type=int, default=600, help="Açıklama uzunluğu (karakter)")
+    parser.add_argument('--max-bytes', type=int, default=2 * 1024 * 1024, help="Sunucunun istek boyutu limiti")
+    parser.add_argument('--latency-ms', type=float, default=60.0, help="İstek başına sabit gecikme")
+    parser.add_argument('--ms-per-mb', type=float, default=80.0, help="MB başına aktarım gecikmesi")
+    parser.add_argument('--failure-rate', type=float, default=0.02, help="Geçici 503 hatası olasılığı")
+    parser.add_argument('--fixed-rows', type=int, default=300, help="Limit aşımını göstermek için sabit batch boyutu")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--backoff', type=float, default=0.05, help="İlk tekrar bekleme süresi (saniye)")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+AppSense Veri Hazırlama Benchmark Scripti
+prepare_embeddings.py'deki sütun bazlı hazırlığı eski satır bazlı
+(apply/iterrows) uygulamayla sentetik veri üzerinde karşılaştırır
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+
+from prepare_embeddings import build_apps_data, prepare_app_data
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# --- Eski satır bazlı uygulama (karşılaştırma için) ---
+
+def legacy_clean_text(text):
+    if pd.isna(text) or text == '':
+        return ''
+    text = re.sub(r'<[^>]+>', '', str(text))
+    text = re.sub(r'[^\w\s\.\,\!\?\-]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def legacy_prepare_app_data(df):
+    df = df.dropna(subset=['App', 'Category']).copy()
+    df['App'] = df['App'].apply(legacy_clean_text)
+    df['Category'] = df['Category'].apply(legacy_clean_text)
+
+    def create_description(row):
+        desc_parts = []
+        if row['App']:
+            desc_parts.append(f"App: {row['App']}")
+        if row['Category']:
+            desc_parts.append(f"Category: {row['Category']}")
+        if pd.notna(row['Rating']):
+            desc_parts.append(f"Rating: {row['Rating']}")
+        if pd.notna(row['Reviews']) and row['Reviews'] > 0:
+            desc_parts.append(f"Reviews: {row['Reviews']}")
+        if pd.notna(row['Installs']):
+            desc_parts.append(f"Installs: {row['Installs']}")
+        if pd.notna(row['Type']):
+            desc_parts.append(f"Type: {row['Type']}")
+        if pd.notna(row['Price']):
+            desc_parts.append(f"Price: {row['Price']}")
+        return ' | '.join(desc_parts)
+
+    df['description'] = df.apply(create_description, axis=1)
+    stable_key = (df['App'] + '\x1f' + df['Category']).map(
+        lambda key: hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+    )
+    df['id'] = df['App'].str.lower().str.replace(' ', '-') + '-' + stable_key
+    return df
+
+def legacy_build_apps_data(df, embeddings):
+    apps_data = []
+    for i, (source_row, row) in enumerate(df.iterrows()):
+        rating = row.get('Rating')
+        if pd.isna(rating):
+            rating = 0.0
+        review_count = row.get('Reviews')
+        if pd.isna(review_count):
+            review_count = 0
+        download_count = row.get('Installs')
+        if pd.isna(download_count):
+            download_count = '0'
+        price = row.get('Price')
+        if pd.isna(price):
+            price = 'Ücretsiz'
+        app_id = re.sub(r'[^a-zA-Z0-9\-_]', '-', str(row['id']))
+        app_id = re.sub(r'-+', '-', app_id).strip('-')
+        apps_data.append({
+            'id': app_id,
+            'name': str(row['App']),
+            'description': str(row['description']),
+            'category': str(row['Category']),
+            'rating': float(rating),
+            'review_count': int(review_count),
+            'download_count': str(download_count),
+            'price': str(price),
+            'developer': 'Unknown',
+            'source_row': int(source_row),
+            'embedding': embeddings[i] if embeddings else None
+        })
+    return apps_data
+
+# --- Sentetik veri ---
+
+def make_dataset(rows, rng):
+    """Google Play CSV'sine benzer sentetik veri (HTML, özel karakter ve eksik değerlerle)"""
+    words = np.array(['Fitness', 'Budget', 'Photo', 'Editor', 'Music', 'Spor', 'Koçu', 'Daily', 'Pro', 'Lite'])
+    names = (
+        pd.Series(words[rng.integers(0, len(words), rows)]) + ' '
+        + pd.Series(words[rng.integers(0, len(words), rows)]) + ' '
+        + pd.Series(rng.integers(0, 1_000_000, rows)).astype(str)
+    )
+    decorations = np.array(['', ' <b>new</b>', ' & friends', '  ™', ' (beta)!'])
+    names = names + decorations[rng.integers(0, len(decorations), rows)]
+    names = names.where(rng.random(rows) > 0.01)
+
+    ratings = pd.Series(rng.uniform(1, 5, rows).round(1)).where(rng.random(rows) > 0.1)
+    categories = np.array(['GAME', 'FINANCE', 'HEALTH_AND_FITNESS', 'PHOTOGRAPHY', 'MUSIC_AND_AUDIO'])
+    return pd.DataFrame({
+        'App': names,
+        'Category': categories[rng.integers(0, len(categories), rows)],
+        'Rating': ratings,
+        'Reviews': rng.integers(0, 100_000, rows),
+        'Installs': np.array(['1,000+', '10,000+', '1,000,000+'])[rng.integers(0, 3, rows)],
+        'Type': pd.Series(np.array(['Free', 'Paid'])[rng.integers(0, 2, rows)]).where(rng.random(rows) > 0.02),
+        'Price': np.array(['0', '$0.99', '$4.99'])[rng.integers(0, 3, rows)],
+    })
+
+def measure(prepare, build, df):
+    """(hazırlama süresi, kayıt oluşturma süresi, kayıtlar)"""
+    started = time.perf_counter()
+    prepared = prepare(df)
+    prepare_time = time.perf_counter() - started
+    started = time.perf_counter()
+    records = build(prepared, None)
+    return prepare_time, time.perf_counter() - started, records
+
+def check_equal(df):
+    """Yeni uygulamanın eski uygulamayla aynı kayıtları ürettiğini doğrula"""
+    legacy = legacy_build_apps_data(legacy_prepare_app_data(df), None)
+    current = build_apps_data(prepare_app_data(df), None)
+    if legacy != current:
+        mismatch = next(i for i, (a, b) in enumerate(zip(legacy, current)) if a != b) if len(legacy) == len(current) else None
+        raise SystemExit(f"Çıktılar farklı (ilk fark: {mismatch})\n{legacy[mismatch] if mismatch is not None else ''}\n{current[mismatch] if mismatch is not None else ''}")
+    print(f"Çıktılar eşit ({len(current)} kayıt)")
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    check_equal(make_dataset(args.check_rows, rng))
+
+    print(f"{'satır':>9} {'uygulama':>10} {'hazırlama sn':>13} {'kayıt sn':>9} {'satır/sn':>11} {'hızlanma':>9}")
+    for rows in args.sizes:
+        df = make_dataset(rows, rng)
+        results = {}
+        implementations = [('vektörel', prepare_app_data, build_apps_data)]
+        if args.legacy_max_rows is None or rows <= args.legacy_max_rows:
+            implementations.insert(0, ('satır bazlı', legacy_prepare_app_data, legacy_build_apps_data))
+        for name, prepare, build in implementations:
+            prepare_time, build_time, _ = measure(prepare, build, df)
+            results[name] = rows / (prepare_time + build_time)
+            speedup = results[name] / results['satır bazlı'] if 'satır bazlı' in results else float('nan')
+            print(
+                f"{rows:>9} {name:>10} {prepare_time:>13.2f} {build_time:>9.2f} "
+                f"{results[name]:>11.0f} {speedup:>8.1f}x"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Veri hazırlama (satır bazlı vs vektörel) benchmark'ı")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="Satır sayıları")
+    parser.add_argument('--legacy-max-rows', type=int, default=None, help="Satır bazlı uygulamanın çalıştırılacağı en büyük boyut")
+    parser.add_argument('--check-rows', type=int, default=5000, help="Eşitlik kontrolündeki satır sayısı")
+    parser.add_argument('--seed', type=int, default=0)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
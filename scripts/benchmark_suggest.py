@@ -0,0 +1,86 @@
+"""
+AppSense Öneri (Typeahead) Benchmark Scripti
+Sentetik katalogda PrefixIndex kurulumunu, farklı uzunluktaki prefix'ler için
+öneri gecikmesini (p50/p99) ve artımlı upsert/silme maliyetini ölçer
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from models.lexical.prefix_index import PrefixIndex
+from benchmark_name_index import make_catalogue
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def timed(fn, items):
+    """Öğe başına süreler (mikrosaniye)"""
+    latencies = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return np.array(latencies)
+
+def report(name, latencies):
+    print(
+        f"{name:<22} {np.percentile(latencies, 50):>9.1f} {np.percentile(latencies, 99):>9.1f} "
+        f"{latencies.max():>9.1f}"
+    )
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    apps = make_catalogue(args.size, rng)
+
+    started = time.perf_counter()
+    index = PrefixIndex(query_min_count=args.query_min_count)
+    index.build(apps)
+    stats = index.stats()
+    print(
+        f"{args.size} uygulama, index {time.perf_counter() - started:.2f} sn'de kuruldu "
+        f"({stats['entries']} kayıt, {stats['heavy_prefixes']} ağır prefix)"
+    )
+
+    # Popüler sorgular: Zipf dağılımlı tekrarlarla öneriye dönüşür
+    names = [app['name'].lower() for app in apps]
+    searched = [names[i].rsplit(' ', 1)[0] for i in rng.integers(0, len(names), 200)]
+    for rank in np.minimum(rng.zipf(1.3, args.recorded_queries), len(searched)) - 1:
+        index.record_query(searched[rank])
+
+    print(f"{'':<22} {'p50 µs':>9} {'p99 µs':>9} {'max µs':>9}")
+    all_latencies = []
+    for length in (1, 2, 3, 5, 8):
+        prefixes = [names[i][:length] for i in rng.integers(0, len(names), args.queries)]
+        latencies = timed(lambda prefix: index.suggest(prefix, args.limit), prefixes)
+        all_latencies.append(latencies)
+        report(f"prefix uzunluğu {length}", latencies)
+    report("tümü", np.concatenate(all_latencies))
+
+    # Artımlı güncelleme: yeni uygulamalar ekle, mevcutları sil
+    new_apps = make_catalogue(args.updates, rng)
+    for i, app in enumerate(new_apps):
+        app['id'] = f"new-{i}"
+    report("upsert (uygulama başı)", timed(lambda app: index.upsert_apps([app]), new_apps))
+    report("silme (uygulama başı)", timed(lambda app_id: index.delete_apps([app_id]), [app['id'] for app in apps[:args.updates]]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Typeahead prefix index'i benchmark'ı")
+    parser.add_argument('--size', type=int, default=100000, help="Katalog boyutu")
+    parser.add_argument('--queries', type=int, default=2000, help="Prefix uzunluğu başına sorgu")
+    parser.add_argument('--limit', type=int, default=10, help="Öneri sayısı")
+    parser.add_argument('--updates', type=int, default=1000, help="Artımlı upsert/silme sayısı")
+    parser.add_argument('--recorded-queries', type=int, default=20000, help="Kaydedilen arama sayısı")
+    parser.add_argument('--query-min-count', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
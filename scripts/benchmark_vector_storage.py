@@ -0,0 +1,92 @@
+"""
+AppSense Vektör Saklama Benchmark Scripti
+Yerel store'un float32, float16, int8 ve PQ saklama modlarının bellek kullanımını,
+recall@k ve sorgu gecikmesini (p50/p99) tam hassasiyetli aramaya karşı ölçer
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from core.executors import shutdown_executors
+from models.vectorstore.local_store import LocalVectorStore
+from benchmark_ann import make_catalogue, measure
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+async def build_store(path, vectors, storage, args, batch_size=10000):
+    """Vektörleri store'a ekleyip diske yaz, ardından API worker'ı gibi yeniden aç"""
+    options = dict(dimension=vectors.shape[1], index_type=args.index_type, storage=storage, pq_subvectors=args.pq_subvectors)
+    store = LocalVectorStore(path=path, **options)
+    for start in range(0, len(vectors), batch_size):
+        batch = vectors[start:start + batch_size]
+        await store.upsert_apps([
+            {'id': f'app-{start + i}', 'category': 'Bench', 'embedding': vector}
+            for i, vector in enumerate(batch)
+        ])
+    if args.index_type == "ivf" and not (await store.get_index_stats())['ann_trained']:
+        store.train_index()
+    await store.close()
+    return LocalVectorStore(path=path, **options)
+
+async def run(args):
+    rng = np.random.default_rng(args.seed)
+    vectors = make_catalogue(args.size, args.dimension, args.clusters, rng)
+    queries = make_catalogue(args.queries, args.dimension, args.clusters, rng)
+
+    print(
+        f"{args.size} vektör, boyut {args.dimension}, index {args.index_type}, "
+        f"PQ {args.pq_subvectors} alt vektör"
+    )
+    print(f"{'mod':>8} {'faktör':>7} {'bellek MB':>10} {'oran':>6} {'recall@' + str(args.k):>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+    exact = None
+    baseline_bytes = None
+    for storage in args.storages:
+        build_start = time.perf_counter()
+        store = await build_store(tempfile.mkdtemp(), vectors, storage, args)
+        logger.warning(f"{storage}: store {time.perf_counter() - build_start:.1f} sn'de kuruldu")
+        if exact is None:
+            exact, _ = await measure(store, queries, args.k, exact=True)
+
+        stats = await store.get_index_stats()
+        memory = stats['vector_memory_bytes']
+        baseline_bytes = baseline_bytes or memory
+        factors = args.rescore_factors if stats['storage_compressed'] else [1]
+        for factor in factors:
+            store.rescore_factor = factor
+            results, latencies = await measure(store, queries, args.k)
+            recall = np.mean([len(r & e) / len(e) for r, e in zip(results, exact)])
+            print(
+                f"{storage:>8} {factor:>7} {memory / 1024 / 1024:>10.1f} {baseline_bytes / memory:>5.1f}x "
+                f"{recall:>10.3f} {np.percentile(latencies, 50):>9.3f} {np.percentile(latencies, 99):>9.3f}"
+            )
+
+    shutdown_executors()
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel store vektör saklama modları benchmark'ı")
+    parser.add_argument('--size', type=int, default=100000, help="Katalog boyutu")
+    parser.add_argument('--storages', nargs='+', default=['float32', 'float16', 'int8', 'pq'], choices=['float32', 'float16', 'int8', 'pq'])
+    parser.add_argument('--rescore-factors', type=int, nargs='+', default=[1, 4, 10], help="Sıkıştırılmış modlarda denenecek yeniden skorlama faktörleri")
+    parser.add_argument('--index-type', default='flat', choices=['flat', 'ivf'])
+    parser.add_argument('--pq-subvectors', type=int, default=48)
+    parser.add_argument('--queries', type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument('--k', type=int, default=10, help="Recall@k için k")
+    parser.add_argument('--dimension', type=int, default=384, help="Embedding boyutu")
+    parser.add_argument('--clusters', type=int, default=200, help="Sentetik verideki küme sayısı")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
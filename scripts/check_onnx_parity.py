@@ -0,0 +1,91 @@
+"""
+AppSense ONNX Parity Kontrolü
+Sabit, çok dilli bir sorgu kümesinde PyTorch ve ONNX backend'lerinin ürettiği
+vektörler arasındaki kosinüs benzerliğini ölçer; eşik altındaysa hata ile çıkar
+"""
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from core.config import settings
+from models.embeddings.onnx_encoder import OnnxSentenceEncoder
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PARITY_QUERIES = [
+    "fitness tracker with workout plans",
+    "budget app to track monthly expenses",
+    "meditation and sleep sounds",
+    "offline maps for hiking",
+    "spor salonu antrenman programı",
+    "aylık bütçe ve harcama takibi",
+    "çocuklar için eğitici oyunlar",
+    "ücretsiz fotoğraf düzenleme uygulaması",
+    "application pour apprendre l'anglais",
+    "aplicación de recetas fáciles",
+    "Lern-App für Vokabeln",
+    "приложение для изучения языков",
+    "تطبيق لتعلم القرآن",
+    "家計簿アプリ",
+    "a",
+    "App: Photo Editor Pro | Category: PHOTOGRAPHY | Rating: 4.5 | Reviews: 120345 | "
+    "Installs: 10,000,000+ | Type: Free | Price: 0",
+]
+
+def cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+def rank_overlap(reference, candidate, k):
+    """Sorgular arası benzerlik sıralamasında ilk k komşunun ortak oranı"""
+    ref_scores = reference @ reference.T
+    cand_scores = candidate @ candidate.T
+    overlaps = []
+    for i in range(len(reference)):
+        ref_top = set(np.argsort(-ref_scores[i])[:k])
+        cand_top = set(np.argsort(-cand_scores[i])[:k])
+        overlaps.append(len(ref_top & cand_top) / k)
+    return float(np.mean(overlaps))
+
+def run(args):
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(settings.EMBEDDING_MODEL, device='cpu').encode(PARITY_QUERIES)
+    failed = False
+    print(f"{'backend':<14} {'min kosinüs':>12} {'ort kosinüs':>12} {f'top-{args.k} örtüşme':>14}")
+    for quantized in (False, True):
+        encoder = OnnxSentenceEncoder(args.onnx_path, quantized=quantized)
+        candidate = encoder.encode(PARITY_QUERIES, batch_size=args.batch_size)
+        similarity = cosine(reference, candidate)
+        threshold = args.int8_threshold if quantized else args.fp32_threshold
+        name = 'onnx int8' if quantized else 'onnx float32'
+        print(
+            f"{name:<14} {similarity.min():>12.5f} {similarity.mean():>12.5f} "
+            f"{rank_overlap(reference, candidate, args.k):>14.2f}"
+        )
+        if similarity.min() < threshold:
+            worst = int(np.argmin(similarity))
+            print(f"  HATA: '{PARITY_QUERIES[worst]}' kosinüs {similarity[worst]:.5f} < {threshold}")
+            failed = True
+    return not failed
+
+def main():
+    parser = argparse.ArgumentParser(description="PyTorch ve ONNX embedding backend'leri arasındaki parity kontrolü")
+    parser.add_argument('--onnx-path', default=settings.EMBEDDING_ONNX_PATH)
+    parser.add_argument('--fp32-threshold', type=float, default=0.9999, help="float32 ONNX için en düşük kosinüs")
+    parser.add_argument('--int8-threshold', type=float, default=0.98, help="int8 ONNX için en düşük kosinüs")
+    parser.add_argument('--batch-size', type=int, default=8, help="Padding'li batch'leri de kapsamak için")
+    parser.add_argument('--k', type=int, default=3)
+    sys.exit(0 if run(parser.parse_args()) else 1)
+
+if __name__ == "__main__":
+    main()
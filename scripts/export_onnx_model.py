@@ -0,0 +1,93 @@
+"""
+AppSense ONNX Export Scripti
+settings.EMBEDDING_MODEL'in transformer katmanını ONNX'e aktarır, dinamik int8
+quantization uygular ve EMBEDDING_BACKEND=onnx için gereken dosyaları yazar
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import sys
+
+# Backend klasörünü Python path'ine ekle
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from core.config import settings
+from models.embeddings.onnx_encoder import CONFIG_FILE, MODEL_FILE, QUANTIZED_MODEL_FILE
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def pooling_config(model):
+    """SentenceTransformer modüllerinden pooling modu ve normalize bilgisini oku"""
+    from sentence_transformers.models import Normalize, Pooling
+
+    pooling = next(module for module in model if isinstance(module, Pooling))
+    mode = pooling.get_pooling_mode_str()
+    if mode not in ('mean', 'cls', 'max'):
+        raise ValueError(f"Desteklenmeyen pooling modu: {mode}")
+    return mode, any(isinstance(module, Normalize) for module in model)
+
+def export(args):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Model yükleniyor: {settings.EMBEDDING_MODEL}")
+    model = SentenceTransformer(settings.EMBEDDING_MODEL, device='cpu')
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    if not tokenizer.is_fast:
+        raise ValueError("Hızlı (tokenizer.json) tokenizer gerekli")
+
+    sample = tokenizer(['örnek sorgu', 'sample query'], padding=True, return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['token_embeddings'] = {0: 'batch', 1: 'sequence'}
+
+    model_path = output / MODEL_FILE
+    logger.info(f"ONNX grafiği yazılıyor: {model_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            str(model_path),
+            input_names=input_names,
+            output_names=['token_embeddings'],
+            dynamic_axes=dynamic_axes,
+            opset_version=args.opset
+        )
+
+    quantized_path = output / QUANTIZED_MODEL_FILE
+    logger.info(f"Dinamik int8 quantization: {quantized_path}")
+    quantize_dynamic(str(model_path), str(quantized_path), weight_type=QuantType.QInt8)
+
+    tokenizer.backend_tokenizer.save(str(output / 'tokenizer.json'))
+    pooling, normalize = pooling_config(model)
+    config = {
+        'model_name': settings.EMBEDDING_MODEL,
+        'max_seq_length': model.max_seq_length,
+        'dimension': model.get_sentence_embedding_dimension(),
+        'pooling': pooling,
+        'normalize': normalize,
+        'pad_token': tokenizer.pad_token,
+        'pad_token_id': tokenizer.pad_token_id
+    }
+    (output / CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding='utf-8')
+
+    for path in (model_path, quantized_path):
+        logger.info(f"{path.name}: {path.stat().st_size / 1024 / 1024:.1f} MB")
+    logger.info("Export tamamlandı. Doğrulama için: python check_onnx_parity.py")
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding modelini ONNX'e aktar ve int8 quantize et")
+    parser.add_argument('--output', default=settings.EMBEDDING_ONNX_PATH, help="Çıktı klasörü")
+    parser.add_argument('--opset', type=int, default=14)
+    export(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
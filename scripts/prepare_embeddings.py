@@ -1,12 +1,25 @@
 """
 AppSense Embedding Hazırlama Scripti
 Veri temizleme, embedding oluşturma ve Pinecone'a yükleme
+
+CSV parça parça okunur; bir parça encode edilirken bir önceki parça yüklenir.
+Her kalıcı yüklemeden sonra checkpoint yazılır, --resume ile kalınan yerden
+devam edilir. --incremental ile yalnızca içeriği değişen uygulamalar encode
+edilir ve kaynakta artık olmayan uygulamalar silinir. Üretilen embedding'ler
+(model, metin hash'i) anahtarıyla diskte saklanır; tekrar çalıştırmada yalnızca
+yeni açıklamalar encode edilir. --detect-language ile uygulama adlarının dili
+process havuzunda toplu algılanıp `language` metadata alanına yazılır.
 """
 
 import pandas as pd
 import numpy as np
+import argparse
+import asyncio
+import hashlib
+import json
 import logging
 import re
+import time
 from pathlib import Path
 import sys
 import os
@@ -14,8 +27,11 @@ import os
 # Backend klasörünü Python path'ine ekle
 sys.path.append(str(Path(__file__).parent.parent / 'backend'))
 
+from models.embeddings.artifact_cache import EmbeddingArtifactCache
 from models.embeddings.embedding_model import EmbeddingModel
-from models.vectorstore.pinecone_store import PineconeStore
+from models.documentstore.sqlite_store import create_document_store
+from models.vectorstore.base import VectorStore
+from models.vectorstore.factory import create_vector_store
 from utils.language_detector import LanguageDetector
 from core.config import settings
 
@@ -23,197 +39,576 @@ from core.config import settings
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def clean_text(text):
-    """Metni temizle"""
-    if pd.isna(text) or text == '':
-        return ''
-    
-    # HTML taglarını temizle
-    text = re.sub(r'<[^>]+>', '', str(text))
-    
-    # Özel karakterleri temizle
-    text = re.sub(r'[^\w\s\.\,\!\?\-]', '', text)
-    
-    # Fazla boşlukları temizle
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+# Derlenmiş regex'ler (tüm sütun üzerinde vektörel uygulanır)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\!\?\-]')
+WHITESPACE_RE = re.compile(r'\s+')
+NON_ID_CHARS_RE = re.compile(r'[^a-zA-Z0-9\-_]')
+REPEATED_DASH_RE = re.compile(r'-+')
+
+# Description'a "Sütun: değer" olarak eklenen alanlar
+DESCRIPTION_COLUMNS = ['App', 'Category', 'Rating', 'Reviews', 'Installs', 'Type', 'Price']
+
+def clean_column(column):
+    """Metin sütununu temizle (HTML tag'leri, özel karakterler, fazla boşluklar)"""
+    return (
+        column.astype(object).where(column.notna(), '').astype(str)
+        .str.replace(HTML_TAG_RE, '', regex=True)
+        .str.replace(SPECIAL_CHARS_RE, '', regex=True)
+        .str.replace(WHITESPACE_RE, ' ', regex=True)
+        .str.strip()
+    )
+
+def sanitize_app_ids(ids):
+    """ID'leri ASCII karakterlere çevir"""
+    # Türkçe karakterleri ve özel karakterleri temizle, birden fazla tire'yi tek tire yap,
+    # baş ve sondaki tire'leri kaldır
+    return (
+        ids.str.replace(NON_ID_CHARS_RE, '-', regex=True)
+        .str.replace(REPEATED_DASH_RE, '-', regex=True)
+        .str.strip('-')
+    )
+
+def build_descriptions(df):
+    """Description oluştur (App adı + Category + diğer bilgiler), boş olmayan alanlar ' | ' ile birleşir"""
+    description = pd.Series('', index=df.index, dtype=object)
+    for column in DESCRIPTION_COLUMNS:
+        values = df[column]
+        if column in ('App', 'Category'):
+            present = values != ''
+        elif column == 'Reviews':
+            present = values.notna() & (pd.to_numeric(values, errors='coerce') > 0)
+        else:
+            present = values.notna()
+        part = (column + ': ' + values.astype(str)).where(present, '')
+        separator = pd.Series(np.where((description != '') & (part != ''), ' | ', ''), index=df.index)
+        description = description + separator + part
+    return description
 
 def prepare_app_data(df):
     """Uygulama verilerini hazırla"""
-    logger.info("Uygulama verileri hazırlanıyor...")
+    logger.debug("Uygulama verileri hazırlanıyor...")
     
     # Eksik değerleri temizle
-    df = df.dropna(subset=['App', 'Category'])
+    df = df.dropna(subset=['App', 'Category']).copy()
     
     # Metin alanlarını temizle
-    df['App'] = df['App'].apply(clean_text)
-    df['Category'] = df['Category'].apply(clean_text)
-    
-    # Description oluştur (App adı + Category + diğer bilgiler)
-    def create_description(row):
-        desc_parts = []
-        
-        if row['App']:
-            desc_parts.append(f"App: {row['App']}")
-        
-        if row['Category']:
-            desc_parts.append(f"Category: {row['Category']}")
-        
-        if pd.notna(row['Rating']):
-            desc_parts.append(f"Rating: {row['Rating']}")
-        
-        if pd.notna(row['Reviews']) and row['Reviews'] > 0:
-            desc_parts.append(f"Reviews: {row['Reviews']}")
-        
-        if pd.notna(row['Installs']):
-            desc_parts.append(f"Installs: {row['Installs']}")
-        
-        if pd.notna(row['Type']):
-            desc_parts.append(f"Type: {row['Type']}")
-        
-        if pd.notna(row['Price']):
-            desc_parts.append(f"Price: {row['Price']}")
-        
-        return ' | '.join(desc_parts)
+    df['App'] = clean_column(df['App'])
+    df['Category'] = clean_column(df['Category'])
     
-    df['description'] = df.apply(create_description, axis=1)
+    df['description'] = build_descriptions(df)
     
-    # Unique ID oluştur
-    df['id'] = df['App'].str.lower().str.replace(' ', '-').str.replace('[^\w\-]', '') + '-' + df.index.astype(str)
+    # Unique ID oluştur (satır sırasından bağımsız: satır eklenip silinince ID'ler kaymaz)
+    stable_key = [
+        hashlib.sha1(f"{name}\x1f{category}".encode('utf-8')).hexdigest()[:10]
+        for name, category in zip(df['App'], df['Category'])
+    ]
+    df['id'] = sanitize_app_ids(df['App'].str.lower().str.replace(' ', '-', regex=False) + '-' + stable_key)
     
-    logger.info(f"Veri hazırlama tamamlandı: {len(df)} uygulama")
+    logger.debug(f"Veri hazırlama tamamlandı: {len(df)} uygulama")
     return df
 
-def create_embeddings(df, embedding_model):
-    """Embedding'leri oluştur"""
-    logger.info("Embedding'ler oluşturuluyor...")
-    
+def create_embeddings(df, embedding_model, batch_size=32, artifact_cache=None):
+    """Embedding'leri oluştur (artifact önbelleği varsa yalnızca eksikleri encode et)"""
     # Açıklamaları embedding'e çevir
     descriptions = df['description'].tolist()
     
     try:
-        embeddings = embedding_model.encode(descriptions)
-        logger.info(f"Embedding'ler oluşturuldu: {len(embeddings)} vektör")
+        if artifact_cache is not None:
+            embeddings = artifact_cache.encode(
+                descriptions,
+                lambda texts: embedding_model.encode_batch(texts, batch_size=batch_size)
+            ).tolist()
+        else:
+            embeddings = embedding_model.encode_batch(descriptions, batch_size=batch_size)
+        logger.debug(f"Embedding'ler oluşturuldu: {len(embeddings)} vektör")
         return embeddings
     except Exception as e:
         logger.error(f"Embedding oluşturma hatası: {str(e)}")
         return None
 
-async def upload_to_pinecone(df, embeddings, pinecone_store):
-    """Pinecone'a yükle"""
-    logger.info("Pinecone'a yükleniyor...")
+def content_hash(app):
+    """Index'lenen alanların (açıklama + metadata) içerik hash'i"""
+    # Dil addan türetildiği için hash'e girmez (yalnızca değişenler için algılanır)
+    document = VectorStore.build_document(app)
+    document.pop('language', None)
+    payload = json.dumps(document, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def build_apps_data(df, embeddings):
+    """Hazırlanan satırları vektör veritabanı formatına çevir"""
+    # NaN değerleri sütun bazında varsayılanlarla doldur
+    columns = {
+        'id': df['id'].astype(str),
+        'name': df['App'].astype(str),
+        'description': df['description'].astype(str),
+        'category': df['Category'].astype(str),
+        'rating': pd.to_numeric(df['Rating'], errors='coerce').fillna(0.0).astype(float),
+        'review_count': pd.to_numeric(df['Reviews'], errors='coerce').fillna(0).astype('int64'),
+        'download_count': df['Installs'].astype(object).where(df['Installs'].notna(), '0').astype(str),
+        'price': df['Price'].astype(object).where(df['Price'].notna(), 'Ücretsiz').astype(str),
+        'developer': ['Unknown'] * len(df),  # Veri setinde developer bilgisi yok
+        # Checkpoint için kaynak CSV satırı (metadata'ya yazılmaz)
+        'source_row': df.index.astype('int64')
+    }
     
-    try:
-        # Veriyi Pinecone formatına çevir
-        apps_data = []
-        for i, (_, row) in enumerate(df.iterrows()):
-            # NaN değerleri temizle
-            rating = row.get('Rating')
-            if pd.isna(rating):
-                rating = 0.0
-            
-            review_count = row.get('Reviews')
-            if pd.isna(review_count):
-                review_count = 0
-            
-            download_count = row.get('Installs')
-            if pd.isna(download_count):
-                download_count = '0'
-            
-            price = row.get('Price')
-            if pd.isna(price):
-                price = 'Ücretsiz'
-            
-            # ID'yi ASCII karakterlere çevir
-            app_id = str(row['id'])
-            # Türkçe karakterleri ve özel karakterleri temizle
-            import re
-            app_id = re.sub(r'[^a-zA-Z0-9\-_]', '-', app_id)
-            app_id = re.sub(r'-+', '-', app_id)  # Birden fazla tire'yi tek tire yap
-            app_id = app_id.strip('-')  # Baş ve sondaki tire'leri kaldır
-            
-            app_data = {
-                'id': app_id,
-                'name': str(row['App']),
-                'description': str(row['description']),
-                'category': str(row['Category']),
-                'rating': float(rating),
-                'review_count': int(review_count),
-                'download_count': str(download_count),
-                'price': str(price),
-                'developer': 'Unknown',  # Veri setinde developer bilgisi yok
-                'embedding': embeddings[i] if embeddings else None
-            }
-            apps_data.append(app_data)
-        
-        # Verileri küçük parçalar halinde yükle (Pinecone 2MB limit)
-        batch_size = 100  # Her seferde 100 uygulama
-        total_uploaded = 0
-        
-        for i in range(0, len(apps_data), batch_size):
-            batch = apps_data[i:i + batch_size]
-            logger.info(f"Batch {i//batch_size + 1} yükleniyor: {len(batch)} uygulama")
-            
-            success = await pinecone_store.upsert_apps(batch)
-            if success:
-                total_uploaded += len(batch)
-                logger.info(f"Batch {i//batch_size + 1} başarıyla yüklendi")
-            else:
-                logger.error(f"Batch {i//batch_size + 1} yükleme başarısız")
-                return False
-        
-        if total_uploaded == len(apps_data):
-            logger.info(f"Pinecone'a başarıyla yüklendi: {total_uploaded} uygulama")
-            return True
-        else:
-            logger.error(f"Yükleme tamamlanamadı: {total_uploaded}/{len(apps_data)}")
+    # Sütunları düz Python listelerine çevirip satırları zip ile kur (to_dict/iterrows'tan hızlı)
+    names = list(columns) + ['embedding']
+    values = [column if isinstance(column, list) else column.tolist() for column in columns.values()]
+    values.append(embeddings if embeddings else [None] * len(df))
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+class StageStats:
+    """Aşama başına satır sayısı ve süre (rows/s raporu için)"""
+
+    STAGES = ('read', 'clean', 'language', 'encode', 'upload')
+
+    def __init__(self):
+        self.rows = {stage: 0 for stage in self.STAGES}
+        self.seconds = {stage: 0.0 for stage in self.STAGES}
+        self.started = time.perf_counter()
+
+    def add(self, stage, rows, seconds):
+        self.rows[stage] += rows
+        self.seconds[stage] += seconds
+
+    def rate(self, stage):
+        return self.rows[stage] / self.seconds[stage] if self.seconds[stage] else 0.0
+
+    def report(self):
+        """Aşama ve toplam throughput'u logla"""
+        for stage in self.STAGES:
+            logger.info(
+                f"  {stage:<8} {self.rows[stage]:>9} satır  {self.seconds[stage]:>8.2f} sn  "
+                f"{self.rate(stage):>10.1f} satır/sn"
+            )
+        elapsed = time.perf_counter() - self.started
+        total_rate = self.rows['upload'] / elapsed if elapsed else 0.0
+        logger.info(f"  toplam   {self.rows['upload']:>9} satır  {elapsed:>8.2f} sn  {total_rate:>10.1f} satır/sn")
+
+class Checkpoint:
+    """Kalıcı olarak yüklenen son kaynak satırını tutan dosya"""
+
+    def __init__(self, path, data_path):
+        self.path = Path(path)
+        self.data_path = str(Path(data_path).resolve())
+        self.next_row = 0
+        self.uploaded = 0
+
+    def load(self):
+        """Aynı veri dosyasına ait checkpoint varsa yükle"""
+        if not self.path.exists():
             return False
-            
+        state = json.loads(self.path.read_text(encoding='utf-8'))
+        if state.get('data_path') != self.data_path:
+            logger.warning("Checkpoint farklı bir veri dosyasına ait, baştan başlanıyor")
+            return False
+        self.next_row = int(state.get('next_row', 0))
+        self.uploaded = int(state.get('uploaded', 0))
+        return True
+
+    def commit(self, next_row, uploaded):
+        """Checkpoint'i atomik olarak yaz"""
+        self.next_row = next_row
+        self.uploaded += uploaded
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(json.dumps({
+            'data_path': self.data_path,
+            'next_row': self.next_row,
+            'uploaded': self.uploaded,
+            'updated_at': time.time()
+        }), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+class Manifest:
+    """
+    Uygulama ID'si -> içerik hash'i (yerel JSON dosyası)
+
+    Yalnızca kalıcı olarak yüklenen uygulamalar yazılır; embedding modeli
+    değişirse manifest geçersiz sayılır ve her şey yeniden encode edilir.
+    """
+
+    def __init__(self, path, model_name):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.hashes = {}
+
+    def load(self):
+        if not self.path.exists():
+            return
+        state = json.loads(self.path.read_text(encoding='utf-8'))
+        if state.get('model') != self.model_name:
+            logger.warning("Manifest farklı bir embedding modeline ait, tüm uygulamalar yeniden encode edilecek")
+            return
+        self.hashes = state.get('hashes', {})
+        logger.info(f"Manifest yüklendi: {len(self.hashes)} uygulama")
+
+    def save(self):
+        """Manifest'i atomik olarak yaz"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(json.dumps({'model': self.model_name, 'hashes': self.hashes}), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+class DeltaSummary:
+    """Artımlı çalışmanın eklenen/güncellenen/silinen/atlanan sayıları"""
+
+    def __init__(self):
+        self.added = 0
+        self.updated = 0
+        self.deleted = 0
+        self.skipped = 0
+        self.duplicates = 0
+        # Kaynakta görülen tüm ID'ler (silinecekleri bulmak için)
+        self.seen = set()
+
+    def report(self):
+        logger.info(
+            f"Özet: {self.added} eklendi, {self.updated} güncellendi, "
+            f"{self.deleted} silindi, {self.skipped} değişmediği için atlandı"
+            + (f", {self.duplicates} tekrar eden satır atlandı" if self.duplicates else "")
+        )
+
+def read_chunks(data_path, chunk_size, start_row=0):
+    """CSV'yi parça parça oku; index her zaman kaynak satır numarasıdır"""
+    reader = pd.read_csv(
+        data_path,
+        chunksize=chunk_size,
+        skiprows=range(1, start_row + 1) if start_row else None
+    )
+    for chunk in reader:
+        if start_row:
+            chunk.index = chunk.index + start_row
+        yield chunk
+
+def collect_ids(data_path, chunk_size, end_row):
+    """Kaynağın ilk end_row satırındaki uygulama ID'lerini topla (--resume sonrası silme için)"""
+    ids = set()
+    for chunk in read_chunks(data_path, chunk_size):
+        chunk = chunk[chunk.index < end_row]
+        if chunk.empty:
+            break
+        df = prepare_app_data(chunk)
+        ids.update(df['id'])
+    return ids
+
+def select_changed(apps_data, manifest, summary, incremental):
+    """
+    Hash'i hesapla, değişmeyenleri (artımlı modda) ele
+
+    Returns:
+        Encode edilip yüklenecek uygulamalar
+    """
+    changed = []
+    for app in apps_data:
+        # Aynı uygulama kaynakta birden fazla kez varsa ilki kullanılır
+        if app['id'] in summary.seen:
+            summary.duplicates += 1
+            continue
+        app['content_hash'] = content_hash(app)
+        summary.seen.add(app['id'])
+        previous = manifest.hashes.get(app['id'])
+        if incremental and previous == app['content_hash']:
+            summary.skipped += 1
+            continue
+        if previous is None:
+            summary.added += 1
+        else:
+            summary.updated += 1
+        changed.append(app)
+    return changed
+
+def detect_languages(apps_data, language_detector, language_pool, stats):
+    """Uygulama adlarının dilini toplu algıla, `language` alanına yaz"""
+    started = time.perf_counter()
+    languages = language_detector.detect_languages_bulk([app['name'] for app in apps_data], executor=language_pool)
+    for app, language in zip(apps_data, languages):
+        app['language'] = language
+    stats.add('language', len(apps_data), time.perf_counter() - started)
+
+def process_chunk(chunks, embedding_model, stats, encode_batch_size, manifest, summary, incremental,
+                  artifact_cache=None, language_detector=None, language_pool=None):
+    """
+    Sıradaki parçayı oku, temizle ve encode et (thread pool'da çalışır)
+
+    Returns:
+        (apps_data, parçadan sonraki ilk kaynak satır) veya dosya bittiyse None
+    """
+    started = time.perf_counter()
+    chunk = next(chunks, None)
+    if chunk is None:
+        return None
+    next_row = int(chunk.index[-1]) + 1
+    stats.add('read', len(chunk), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    df = prepare_app_data(chunk)
+    stats.add('clean', len(chunk), time.perf_counter() - started)
+    if df.empty:
+        return [], next_row
+
+    apps_data = select_changed(build_apps_data(df, None), manifest, summary, incremental)
+    if not apps_data:
+        return [], next_row
+
+    if language_detector is not None:
+        detect_languages(apps_data, language_detector, language_pool, stats)
+
+    started = time.perf_counter()
+    changed_rows = df.loc[[app['source_row'] for app in apps_data]]
+    embeddings = create_embeddings(changed_rows, embedding_model, batch_size=encode_batch_size, artifact_cache=artifact_cache)
+    if not embeddings:
+        raise Exception("Embedding oluşturulamadı!")
+    for app, embedding in zip(apps_data, embeddings):
+        app['embedding'] = embedding
+    stats.add('encode', len(apps_data), time.perf_counter() - started)
+
+    return apps_data, next_row
+
+async def upload_chunk(apps_data, chunk_end_row, vector_store, checkpoint, manifest, stats, batch_size,
+                       document_store=None):
+    """
+    Parçayı batch'ler halinde yükle, checkpoint ve manifest'i güncelle
+
+    Store'un save() metodu varsa (yerel backend) yükleme parça sonunda diske
+    yazıldıktan sonra, yoksa her batch'ten sonra kalıcı sayılır. Manifest
+    checkpoint'in önüne geçmez; geride kalırsa yalnızca fazladan encode yapılır.
+    Doküman deposu varsa batch'in dokümanları vektörlerden önce yazılır; vektör
+    yüklemesi başarısız olursa depoda kalan dokümanlar aramada görünmez.
+    """
+    persist = getattr(vector_store, 'save', None)
+    for i in range(0, len(apps_data), batch_size):
+        batch = apps_data[i:i + batch_size]
+        started = time.perf_counter()
+        if document_store is not None:
+            await asyncio.to_thread(document_store.upsert_documents, batch)
+        results = await vector_store.upsert_apps(batch)
+        stats.add('upload', len(batch), time.perf_counter() - started)
+        if not VectorStore.upsert_succeeded(results):
+            errors = [result['error'] for result in results if not result['success']]
+            raise Exception(
+                f"Batch yükleme başarısız (satır {batch[0]['source_row']}'den itibaren): "
+                f"{errors[0] if errors else 'eklenecek vektör yok'}"
+            )
+        if persist is None:
+            for app in batch:
+                manifest.hashes[app['id']] = app['content_hash']
+            # Son batch'te parçanın elenen satırları da tamamlanmış sayılır
+            is_last = i + batch_size >= len(apps_data)
+            checkpoint.commit(chunk_end_row if is_last else batch[-1]['source_row'] + 1, len(batch))
+
+    if persist is not None:
+        started = time.perf_counter()
+        await asyncio.to_thread(persist)
+        stats.add('upload', 0, time.perf_counter() - started)
+        for app in apps_data:
+            manifest.hashes[app['id']] = app['content_hash']
+        manifest.save()
+        checkpoint.commit(chunk_end_row, len(apps_data))
+    else:
+        if apps_data:
+            manifest.save()
+        else:
+            checkpoint.commit(chunk_end_row, 0)
+
+async def delete_stale(vector_store, manifest, summary, args, resumed_from, document_store=None):
+    """Manifest'te olup kaynakta artık olmayan uygulamaları sil"""
+    if resumed_from:
+        # Önceki çalışmada işlenen satırların ID'leri bu çalışmada görülmedi
+        summary.seen.update(await asyncio.to_thread(collect_ids, Path(args.data), args.chunk_size, resumed_from))
+
+    stale = [app_id for app_id in manifest.hashes if app_id not in summary.seen]
+    if not stale:
+        return
+    logger.info(f"Kaynakta olmayan {len(stale)} uygulama siliniyor...")
+    summary.deleted = await vector_store.delete_apps(stale)
+    if document_store is not None:
+        await asyncio.to_thread(document_store.delete_documents, stale)
+    if summary.deleted == len(stale):
+        for app_id in stale:
+            del manifest.hashes[app_id]
+        manifest.save()
+    else:
+        logger.error(f"Silme tamamlanamadı: {summary.deleted}/{len(stale)} (manifest güncellenmedi)")
+
+def open_artifact_cache(args):
+    """--embedding-cache boş değilse artifact önbelleğini aç"""
+    if not args.embedding_cache:
+        return None
+    return EmbeddingArtifactCache(args.embedding_cache, settings.EMBEDDING_MODEL, dtype=args.embedding_cache_dtype)
+
+def log_cache_stats(artifact_cache):
+    stats = artifact_cache.stats()
+    logger.info(
+        f"Embedding önbelleği: {stats['entries']} kayıt, {stats['size_bytes'] / 1024 / 1024:.1f} MB "
+        f"({stats['dtype']}), {stats['hits']} isabet / {stats['misses']} encode "
+        f"(isabet oranı {stats['hit_rate']:.1%}) - {stats['path']}"
+    )
+
+def prune_artifact_cache(args):
+    """Önbellekte olup kaynak veride artık kullanılmayan açıklamaları sil"""
+    data_path = Path(args.data)
+    if not data_path.exists():
+        logger.error("Veri dosyası bulunamadı!")
+        return False
+
+    artifact_cache = open_artifact_cache(args)
+    if artifact_cache is None:
+        logger.error("Embedding önbelleği kapalı (--embedding-cache)")
+        return False
+    try:
+        descriptions = set()
+        for chunk in read_chunks(data_path, args.chunk_size):
+            descriptions.update(prepare_app_data(chunk)['description'])
+        removed = artifact_cache.prune(descriptions)
+        logger.info(f"Önbellekten {removed} kullanılmayan embedding silindi")
+        log_cache_stats(artifact_cache)
+    finally:
+        artifact_cache.close()
+    return True
+
+async def run_pipeline(args):
+    """Oku -> temizle -> encode -> yükle; encode ve yükleme örtüşür"""
+    data_path = Path(args.data)
+    if not data_path.exists():
+        logger.error("Veri dosyası bulunamadı!")
+        return False
+
+    checkpoint = Checkpoint(args.checkpoint, data_path)
+    if args.resume and checkpoint.load():
+        logger.info(f"Checkpoint bulundu: {checkpoint.next_row}. satırdan devam ediliyor ({checkpoint.uploaded} uygulama yüklenmiş)")
+    else:
+        checkpoint.clear()
+    resumed_from = checkpoint.next_row
+
+    manifest = Manifest(args.manifest, settings.EMBEDDING_MODEL)
+    manifest.load()
+    summary = DeltaSummary()
+
+    # Dil algılama havuzu model yüklenmeden (thread'ler açılmadan) önce fork edilir
+    language_detector = language_pool = None
+    if args.detect_language:
+        language_detector = LanguageDetector(cache_size=0)
+        language_pool = LanguageDetector.create_process_pool(args.language_workers)
+
+    # Embedding modelini yükle
+    logger.info("Embedding modeli yükleniyor...")
+    embedding_model = EmbeddingModel()
+    artifact_cache = open_artifact_cache(args)
+    
+    # Vektör veritabanını başlat (settings.VECTOR_STORE_BACKEND)
+    logger.info("Vektör veritabanı başlatılıyor...")
+    vector_store = create_vector_store()
+    # Doküman deposu (DOCUMENT_STORE_ENABLED); vektörlerle yalnızca filtre alanları saklanır
+    document_store = create_document_store()
+    if document_store is not None and args.incremental and manifest.hashes and not document_store.count():
+        # Değişmeyen uygulamalar yeniden yazılmadığı için depo eksik kalır
+        logger.warning("Doküman deposu boş: depoyu doldurmak için bir kez --incremental olmadan çalıştırın")
+
+    stats = StageStats()
+    chunks = read_chunks(data_path, args.chunk_size, checkpoint.next_row)
+    pending = None
+    try:
+        pending = asyncio.create_task(asyncio.to_thread(
+            process_chunk, chunks, embedding_model, stats, args.encode_batch_size,
+            manifest, summary, args.incremental, artifact_cache, language_detector, language_pool
+        ))
+        chunk_number = 0
+        while True:
+            processed = await pending
+            if processed is None:
+                break
+            apps_data, chunk_end_row = processed
+            chunk_number += 1
+
+            # Bir sonraki parça encode edilirken bu parçayı yükle
+            pending = asyncio.create_task(asyncio.to_thread(
+                process_chunk, chunks, embedding_model, stats, args.encode_batch_size,
+                manifest, summary, args.incremental, artifact_cache, language_detector, language_pool
+            ))
+            await upload_chunk(
+                apps_data, chunk_end_row, vector_store, checkpoint, manifest, stats, args.batch_size, document_store
+            )
+            logger.info(
+                f"Parça {chunk_number}: {len(apps_data)} uygulama yüklendi "
+                f"(satır {chunk_end_row}, toplam {checkpoint.uploaded}) - "
+                f"encode {stats.rate('encode'):.1f} satır/sn, yükleme {stats.rate('upload'):.1f} satır/sn"
+            )
+
+        if args.incremental:
+            await delete_stale(vector_store, manifest, summary, args, resumed_from, document_store)
     except Exception as e:
-        logger.error(f"Pinecone yükleme hatası: {str(e)}")
+        logger.error(f"Pipeline hatası: {str(e)}")
+        logger.error(f"Kalınan yerden devam etmek için --resume kullanın (satır {checkpoint.next_row})")
+        if pending is not None:
+            # Model kapatılmadan önce devam eden encode'un bitmesini bekle
+            await asyncio.gather(pending, return_exceptions=True)
         return False
+    finally:
+        # Yerel backend için index'i diske yaz
+        await vector_store.close()
+        if document_store is not None:
+            document_store.close()
+        embedding_model.close()
+        if language_pool is not None:
+            language_pool.shutdown()
+        if artifact_cache is not None:
+            log_cache_stats(artifact_cache)
+            artifact_cache.close()
 
-async def main():
+    logger.info(f"Aşama throughput'u ({checkpoint.uploaded} uygulama):")
+    stats.report()
+    summary.report()
+    checkpoint.clear()
+    return True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Uygulama verisini embedding'e çevirip vektör veritabanına yükle")
+    parser.add_argument('--data', default='../data/processed/sample_apps.csv', help="Kaynak CSV dosyası")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Tek seferde okunup encode edilen satır sayısı")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Checkpoint başına yüklenen uygulama (istek boyutlarını store ayarlar)")
+    parser.add_argument('--encode-batch-size', type=int, default=32, help="Model batch boyutu")
+    parser.add_argument('--checkpoint', default='../data/processed/.prepare_embeddings.checkpoint.json', help="Checkpoint dosyası")
+    parser.add_argument('--resume', action='store_true', help="Checkpoint'ten devam et")
+    parser.add_argument('--incremental', action='store_true', help="Yalnızca yeni/değişen uygulamaları yükle, kaynakta olmayanları sil")
+    parser.add_argument('--manifest', default='../data/processed/.embedding_manifest.json', help="İçerik hash manifest dosyası")
+    parser.add_argument('--embedding-cache', default=settings.EMBEDDING_ARTIFACT_CACHE_PATH, help="Embedding artifact önbelleği klasörü (boş ise kapalı)")
+    parser.add_argument('--embedding-cache-dtype', default=settings.EMBEDDING_ARTIFACT_DTYPE, choices=['float32', 'float16'], help="Önbellekte saklama tipi")
+    parser.add_argument('--detect-language', action='store_true', help="Uygulama adlarının dilini algılayıp metadata'ya yaz")
+    parser.add_argument('--language-workers', type=int, default=settings.LANGUAGE_DETECTION_WORKERS, help="Dil algılama process sayısı (0 ise CPU sayısı)")
+    parser.add_argument('--cache-stats', action='store_true', help="Embedding önbelleği istatistiklerini yazdır ve çık")
+    parser.add_argument('--prune-cache', action='store_true', help="Kaynak veride kullanılmayan önbellek kayıtlarını sil ve çık")
+    return parser.parse_args(argv)
+
+async def main(argv=None):
     """Ana fonksiyon"""
     logger.info("AppSense Embedding Hazırlama başlıyor...")
     
     try:
-        # Veri dosyasını oku
-        data_path = Path('../data/processed/sample_apps.csv')
-        if not data_path.exists():
-            logger.error("Veri dosyası bulunamadı!")
-            return False
-        
-        logger.info("Veri dosyası okunuyor...")
-        df = pd.read_csv(data_path)
-        logger.info(f"Veri yüklendi: {len(df)} uygulama")
-        
-        # Veriyi hazırla
-        df = prepare_app_data(df)
-        
-        # Embedding modelini yükle
-        logger.info("Embedding modeli yükleniyor...")
-        embedding_model = EmbeddingModel()
-        
-        # Embedding'leri oluştur
-        embeddings = create_embeddings(df, embedding_model)
-        if not embeddings:
-            logger.error("Embedding oluşturulamadı!")
-            return False
-        
-        # Pinecone'u başlat
-        logger.info("Pinecone başlatılıyor...")
-        pinecone_store = PineconeStore()
-        
-        # Pinecone'a yükle
-        success = await upload_to_pinecone(df, embeddings, pinecone_store)
+        args = parse_args(argv)
+        if args.cache_stats:
+            artifact_cache = open_artifact_cache(args)
+            if artifact_cache is None:
+                logger.error("Embedding önbelleği kapalı (--embedding-cache)")
+                return False
+            print(json.dumps(artifact_cache.stats(), indent=2, ensure_ascii=False))
+            artifact_cache.close()
+            return True
+        if args.prune_cache:
+            return prune_artifact_cache(args)
+
+        success = await run_pipeline(args)
         
         if success:
             logger.info("✅ Embedding hazırlama başarıyla tamamlandı!")
             return True
         else:
-            logger.error("❌ Pinecone'a yükleme başarısız!")
+            logger.error("❌ Vektör veritabanına yükleme başarısız!")
             return False
             
     except Exception as e:
@@ -221,11 +616,10 @@ async def main():
         return False
 
 if __name__ == "__main__":
-    import asyncio
     success = asyncio.run(main())
     if success:
         print("\n🎉 Embedding hazırlama tamamlandı!")
         print("Artık arama sistemi kullanıma hazır!")
     else:
         print("\n❌ Embedding hazırlama başarısız!")
-        print("Hata loglarını kontrol edin.") 
\ No newline at end of file
+        print("Hata loglarını kontrol edin.")